@@ -0,0 +1,213 @@
+# app/api.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel
+
+from app.config import settings
+from app.microbatch import MicroBatcher
+from app.telemetry import find_trace, metrics, stage, trace_request
+from app.warmup import default_targets, start_background_warmup
+
+# one set of models and batchers per worker process, created in the lifespan hook
+_state: Dict[str, object] = {}
+
+
+def _embed_batch(texts: List[str]) -> List[np.ndarray]:
+    from app.embeddings import embed_list
+    return list(embed_list(texts))
+
+
+def _ner_batch(texts: List[str]):
+    from app.parsers import extract_entities_with_bert_many
+    return extract_entities_with_bert_many(texts)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    report: Dict[str, Dict] = {}
+    targets = [t for t in default_targets() if t != "llm" or settings.LLM_WARMUP]
+    _state.update({
+        "warmup_targets": targets,
+        "warmup_report": report,
+        "warmup_thread": start_background_warmup(targets, report),
+        "embed_batcher": MicroBatcher(_embed_batch, settings.API_BATCH_MAX_SIZE, settings.API_BATCH_MAX_WAIT_MS, "embed"),
+        "ner_batcher": MicroBatcher(_ner_batch, settings.API_BATCH_MAX_SIZE, settings.API_BATCH_MAX_WAIT_MS, "ner"),
+    })
+    yield
+    await _state["embed_batcher"].close()
+    await _state["ner_batcher"].close()
+
+
+api = FastAPI(title="Resume Scanner API", lifespan=lifespan)
+
+
+@api.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Every request gets a trace; its id is returned in X-Trace-Id (see /traces/{id})."""
+    with trace_request(f"{request.method} {request.url.path}", request.headers.get("x-trace-id")) as tr:
+        response = await call_next(request)
+    response.headers["X-Trace-Id"] = tr.trace_id
+    return response
+
+
+class EmbedRequest(BaseModel):
+    texts: List[str]
+
+
+class ScoreRequest(BaseModel):
+    job_title: str = ""
+    job_desc: str
+    resume_text: str
+    use_cache: bool = True
+
+
+class RankResume(BaseModel):
+    id: str
+    text: str
+
+
+class RankRequest(BaseModel):
+    job_title: str = ""
+    job_desc: str
+    resumes: List[RankResume]
+    top_k: int = 10
+    cascade: bool = False
+    top_n: Optional[int] = None
+    threshold: Optional[float] = None
+    require: Optional[str] = None  # hard skill requirements, e.g. "Python AND (AWS OR GCP) AND NOT Java"
+
+
+@api.get("/health")
+async def health():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@api.get("/ready")
+async def ready():
+    """Readiness: 200 only once every warmup target has loaded."""
+    report = dict(_state.get("warmup_report") or {})
+    targets = _state.get("warmup_targets") or []
+    loading = _state.get("warmup_thread") is not None and _state["warmup_thread"].is_alive()
+    is_ready = not loading and all(report.get(t, {}).get("ok") for t in targets)
+    body = {
+        "ready": is_ready,
+        "models": report,
+        "pending": [t for t in targets if t not in report],
+        "batchers": {name: _state[name].snapshot() for name in ("embed_batcher", "ner_batcher") if name in _state},
+    }
+    return JSONResponse(body, status_code=200 if is_ready else 503)
+
+
+@api.get("/metrics")
+async def prometheus_metrics():
+    """Per-stage latency histograms, load vs. run time and RSS growth in Prometheus text format."""
+    return PlainTextResponse(metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@api.get("/dedup")
+async def dedup_stats():
+    """Dedup rate and estimated parse time saved since startup (404 unless DEDUP_ENABLED)."""
+    from app.dedup import get_dedup_store
+
+    store = get_dedup_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="dedup is disabled (DEDUP_ENABLED=0)")
+    return await asyncio.to_thread(store.report)
+
+
+@api.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    tr = find_trace(trace_id)
+    if tr is None:
+        raise HTTPException(status_code=404, detail="trace not found (only recent traces are kept)")
+    return tr.to_dict()
+
+
+@api.post("/parse")
+async def parse(file: UploadFile = File(...)):
+    """
+    Same output as parsers.parse_resume_text_from_bytes; BERT NER runs through the micro-batcher.
+    With DEDUP_ENABLED, (near-)duplicates of earlier uploads reuse the stored parse.
+    """
+    from app.dedup import get_dedup_store, lookup, remember
+    from app.parsers import ResumeDoc, extract_text_from_bytes, parse_resume
+
+    data = await file.read()
+    text = await asyncio.to_thread(extract_text_from_bytes, data, file.filename or "")
+    if not text or not text.strip():
+        raise HTTPException(status_code=422, detail="Could not extract text from the file.")
+    store = get_dedup_store()
+    if store is None:
+        with stage("bert_ner_batched"):
+            entities = await _state["ner_batcher"].submit(text)
+        return await asyncio.to_thread(parse_resume, ResumeDoc(text), entities)
+
+    hit = await asyncio.to_thread(lookup, text, store, file.filename)
+    if hit["record"] is None:
+        t0 = time.perf_counter()
+        with stage("bert_ner_batched"):
+            entities = await _state["ner_batcher"].submit(text)
+        hit["record"] = await asyncio.to_thread(parse_resume, ResumeDoc(text), entities)
+        await asyncio.to_thread(remember, text, store, hit["record"], None, time.perf_counter() - t0,
+                                file.filename, hit["signature"])
+    return {**hit["record"], "dedup": hit["dedup"]}
+
+
+@api.post("/embed")
+async def embed(req: EmbedRequest):
+    """Normalized embeddings; concurrent requests share batched encode calls."""
+    batcher = _state["embed_batcher"]
+    vectors = await asyncio.gather(*(batcher.submit(t) for t in req.texts))
+    return {"model": settings.EMBEDDING_MODEL, "embeddings": [v.tolist() for v in vectors]}
+
+
+@api.post("/score")
+async def score(req: ScoreRequest):
+    """LLM score with justification, falling back to cosine similarity like the UI does."""
+    from app.scoring import score_with_llm, score_with_cosine
+
+    res = await asyncio.to_thread(score_with_llm, req.job_title, req.job_desc, req.resume_text, req.use_cache)
+    if res.get("ok"):
+        return {"method": "llm", "score": res["score"], "justification": res.get("justification", ""),
+                "model": res.get("model"), "cached": res.get("cached", False)}
+    fallback = await asyncio.to_thread(score_with_cosine, req.resume_text, req.job_desc)
+    return {"method": "cosine", "score": fallback["score"], "similarity": fallback["similarity"],
+            "llm_error": res.get("error")}
+
+
+@api.post("/rank")
+async def rank(req: RankRequest):
+    """
+    Rank many resumes against one job: embedding ranking, or the LLM cascade with cascade=true.
+    With `require`, only resumes passing the skill expression are scored at all.
+    """
+    pairs = [(r.id, r.text) for r in req.resumes]
+    extra = {}
+    if req.require:
+        from app.skill_index import prefilter_resumes
+
+        try:
+            kept = await asyncio.to_thread(prefilter_resumes, pairs, req.require)
+        except (KeyError, ValueError) as e:
+            raise HTTPException(status_code=422, detail=f"invalid skill expression: {e}")
+        extra["filtered_out"] = len(pairs) - len(kept)
+        pairs = kept
+    if req.cascade:
+        from app.cascade import cascade_rank
+
+        report = await asyncio.to_thread(cascade_rank, req.job_title, req.job_desc, pairs, req.top_n, req.threshold)
+        report["results"] = report["results"][:req.top_k]
+        return {**report, **extra}
+    from app.batch import rank_resumes
+
+    return {"results": await asyncio.to_thread(rank_resumes, req.job_desc, pairs, req.top_k), **extra}
@@ -0,0 +1,151 @@
+# app/batch.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import heapq
+import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from app.config import settings
+from app.embeddings import embed_text, embed_list
+
+
+def similarity_to_score(sim: float) -> float:
+    """Map a cosine similarity onto the 1–10 scale used by score_with_cosine."""
+    sim_clamped = max(0.0, min(1.0, float(sim)))
+    return round(1 + 9 * sim_clamped, 2)
+
+
+def _chunks(items: Iterable[Tuple[str, str]], size: int) -> Iterator[List[Tuple[str, str]]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def rank_resumes(
+    job_desc: str,
+    resumes: Iterable[Tuple[str, str]],
+    top_k: int = 10,
+    batch_size: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rank (resume_id, resume_text) pairs against one job description.
+    The job is embedded once; resumes are streamed in chunks of `chunk_size`,
+    embedded with embed_list and scored with a single matrix-vector product per chunk.
+    Only the best `top_k` are kept (min-heap), so memory stays flat for large pools.
+    """
+    if top_k <= 0:
+        return []
+    chunk_size = chunk_size or settings.RANK_CHUNK_SIZE
+    j_vec = embed_text(job_desc).astype(np.float32)
+
+    heap: List[Tuple[float, int, str]] = []  # (similarity, seq, resume_id)
+    seq = 0
+    for chunk in _chunks(resumes, chunk_size):
+        # empty texts embed to a meaningless vector; never rank them
+        rows = [(seq + i, rid, text) for i, (rid, text) in enumerate(chunk) if text and text.strip()]
+        seq += len(chunk)
+        if not rows:
+            continue
+        emb = embed_list([text for _, _, text in rows], batch_size=batch_size).astype(np.float32, copy=False)
+        sims = emb @ j_vec
+
+        # only the chunk's own top-k can possibly enter the global top-k
+        if top_k < len(sims):
+            candidates = np.argpartition(-sims, top_k - 1)[:top_k]
+        else:
+            candidates = range(len(sims))
+        for i in candidates:
+            item = (float(sims[i]), rows[i][0], rows[i][1])
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    ranked = sorted(heap, key=lambda x: (-x[0], x[1]))
+    return [
+        {
+            "rank": pos + 1,
+            "id": rid,
+            "score": similarity_to_score(sim),
+            "similarity": max(0.0, min(1.0, sim)),
+        }
+        for pos, (sim, _, rid) in enumerate(ranked)
+    ]
+
+
+def iter_resume_files(path: str, only: Optional[Set[str]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (filename, text) for every .txt/.md/.pdf file under `path`, one file at a time.
+    With `only`, files whose relative path is not in it are skipped before being read.
+    """
+    from app.parsers import extract_text_from_bytes
+
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if not name.lower().endswith((".txt", ".md", ".pdf")):
+                continue
+            full = os.path.join(root, name)
+            if only is not None and os.path.relpath(full, path) not in only:
+                continue
+            with open(full, "rb") as f:
+                data = f.read()
+            yield os.path.relpath(full, path), extract_text_from_bytes(data, name)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rank a folder of resumes against one job description.")
+    ap.add_argument("job", help="path to a job description text file")
+    ap.add_argument("resumes", help="directory of .txt/.pdf resumes")
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--batch-size", type=int, default=settings.EMBED_BATCH_SIZE)
+    ap.add_argument("--chunk-size", type=int, default=settings.RANK_CHUNK_SIZE)
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    ap.add_argument("--require", help="only rank resumes matching a skill expression, e.g. 'Python AND NOT Java'")
+    ap.add_argument("--skill-index", help="saved app.skill_index directory for --require (default: match on the fly)")
+    args = ap.parse_args(argv)
+
+    with open(args.job, "r", encoding="utf-8", errors="ignore") as f:
+        job_desc = f.read()
+
+    resumes = iter_resume_files(args.resumes)
+    if args.require:
+        from app.skill_index import SkillIndex
+
+        if args.skill_index:
+            index = SkillIndex.load(args.skill_index)
+        else:
+            # first pass: index the folder chunk by chunk, so texts are never all held at once
+            index = SkillIndex()
+            for chunk in _chunks(resumes, args.chunk_size):
+                index.add_texts([rid for rid, _ in chunk], [text for _, text in chunk])
+        try:
+            matching = set(index.ids(args.require))
+        except (KeyError, ValueError) as e:
+            ap.error(f"--require: {e.args[0]}")
+        # the ranking pass only reads the files that match
+        resumes = iter_resume_files(args.resumes, only=matching)
+
+    results = rank_resumes(
+        job_desc,
+        resumes,
+        top_k=args.top_k,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            print(f"{r['rank']:>4}  {r['score']:>5}  {r['similarity']:.4f}  {r['id']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# app/cascade.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from app.config import settings
+from app.embeddings import embed_text, embed_list
+from app.batch import iter_resume_files, similarity_to_score
+
+
+def skill_overlap(job_skills: set, resume_skills: set) -> float:
+    """Fraction of the job's skills found in the resume (0 when the job names none)."""
+    if not job_skills:
+        return 0.0
+    return len(job_skills & resume_skills) / len(job_skills)
+
+
+def cheap_scores(job_desc: str, resumes: Sequence[Tuple[str, str]], skill_weight: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Stage 1: cosine similarity of embeddings blended with taxonomy skill overlap.
+    The job is embedded and skill-matched once; resumes go through embed_list and the
+    batched skill matcher. `cheap` is in [0, 1].
+    """
+    from app import parsers, skills as skills_module
+
+    skill_weight = settings.CASCADE_SKILL_WEIGHT if skill_weight is None else skill_weight
+    texts = [text or "" for _, text in resumes]
+    # taxonomy aliases are lowercase and the matcher compares exact token text
+    job_skills = {s["skill"] for s in parsers.extract_skills_from_taxonomy(job_desc.lower(), skills_module.SKILLS)}
+    # with no skills in the job description, rank on similarity alone
+    weight = skill_weight if job_skills else 0.0
+
+    j_vec = embed_text(job_desc).astype(np.float32)
+    sims = embed_list(texts).astype(np.float32) @ j_vec if texts else np.zeros(0)
+    resume_skills = parsers.extract_skills_from_texts((t.lower() for t in texts), skills_module.SKILLS)
+
+    out = []
+    for (rid, _), sim, found in zip(resumes, sims, resume_skills):
+        sim = max(0.0, min(1.0, float(sim)))
+        overlap = skill_overlap(job_skills, {s["skill"] for s in found})
+        out.append({
+            "id": rid,
+            "similarity": sim,
+            "skill_overlap": overlap,
+            "cheap": (1 - weight) * sim + weight * overlap,
+        })
+    return out
+
+
+def cascade_rank(job_title: str, job_desc: str, resumes: Sequence[Tuple[str, str]],
+                 top_n: Optional[int] = None, threshold: Optional[float] = None,
+                 llm_scorer: Optional[Callable[[str, str, str], Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Two-stage ranking. Every resume gets the cheap score; only candidates with
+    cheap >= `threshold`, capped at the best `top_n` (0 disables either cutoff),
+    are sent to the LLM. Shortlisted resumes are ranked by LLM score, the rest
+    follow by cheap score (mapped to the same 1–10 scale).
+    """
+    from app.scoring import score_with_llm
+
+    top_n = settings.CASCADE_TOP_N if top_n is None else top_n
+    threshold = settings.CASCADE_THRESHOLD if threshold is None else threshold
+    llm_scorer = llm_scorer or score_with_llm
+
+    texts = dict(resumes)
+    rows = sorted(cheap_scores(job_desc, resumes), key=lambda r: -r["cheap"])
+    shortlist = [r for r in rows if r["cheap"] >= threshold]
+    if top_n:
+        shortlist = shortlist[:top_n]
+    shortlisted = {r["id"] for r in shortlist}
+
+    for r in rows:
+        r["score"] = similarity_to_score(r["cheap"])
+        r["stage"] = "cheap"
+        if r["id"] in shortlisted:
+            res = llm_scorer(job_title, job_desc, texts[r["id"]])
+            if res.get("ok"):
+                r["score"] = res["score"]
+                r["justification"] = res.get("justification", "")
+                r["stage"] = "llm"
+            else:
+                r["llm_error"] = res.get("error")
+
+    rows.sort(key=lambda r: (r["stage"] != "llm", -r["score"], -r["cheap"]))
+    for pos, r in enumerate(rows):
+        r["rank"] = pos + 1
+    llm_calls = len(shortlisted)
+    return {"results": rows, "llm_calls": llm_calls, "llm_calls_avoided": len(rows) - llm_calls}
+
+
+def _ranks(values: Sequence[float]) -> np.ndarray:
+    """1-based ranks, highest value first, ties sharing their average rank."""
+    values = np.asarray(values, dtype=float)
+    order = np.argsort(-values, kind="stable")
+    ranks = np.empty(len(values))
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        ranks[order[i:j + 1]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def spearman(a: Sequence[float], b: Sequence[float]) -> float:
+    if len(a) < 2:
+        return 1.0
+    ra, rb = _ranks(a), _ranks(b)
+    if ra.std() == 0 or rb.std() == 0:
+        return 0.0
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def evaluate(fixture: Dict[str, Any], top_n: Optional[int] = None, threshold: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Compare cascade ranking with LLM-only ranking on a labelled fixture:
+    {"job_title", "job_desc", "resumes": [{"id", "text", "llm_score"}]}.
+    Resumes without an "llm_score" label are scored with the LLM first (counted in
+    "scored_live"); the fixture itself is not modified.
+    """
+    from app.scoring import score_with_llm
+
+    job_title, job_desc = fixture.get("job_title", ""), fixture["job_desc"]
+    labels, scored_live = {}, 0
+    for r in fixture["resumes"]:
+        score = r.get("llm_score")
+        if score is None:
+            res = score_with_llm(job_title, job_desc, r["text"])
+            score = res["score"] if res.get("ok") else None
+            scored_live += 1
+        labels[r["id"]] = score
+    labelled = [{**r, "llm_score": labels[r["id"]]} for r in fixture["resumes"] if labels[r["id"]] is not None]
+
+    def labelled_scorer(_title, _job, text, _by_text={r["text"]: r["llm_score"] for r in labelled}):
+        return {"ok": True, "score": _by_text[text]}
+
+    report = cascade_rank(job_title, job_desc, [(r["id"], r["text"]) for r in labelled],
+                          top_n=top_n, threshold=threshold, llm_scorer=labelled_scorer)
+    rows = report["results"]
+    n = report["llm_calls"] or len(rows)
+    llm_top = {r["id"] for r in sorted(labelled, key=lambda r: -r["llm_score"])[:n]}
+    cascade_top = {r["id"] for r in rows if r["stage"] == "llm"}
+    return {
+        "resumes": len(rows),
+        "scored_live": scored_live,
+        "llm_calls": report["llm_calls"],
+        "llm_calls_avoided": report["llm_calls_avoided"],
+        # agreement of the final cascade order with LLM-only order
+        "spearman": spearman([-r["rank"] for r in rows], [labels[r["id"]] for r in rows]),
+        # share of the LLM-only top-N that survived the prefilter
+        "shortlist_recall": len(llm_top & cascade_top) / len(llm_top) if llm_top else 1.0,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Cascade scoring: cheap prefilter, LLM only for the shortlist.")
+    ap.add_argument("job", help="job description text file, or a labelled fixture .json with --evaluate")
+    ap.add_argument("resumes", nargs="?", help="directory of .txt/.pdf resumes")
+    ap.add_argument("--title", default="")
+    ap.add_argument("--top-n", type=int, default=settings.CASCADE_TOP_N)
+    ap.add_argument("--threshold", type=float, default=settings.CASCADE_THRESHOLD)
+    ap.add_argument("--evaluate", action="store_true", help="report rank agreement on a labelled fixture")
+    ap.add_argument("--require", help="only score resumes matching a skill expression, e.g. 'Python AND NOT Java'")
+    args = ap.parse_args(argv)
+
+    if args.evaluate:
+        with open(args.job, "r", encoding="utf-8") as f:
+            fixture = json.load(f)
+        print(json.dumps(evaluate(fixture, args.top_n, args.threshold), indent=2))
+        return
+
+    with open(args.job, "r", encoding="utf-8", errors="ignore") as f:
+        job_desc = f.read()
+    resumes = list(iter_resume_files(args.resumes))
+    if args.require:
+        from app.skill_index import prefilter_resumes
+
+        resumes = prefilter_resumes(resumes, args.require)
+    report = cascade_rank(args.title, job_desc, resumes,
+                          top_n=args.top_n, threshold=args.threshold)
+    for r in report["results"]:
+        print(f"{r['rank']:>4}  {r['score']:>5}  {r['stage']:<5}  {r['cheap']:.3f}  {r['id']}")
+    print(f"LLM calls: {report['llm_calls']}, avoided: {report['llm_calls_avoided']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# app/chunked.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from app.config import settings
+
+# all-MiniLM-L6-v2 reads 256 word pieces; ~160 words leaves room for sub-word splits
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+|\n+")
+_HEADING_RE = re.compile(
+    r"^\s*(experience|work experience|employment|education|projects|skills|summary|profile|"
+    r"certifications|publications|awards)\b\s*:?", re.IGNORECASE)
+_SCORE_BLOCK = 2048  # chunk rows upcast to float32 at a time when scoring
+
+
+def chunk_text(text: str, max_words: Optional[int] = None) -> List[str]:
+    """
+    Split a resume into windows of at most `max_words` words.
+    Sentences (and lines) are packed greedily, a section heading always starts a new
+    window, and a single sentence longer than the window is cut on word boundaries.
+    """
+    max_words = max_words or settings.CHUNK_WORDS
+    chunks: List[str] = []
+    current: List[str] = []
+
+    def flush():
+        if current:
+            chunks.append(" ".join(current))
+            current.clear()
+
+    for sentence in _SENTENCE_RE.split(text or ""):
+        words = sentence.split()
+        if not words:
+            continue
+        if _HEADING_RE.match(sentence):
+            flush()
+        while len(words) > max_words:
+            flush()
+            chunks.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+        if len(current) + len(words) > max_words:
+            flush()
+        current.extend(words)
+    flush()
+    return chunks
+
+
+def quantize(mat: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Compact storage for unit-normalized rows: "float16", or "int8" with one float32
+    scale per row (x ≈ q * scale). Returns (data, scales); scales is None unless int8.
+    """
+    mat = np.asarray(mat, dtype=np.float32)
+    if dtype == "float16":
+        return mat.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(mat).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        q = np.clip(np.rint(mat / scales[:, None]), -127, 127).astype(np.int8)
+        return q, scales.astype(np.float32)
+    if dtype == "float32":
+        return mat, None
+    raise ValueError(f"unsupported chunk dtype: {dtype}")
+
+
+def pool_scores(sims: np.ndarray, offsets: np.ndarray, pooling: str = "max", k: int = 3) -> np.ndarray:
+    """
+    Reduce per-chunk similarities to one score per resume.
+    `offsets[i]:offsets[i + 1]` are the chunk rows of resume i.
+    "max" is max-sim; "topk" averages the best `k` chunks (fewer if the resume is short).
+    """
+    counts = np.diff(offsets)
+    out = np.zeros(len(counts), dtype=np.float32)
+    nonempty = counts > 0
+    if not nonempty.any():
+        return out
+    if pooling == "max":
+        out[nonempty] = np.maximum.reduceat(sims, offsets[:-1][nonempty])
+        return out
+    if pooling != "topk":
+        raise ValueError(f"unknown pooling: {pooling}")
+    # pad to a (resumes, max chunks) matrix so the top k of every row sort in one call
+    width = int(counts.max())
+    padded = np.full((len(counts), width), -np.inf, dtype=np.float32)
+    cols = np.arange(len(sims)) - np.repeat(offsets[:-1], counts)
+    padded[np.repeat(np.arange(len(counts)), counts), cols] = sims
+    kk = min(k, width)
+    top = -np.sort(-padded, axis=1)[:, :kk]
+    top[np.isinf(top)] = 0.0
+    out[nonempty] = top[nonempty].sum(axis=1) / np.minimum(counts[nonempty], kk)
+    return out
+
+
+class ChunkStore:
+    """
+    Per-resume chunk embeddings kept as one stacked matrix plus row offsets.
+    Rows are stored as float16 or int8 (see quantize); a query is one matmul over
+    all chunks followed by max-sim or top-k-mean pooling per resume.
+    """
+
+    def __init__(self, dim: int, dtype: Optional[str] = None):
+        self.dim = dim
+        self.dtype = dtype or settings.CHUNK_DTYPE
+        self.ids: List[str] = []
+        self._parts: List[np.ndarray] = []
+        self._scale_parts: List[np.ndarray] = []
+        self._data: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._counts: List[int] = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, resume_id: str, chunk_vectors: np.ndarray):
+        data, scales = quantize(np.asarray(chunk_vectors).reshape(-1, self.dim), self.dtype)
+        self.ids.append(resume_id)
+        self._parts.append(data)
+        if scales is not None:
+            self._scale_parts.append(scales)
+        self._counts.append(len(data))
+
+    def _consolidate(self):
+        if self._parts:
+            stacked = self._parts if self._data is None else [self._data] + self._parts
+            self._data = np.concatenate(stacked)
+            self._parts = []
+            if self._scale_parts:
+                stacked = self._scale_parts if self._scales is None else [self._scales] + self._scale_parts
+                self._scales = np.concatenate(stacked)
+                self._scale_parts = []
+        if self._data is None:
+            self._data = np.zeros((0, self.dim), dtype=np.float32)
+        if len(self._offsets) != len(self._counts) + 1:
+            self._offsets = np.concatenate(([0], np.cumsum(self._counts, dtype=np.int64)))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by chunk vectors, per-row scales and offsets."""
+        self._consolidate()
+        extra = self._scales.nbytes if self._scales is not None else 0
+        return int(self._data.nbytes + extra + self._offsets.nbytes)
+
+    def chunk_counts(self) -> np.ndarray:
+        return np.asarray(self._counts, dtype=np.int64)
+
+    def scores(self, query: np.ndarray, pooling: Optional[str] = None, k: Optional[int] = None) -> np.ndarray:
+        """Pooled cosine similarity of every stored resume against a unit-normalized query."""
+        self._consolidate()
+        q = np.asarray(query, dtype=np.float32)
+        sims = np.empty(len(self._data), dtype=np.float32)
+        # upcast block by block: BLAS needs float32, and a full copy would undo the compact storage
+        for start in range(0, len(self._data), _SCORE_BLOCK):
+            block = self._data[start:start + _SCORE_BLOCK].astype(np.float32, copy=False)
+            sims[start:start + len(block)] = block @ q
+        if self._scales is not None:
+            sims *= self._scales
+        return pool_scores(sims, self._offsets,
+                           pooling or settings.CHUNK_POOLING, k or settings.CHUNK_TOP_K)
+
+    def save(self, path: str):
+        self._consolidate()
+        arrays = {"data": self._data, "offsets": self._offsets, "ids": np.array(self.ids)}
+        if self._scales is not None:
+            arrays["scales"] = self._scales
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ChunkStore":
+        with np.load(path) as f:
+            data = f["data"]
+            dtype = {np.dtype(np.int8): "int8", np.dtype(np.float16): "float16"}.get(data.dtype, "float32")
+            store = cls(data.shape[1], dtype)
+            store._data = data
+            store._scales = f["scales"] if "scales" in f else None
+            store._offsets = f["offsets"]
+            store._counts = np.diff(store._offsets).tolist()
+            store.ids = [str(x) for x in f["ids"]]
+        return store
+
+    def search(self, query: np.ndarray, top_k: int = 10, pooling: Optional[str] = None,
+               k: Optional[int] = None) -> List[Dict]:
+        scores = self.scores(query, pooling, k)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [{"id": self.ids[i], "similarity": float(scores[i])} for i in order]
+
+
+def embed_chunks_many(texts: Sequence[str], max_words: Optional[int] = None) -> List[np.ndarray]:
+    """Chunk every text and embed all chunks with a single batched embed_list call."""
+    from app.embeddings import embed_list, get_embedding_model
+
+    per_text = [chunk_text(t, max_words) for t in texts]
+    flat = [c for chunks in per_text for c in chunks]
+    if not flat:
+        dim = get_embedding_model().get_sentence_embedding_dimension()
+        return [np.zeros((0, dim), dtype=np.float32) for _ in texts]
+    emb = embed_list(flat)
+    out, start = [], 0
+    for chunks in per_text:
+        out.append(emb[start:start + len(chunks)])
+        start += len(chunks)
+    return out
+
+
+def embed_chunks(text: str, max_words: Optional[int] = None) -> np.ndarray:
+    return embed_chunks_many([text], max_words)[0]
+
+
+def chunked_similarity(resume_text: str, job_desc: str, pooling: Optional[str] = None, k: Optional[int] = None) -> float:
+    """Pooled similarity of one resume's chunks against the job description."""
+    from app.embeddings import embed_text
+
+    chunks = embed_chunks(resume_text)
+    if len(chunks) == 0:
+        return 0.0
+    sims = chunks @ embed_text(job_desc).astype(np.float32)
+    return float(pool_scores(sims, np.array([0, len(sims)]), pooling or settings.CHUNK_POOLING,
+                             k or settings.CHUNK_TOP_K)[0])
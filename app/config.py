@@ -5,13 +5,72 @@ load_dotenv()
 
 class Settings:
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", 32))  # texts per model.encode batch
+    RANK_CHUNK_SIZE = int(os.getenv("RANK_CHUNK_SIZE", 1024))  # resumes held in memory per ranking step
+    EMBED_CACHE_ENABLED = os.getenv("EMBED_CACHE_ENABLED", "1") == "1"
+    EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", os.path.join(".cache", "embeddings.sqlite"))
+    EMBED_CACHE_MAX_ITEMS = int(os.getenv("EMBED_CACHE_MAX_ITEMS", 200000))  # rows kept on disk
+    EMBED_CACHE_MEM_ITEMS = int(os.getenv("EMBED_CACHE_MEM_ITEMS", 4096))  # vectors kept in the LRU memory tier
+    EMBED_CHUNKED = os.getenv("EMBED_CHUNKED", "0") == "1"  # cosine scoring over resume chunks instead of one vector
+    CHUNK_WORDS = int(os.getenv("CHUNK_WORDS", 160))  # words per chunk window
+    CHUNK_DTYPE = os.getenv("CHUNK_DTYPE", "float16")  # float16 | int8 | float32
+    CHUNK_POOLING = os.getenv("CHUNK_POOLING", "max")  # max | topk
+    CHUNK_TOP_K = int(os.getenv("CHUNK_TOP_K", 3))  # chunks averaged by topk pooling
     LLM_MODEL = os.getenv("LLM_MODEL", "google/flan-t5-small")
     LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", 256))
+    LLM_WARMUP = os.getenv("LLM_WARMUP", "0") == "1"  # preload the local LLM at startup
+    LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", 8))  # prompts per generate() call in batch scoring
+    LLM_NUM_THREADS = int(os.getenv("LLM_NUM_THREADS", 0))  # torch intra-op threads; 0 = torch default
+    LLM_QUANTIZE = os.getenv("LLM_QUANTIZE", "0") == "1"  # dynamic int8 quantization of the local model
+    LLM_PROMPT_BUDGET = os.getenv("LLM_PROMPT_BUDGET", "1") == "1"  # pack local prompts into the model's context
+    LLM_PROMPT_MAX_TOKENS = int(os.getenv("LLM_PROMPT_MAX_TOKENS", 0))  # 0 = tokenizer's model_max_length
+    LLM_PROMPT_JOB_SHARE = float(os.getenv("LLM_PROMPT_JOB_SHARE", 0.35))  # max share of the budget for the job text
+    LLM_IDLE_EVICT_SECONDS = int(os.getenv("LLM_IDLE_EVICT_SECONDS", 0))  # 0 = never evict
+    SCORE_CACHE_ENABLED = os.getenv("SCORE_CACHE_ENABLED", "1") == "1"
+    SCORE_CACHE_PATH = os.getenv("SCORE_CACHE_PATH", os.path.join(".cache", "scores.sqlite"))
+    SCORE_CACHE_TTL = float(os.getenv("SCORE_CACHE_TTL", 7 * 24 * 3600))  # seconds; 0 = never expire
+    SCORE_CACHE_MAX_ITEMS = int(os.getenv("SCORE_CACHE_MAX_ITEMS", 50000))
     TOP_K_SKILLS = int(os.getenv("TOP_K_SKILLS", 8))
+    CASCADE_TOP_N = int(os.getenv("CASCADE_TOP_N", 10))  # resumes sent to the LLM after the cheap pass (0 = no cap)
+    CASCADE_THRESHOLD = float(os.getenv("CASCADE_THRESHOLD", 0.0))  # minimum cheap score (0-1) for the LLM pass
+    CASCADE_SKILL_WEIGHT = float(os.getenv("CASCADE_SKILL_WEIGHT", 0.4))  # skill overlap share of the cheap score
     SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+    SPACY_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", 1))  # -1 = one process per CPU for bulk parsing
+    SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", 32))
+    PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")  # auto | pymupdf | pypdfium2 | pdfminer
+    PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 20000))  # stop reading pages past this; 0 = whole file
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 0))  # 0 = one extraction process per CPU
+    INGEST_TIMEOUT = float(os.getenv("INGEST_TIMEOUT", 60))  # seconds per file
+    API_BATCH_MAX_SIZE = int(os.getenv("API_BATCH_MAX_SIZE", 32))  # requests merged into one embedding/NER forward pass
+    API_BATCH_MAX_WAIT_MS = float(os.getenv("API_BATCH_MAX_WAIT_MS", 5))  # how long a batch waits to fill up
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "1") == "1"  # per-stage timings, RSS and traces
+    TRACE_LOG = os.getenv("TRACE_LOG", "0") == "1"  # log a JSON trace for every request
+    TELEMETRY_RSS_SAMPLE_MS = float(os.getenv("TELEMETRY_RSS_SAMPLE_MS", 10))  # peak-RSS polling interval while stages run; 0 = off
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "0") == "1"  # reuse parses/embeddings of (near-)duplicate resumes
+    DEDUP_PATH = os.getenv("DEDUP_PATH", os.path.join(".cache", "dedup.sqlite"))
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.8))  # estimated Jaccard over word shingles
+    DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", 128))  # MinHash signature length
+    DEDUP_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", 3))  # words per shingle
+    DEDUP_MIN_WORDS = int(os.getenv("DEDUP_MIN_WORDS", 20))  # shorter texts are never treated as duplicates
     LLM_MODE = os.getenv("LLM_MODE", "LOCAL")  # <--- Add this line!
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "models/gemini-2.5-flash")
+    GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "")  # REST endpoint override, e.g. a local stub server
+    GEMINI_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", 16))  # max in-flight requests
+    GEMINI_RATE_PER_SEC = float(os.getenv("GEMINI_RATE_PER_SEC", 10))  # token-bucket refill rate
+    GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", 30))  # seconds per attempt
+    GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 4))
     BERT_NER_MODEL: str = "dslim/bert-base-NER"
+    BERT_NER_WINDOW_TOKENS = int(os.getenv("BERT_NER_WINDOW_TOKENS", 510))  # capped at the model limit
+    BERT_NER_OVERLAP_TOKENS = int(os.getenv("BERT_NER_OVERLAP_TOKENS", 64))
+    BERT_NER_BATCH_SIZE = int(os.getenv("BERT_NER_BATCH_SIZE", 8))
+    INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")  # torch | onnx | onnx-int8 (embedding + BERT NER)
+    ONNX_DIR = os.getenv("ONNX_DIR", os.path.join(".cache", "onnx"))  # exported graphs, one folder per model
+    ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", 0))  # threads inside one op; 0 = onnxruntime default
+    ONNX_INTER_OP_THREADS = int(os.getenv("ONNX_INTER_OP_THREADS", 0))  # threads across independent ops; 0 = default
+    ONNX_PARITY_TOLERANCE = float(os.getenv("ONNX_PARITY_TOLERANCE", 1e-4))  # max abs diff vs torch, fp32
+    ONNX_INT8_TOLERANCE = float(os.getenv("ONNX_INT8_TOLERANCE", 0.05))  # max abs diff vs torch, int8
 
 settings = Settings()
 
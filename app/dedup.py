@@ -0,0 +1,394 @@
+# app/dedup.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from app.config import settings
+from app.telemetry import get_logger, stage
+
+log = get_logger("dedup")
+
+# scripts written without spaces: every character counts as a word
+_UNSPACED = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_WORD_RE = re.compile(rf"[{_UNSPACED}]|(?:(?![{_UNSPACED}])[\w@+#.])+")
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+# bump when normalize() changes: stored hashes and signatures are built from its output
+NORMALIZE_VERSION = 2
+
+
+def normalize(text: str) -> str:
+    """Casefolded words in any script, so re-exports with different whitespace/punctuation hash alike."""
+    return " ".join(_WORD_RE.findall(unicodedata.normalize("NFKC", text or "").casefold()))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()
+
+
+def raw_hash(text: str) -> str:
+    """Hash of the text as extracted; a stored parse is reused verbatim only when this matches."""
+    return hashlib.sha256((text or "").encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def shingles(norm_text: str, k: int) -> np.ndarray:
+    """CRC32 of every k-word shingle (uint64 so the MinHash arithmetic cannot overflow)."""
+    words = norm_text.split()
+    if len(words) < k:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams)))
+
+
+class MinHasher:
+    """MinHash with `num_perm` universal hashes h(x) = (a*x + b) mod p, p just above 2**32."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # a < 2**31 keeps a*x + b below 2**64 for 32-bit x
+        self._a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        sh = shingles(normalize(text), self.shingle_size)
+        if len(sh) == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        hashed = (sh[:, None] * self._a[None, :] + self._b[None, :]) % _PRIME
+        return hashed.min(axis=0).astype(np.uint32)
+
+
+def jaccard_estimate(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+def _collision_area(bands: int, rows: int, lo: float, hi: float, above: bool) -> float:
+    """Integral of P(share a band) = 1 - (1 - s^r)^b over [lo, hi] (or of its complement when `above`)."""
+    s = np.linspace(lo, hi, 201)
+    p = 1.0 - (1.0 - s ** rows) ** bands
+    return float(np.mean(1.0 - p if above else p)) * (hi - lo)
+
+
+def lsh_params(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows <= num_perm that minimise the false positive area below
+    `threshold` plus the false negative area above it (the LSH S-curve centred on the threshold).
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        for bands in range(1, num_perm // rows + 1):
+            err = (_collision_area(bands, rows, 0.0, threshold, False)
+                   + _collision_area(bands, rows, threshold, 1.0, True))
+            if best is None or err < best[0]:
+                best = (err, bands, rows)
+    return best[1], best[2]
+
+
+def _band_keys(sig: np.ndarray, bands: int, rows: int) -> List[int]:
+    """One signed 64-bit key per band (SQLite INTEGER)."""
+    keys = []
+    for i in range(bands):
+        digest = hashlib.blake2b(sig[i * rows:(i + 1) * rows].tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+class DedupStore:
+    """
+    Persistent fingerprint store (SQLite) for resumes already processed.
+    Each document keeps its exact content hash, a MinHash signature, the stored parse
+    and embedding. Near-duplicate lookup goes through an LSH band table indexed on
+    (band, key), so a query touches only colliding documents, never the whole store.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 3,
+                 min_words: int = 20):
+        self.path = path
+        self.threshold = threshold
+        self.min_words = min_words
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = lsh_params(num_perm, threshold)
+        self._lock = threading.Lock()
+        self.stats = {"seen": 0, "exact": 0, "near": 0, "unique": 0,
+                      "full_seconds": 0.0, "reuse_seconds": 0.0}
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, doc_id TEXT, content_hash TEXT NOT NULL, "
+            "signature BLOB NOT NULL, record TEXT, embedding BLOB, created REAL NOT NULL, raw_hash TEXT)"
+        )
+        if "raw_hash" not in [c[1] for c in self._conn.execute("PRAGMA table_info(docs)")]:
+            self._conn.execute("ALTER TABLE docs ADD COLUMN raw_hash TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_hash ON docs(content_hash)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, key INTEGER NOT NULL, doc INTEGER NOT NULL, "
+            "PRIMARY KEY (band, key, doc)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        minhash = json.dumps({"num_perm": num_perm, "shingle_size": shingle_size, "normalize": NORMALIZE_VERSION})
+        lsh = json.dumps({"bands": self.bands, "rows": self.rows})
+        meta = dict(self._conn.execute("SELECT name, value FROM meta").fetchall())
+        if meta.get("minhash", minhash) != minhash:
+            # signatures from other MinHash parameters are not comparable
+            log.warning("dedup store %s was built with %s; clearing it", path, meta["minhash"])
+            self._conn.execute("DELETE FROM docs")
+            self._conn.execute("DELETE FROM bands")
+        elif meta.get("lsh", lsh) != lsh:
+            self._rebuild_bands()
+        self._conn.executemany("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                               [("minhash", minhash), ("lsh", lsh)])
+        self._conn.commit()
+
+    def _rebuild_bands(self):
+        """Re-band the stored signatures after the threshold (and so bands x rows) changed."""
+        log.info("re-banding dedup store %s for %d bands x %d rows", self.path, self.bands, self.rows)
+        self._conn.execute("DELETE FROM bands")
+        for rowid, sig in self._conn.execute("SELECT id, signature FROM docs").fetchall():
+            keys = _band_keys(np.frombuffer(sig, dtype=np.uint32), self.bands, self.rows)
+            self._conn.executemany("INSERT OR IGNORE INTO bands (band, key, doc) VALUES (?, ?, ?)",
+                                   [(band, key, rowid) for band, key in enumerate(keys)])
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def _load(self, row) -> Dict[str, Any]:
+        rowid, doc_id, chash, sig, record, emb = row
+        return {
+            "rowid": rowid,
+            "doc_id": doc_id,
+            "content_hash": chash,
+            "signature": np.frombuffer(sig, dtype=np.uint32),
+            "record": json.loads(record) if record else None,
+            "embedding": np.frombuffer(emb, dtype=np.float32).copy() if emb else None,
+        }
+
+    def find(self, text: str) -> Tuple[Optional[Dict[str, Any]], str, float, np.ndarray]:
+        """
+        Best stored match for `text`: (match, kind, similarity, signature) with kind
+        "exact", "near" or "none". The signature is returned for a later add().
+        "exact" means the same extracted text; the same normalized text laid out differently
+        is "near" with similarity 1.0, since the stored raw text and offsets belong to the other copy.
+        Texts shorter than `min_words` normalized words never match anything.
+        """
+        norm = normalize(text)
+        sig = self.hasher.signature(text)
+        if len(norm.split()) < self.min_words:
+            return None, "none", 0.0, sig
+        chash = hashlib.sha256(norm.encode("utf-8")).hexdigest()
+        rhash = raw_hash(text)
+        cols = "id, doc_id, content_hash, signature, record, embedding"
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {cols}, raw_hash FROM docs WHERE content_hash = ? ORDER BY raw_hash IS ? DESC LIMIT 1",
+                (chash, rhash)).fetchone()
+        if row is not None:
+            return self._load(row[:-1]), "exact" if row[-1] == rhash else "near", 1.0, sig
+        keys = _band_keys(sig, self.bands, self.rows)
+        with self._lock:
+            cand = self._conn.execute(
+                "SELECT DISTINCT doc FROM bands WHERE " + " OR ".join(["(band = ? AND key = ?)"] * len(keys)),
+                [v for pair in enumerate(keys) for v in pair],
+            ).fetchall()
+            best, best_sim = None, 0.0
+            for i in range(0, len(cand), 500):
+                part = [c[0] for c in cand[i:i + 500]]
+                rows = self._conn.execute(
+                    f"SELECT {cols} FROM docs WHERE id IN ({','.join('?' * len(part))})", part).fetchall()
+                for r in rows:
+                    sim = jaccard_estimate(sig, np.frombuffer(r[3], dtype=np.uint32))
+                    if sim > best_sim:
+                        best, best_sim = r, sim
+        if best is not None and best_sim >= self.threshold:
+            return self._load(best), "near", best_sim, sig
+        return None, "none", best_sim, sig
+
+    def _insert(self, rows: List[Tuple]) -> List[int]:
+        """rows of (doc_id, content_hash, raw_hash, signature, record_json, embedding_bytes); one transaction."""
+        ids = []
+        with self._lock:
+            for doc_id, chash, rhash, sig, record, emb in rows:
+                cur = self._conn.execute(
+                    "INSERT INTO docs (doc_id, content_hash, raw_hash, signature, record, embedding, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (doc_id, chash, rhash, sig.astype(np.uint32).tobytes(), record, emb, time.time()),
+                )
+                ids.append(cur.lastrowid)
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO bands (band, key, doc) VALUES (?, ?, ?)",
+                    [(band, key, cur.lastrowid) for band, key in enumerate(_band_keys(sig, self.bands, self.rows))],
+                )
+            self._conn.commit()
+        return ids
+
+    def add(self, text: str, record: Optional[Dict[str, Any]] = None, embedding: Optional[np.ndarray] = None,
+            doc_id: Optional[str] = None, signature: Optional[np.ndarray] = None) -> int:
+        sig = self.hasher.signature(text) if signature is None else signature
+        emb = np.ascontiguousarray(embedding, dtype=np.float32).tobytes() if embedding is not None else None
+        rec = json.dumps(record, ensure_ascii=False) if record is not None else None
+        return self._insert([(doc_id, content_hash(text), raw_hash(text), sig, rec, emb)])[0]
+
+    def add_signatures(self, signatures: np.ndarray, doc_ids: List[str], content_hashes: List[str]) -> List[int]:
+        """Bulk-load precomputed fingerprints (no stored parse), e.g. when backfilling an existing archive."""
+        return self._insert([(d, h, None, sig, None, None) for sig, d, h in zip(signatures, doc_ids, content_hashes)])
+
+    def report(self) -> Dict[str, Any]:
+        s = dict(self.stats)
+        reused = s["exact"] + s["near"]
+        s["dedup_rate"] = round(reused / s["seen"], 4) if s["seen"] else 0.0
+        # a reused document would have cost about as much as the average full parse
+        avg_full = s["full_seconds"] / s["unique"] if s["unique"] else 0.0
+        s["time_saved_seconds"] = round(max(0.0, reused * avg_full - s["reuse_seconds"]), 3)
+        s["stored"] = len(self)
+        return s
+
+
+def _realign_entities(entities: List[Dict[str, Any]], text: str) -> List[Dict[str, Any]]:
+    """Keep stored entities that still occur in the edited text, with offsets moved to where they are now."""
+    out = []
+    for ent in entities or []:
+        start = ent.get("start")
+        name = ent.get("text") or ""
+        if start is not None and text[start:ent.get("end", start)] == name:
+            out.append(ent)
+            continue
+        idx = text.find(name) if name else -1
+        if idx >= 0:
+            out.append({**ent, "start": idx, "end": idx + len(name)})
+    return out
+
+
+def reparse_near_duplicate(text: str, stored: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse an edited copy by reusing the model outputs of the stored parse (spaCy names/orgs,
+    BERT entities) and recomputing only the cheap text-exact parts: raw text, sections,
+    contact regexes and taxonomy skills.
+    """
+    from app import parsers, skills as skills_module
+
+    basic = dict(stored.get("basic") or {})
+    email = parsers.EMAIL_RE.search(text)
+    phone = parsers.PHONE_RE.search(text)
+    basic["email"] = email.group(0) if email else None
+    basic["phone"] = phone.group(0) if phone else None
+    basic["names"] = [n for n in basic.get("names", []) if n in text]
+    basic["orgs"] = [o for o in basic.get("orgs", []) if o in text]
+    return {
+        "raw": text[:20000],
+        "basic": basic,
+        "sections": parsers.extract_sections(text),
+        "bert_entities": _realign_entities(stored.get("bert_entities"), text),
+        "skills": parsers.extract_skills_from_taxonomy(text, skills_module.SKILLS),
+    }
+
+
+def lookup(text: str, store: "DedupStore", doc_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Fingerprint an extracted resume text and reuse whatever the store already has for it:
+    the stored parse for an exact copy, a patched parse (see reparse_near_duplicate) for a
+    near-duplicate. "record" is None for a new document; parse it and call remember().
+    """
+    t0 = time.perf_counter()
+    with stage("dedup_lookup"):
+        match, kind, sim, sig = store.find(text)
+    if match is not None and match["record"] is None:
+        kind = "none"  # fingerprint only (add_signatures): nothing to reuse
+    record, emb = None, None
+    if kind == "exact":
+        record, emb = match["record"], match["embedding"]
+    elif kind == "near":
+        record = reparse_near_duplicate(text, match["record"] or {})
+        emb = match["embedding"]
+        store.add(text, record, emb, doc_id, sig)
+    info = {"kind": kind, "similarity": round(sim, 4)}
+    if match is not None:
+        info["of"] = match["doc_id"]
+    with store._lock:
+        store.stats["seen"] += 1
+        if kind != "none":
+            store.stats[kind] += 1
+            store.stats["reuse_seconds"] += time.perf_counter() - t0
+    return {"record": record, "embedding": emb, "dedup": info, "signature": sig}
+
+
+def remember(text: str, store: "DedupStore", record: Dict[str, Any], embedding: Optional[np.ndarray],
+             seconds: float, doc_id: Optional[str] = None, signature: Optional[np.ndarray] = None):
+    """Store a freshly parsed document; `seconds` is what the full parse cost (feeds time_saved)."""
+    store.add(text, record, embedding, doc_id, signature)
+    with store._lock:
+        store.stats["unique"] += 1
+        store.stats["full_seconds"] += seconds
+
+
+def parse_with_dedup(text: str, store: "DedupStore", doc_id: Optional[str] = None,
+                     with_embedding: bool = True) -> Dict[str, Any]:
+    """lookup(), falling back to a full parse + embedding for new documents. Returns {"record", "embedding", "dedup"}."""
+    hit = lookup(text, store, doc_id)
+    if hit["record"] is None:
+        from app.parsers import ResumeDoc, parse_resume
+
+        t0 = time.perf_counter()
+        hit["record"] = parse_resume(ResumeDoc(text))
+        if with_embedding:
+            from app.embeddings import embed_text
+            hit["embedding"] = embed_text(text)
+        remember(text, store, hit["record"], hit["embedding"], time.perf_counter() - t0, doc_id, hit["signature"])
+    elif with_embedding and hit["embedding"] is None:
+        from app.embeddings import embed_text
+        hit["embedding"] = embed_text(text)
+    hit.pop("signature")
+    return hit
+
+
+_store: Optional[DedupStore] = None
+_store_lock = threading.Lock()
+
+
+def get_dedup_store() -> Optional[DedupStore]:
+    """Process-wide dedup store, or None when DEDUP_ENABLED is off."""
+    global _store
+    if not settings.DEDUP_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = DedupStore(settings.DEDUP_PATH, threshold=settings.DEDUP_THRESHOLD,
+                                num_perm=settings.DEDUP_NUM_PERM, shingle_size=settings.DEDUP_SHINGLE_SIZE,
+                                min_words=settings.DEDUP_MIN_WORDS)
+    return _store
+
+
+def main(argv=None):
+    from app.ingest import iter_source
+    from app.parsers import extract_text_from_bytes
+
+    ap = argparse.ArgumentParser(description="Fingerprint and parse resumes, reusing work for (near-)duplicates.")
+    ap.add_argument("source", help="directory, .zip or .jsonl manifest")
+    ap.add_argument("--db", default=settings.DEDUP_PATH)
+    ap.add_argument("--threshold", type=float, default=settings.DEDUP_THRESHOLD)
+    ap.add_argument("--no-embed", action="store_true", help="skip embedding new documents")
+    args = ap.parse_args(argv)
+
+    store = DedupStore(args.db, threshold=args.threshold, num_perm=settings.DEDUP_NUM_PERM,
+                       shingle_size=settings.DEDUP_SHINGLE_SIZE, min_words=settings.DEDUP_MIN_WORDS)
+    for item in iter_source(args.source):
+        text = item["text"] if item["text"] is not None else extract_text_from_bytes(item["data"], item["filename"])
+        res = parse_with_dedup(text, store, item["id"], with_embedding=not args.no_embed)
+        print(f"{res['dedup']['kind']:<6} {res['dedup']['similarity']:.3f}  {item['id']}  {res['dedup'].get('of', '')}")
+    print(json.dumps(store.report(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
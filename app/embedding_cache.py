@@ -0,0 +1,185 @@
+# app/embedding_cache.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from app.config import settings
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially reformatted copies share a cache entry."""
+    return _WS_RE.sub(" ", text or "").strip()
+
+
+def cache_key(model_name: str, text: str) -> str:
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(normalize_text(text).encode("utf-8"))
+    return h.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier content-addressed cache of normalized embeddings.
+    Memory tier: LRU dict of the most recently used vectors.
+    Disk tier: SQLite table bounded to `max_items` rows (least recently used rows are evicted).
+    Entries are keyed by hash(model name, normalized text); rows written by a different
+    model are dropped when the cache is opened.
+    """
+
+    def __init__(self, path: str, model_name: str, max_items: int = 100000, mem_items: int = 2048):
+        self.path = path
+        self.model_name = model_name
+        self.max_items = max_items
+        self.mem_items = mem_items
+        self.hits = 0
+        self.mem_hits = 0
+        self.misses = 0
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, "
+            "vec BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings(last_access)")
+        # invalidate everything produced by another embedding model
+        self._conn.execute("DELETE FROM embeddings WHERE model != ?", (model_name,))
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _remember(self, key: str, vec: np.ndarray):
+        # an owned, read-only copy: callers cannot corrupt later hits by editing what they got back
+        vec = np.array(vec, dtype=np.float32, copy=True)
+        vec.setflags(write=False)
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_items:
+            self._mem.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for the subset of `keys` that are present (shared, read-only arrays)."""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            missing = []
+            for k in keys:
+                vec = self._mem.get(k)
+                if vec is not None:
+                    self._mem.move_to_end(k)
+                    found[k] = vec
+                    self.mem_hits += 1
+                else:
+                    missing.append(k)
+
+            now = time.time()
+            for i in range(0, len(missing), 500):  # stay under SQLite's variable limit
+                part = missing[i:i + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vec FROM embeddings WHERE key IN ({marks})", part
+                ).fetchall()
+                for key, dim, blob in rows:
+                    self._remember(key, np.frombuffer(blob, dtype=np.float32, count=dim))
+                    found[key] = self._mem[key]
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                        [(now, r[0]) for r in rows],
+                    )
+            if missing:
+                self._conn.commit()
+
+            self.hits += sum(1 for k in keys if k in found)
+            self.misses += sum(1 for k in keys if k not in found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            rows = []
+            for key, vec in items.items():
+                vec = np.ascontiguousarray(vec, dtype=np.float32)
+                self._remember(key, vec)
+                rows.append((key, self.model_name, int(vec.shape[0]), vec.tobytes(), now))
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, model, dim, vec, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._count += self._conn.total_changes - before
+            if self._count > self.max_items:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # drop down to 90% of the bound so eviction is amortized over many inserts
+        target = int(self.max_items * 0.9)
+        excess = self._count - target
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._count = 0
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.mem_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "disk_items": self._count,
+            "memory_items": len(self._mem),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Process-wide cache for settings.EMBEDDING_MODEL, or None when disabled."""
+    global _cache
+    if not settings.EMBED_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.model_name != settings.EMBEDDING_MODEL:
+            if _cache is not None:
+                _cache.close()
+            _cache = EmbeddingCache(
+                settings.EMBED_CACHE_PATH,
+                settings.EMBEDDING_MODEL,
+                max_items=settings.EMBED_CACHE_MAX_ITEMS,
+                mem_items=settings.EMBED_CACHE_MEM_ITEMS,
+            )
+    return _cache
@@ -2,33 +2,92 @@
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from sentence_transformers import SentenceTransformer
+import threading
 import numpy as np
-from typing import List
+from typing import List, Optional
 from app.config import settings
+from app.embedding_cache import get_embedding_cache, cache_key
+from app.telemetry import get_logger, stage
+
+log = get_logger("embeddings")
 
 _model = None
+_model_lock = threading.Lock()
 
 def get_embedding_model():
+    """
+    SentenceTransformer singleton; sentence_transformers (and torch) load on first call.
+    With INFERENCE_BACKEND=onnx / onnx-int8 it is an ONNX Runtime encoder with the same encode().
+    """
     global _model
     if _model is None:
-        _model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        with _model_lock:
+            if _model is None:
+                with stage("embedding", "load", backend=settings.INFERENCE_BACKEND):
+                    _model = _load_model()
     return _model
 
+def _load_model():
+    from app.onnx_backend import backend_variant, load_sentence_encoder
+
+    variant = backend_variant()
+    if variant is not None:
+        try:
+            return load_sentence_encoder(settings.EMBEDDING_MODEL, variant)
+        except Exception as e:
+            log.warning("ONNX embedding backend unavailable (%s); using torch", e)
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(settings.EMBEDDING_MODEL)
+
+def _cache_model_key() -> str:
+    # int8 vectors differ slightly from fp32 ones, so they get their own cache entries. Keyed on
+    # the encoder that actually loaded: a failed ONNX load falls back to torch (fp32) vectors.
+    if getattr(get_embedding_model(), "variant", None) == "int8":
+        return f"{settings.EMBEDDING_MODEL}@int8"
+    return settings.EMBEDDING_MODEL
+
+def _encode_normalized(texts: List[str], batch_size: Optional[int] = None):
+    model = get_embedding_model()
+    with stage("embedding", texts=len(texts)):
+        emb = model.encode(texts, batch_size=batch_size or settings.EMBED_BATCH_SIZE, convert_to_numpy=True)
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return emb / norms
+
 def embed_text(text: str):
     model = get_embedding_model()
     if not text or text.strip() == "":
         d = model.get_sentence_embedding_dimension()
         return np.zeros(d, dtype=float)
-    vec = model.encode([text], convert_to_numpy=True)[0]
-    norm = np.linalg.norm(vec)
-    if norm == 0:
-        return vec
-    return vec / norm
+    cache = get_embedding_cache()
+    if cache is None:
+        return _encode_normalized([text])[0]
+    key = cache_key(_cache_model_key(), text)
+    hit = cache.get_many([key])
+    if key in hit:
+        return hit[key].copy()  # cached arrays are shared and read-only
+    vec = _encode_normalized([text])[0]
+    cache.put_many({key: vec})
+    return vec
 
-def embed_list(texts: List[str]):
+def embed_list(texts: List[str], batch_size: Optional[int] = None):
     model = get_embedding_model()
-    emb = model.encode(texts, convert_to_numpy=True)
-    norms = np.linalg.norm(emb, axis=1, keepdims=True)
-    norms[norms == 0] = 1.0
-    return emb / norms
+    if not texts:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+    cache = get_embedding_cache()
+    if cache is None:
+        return _encode_normalized(texts, batch_size)
+
+    # only texts missing from the cache go to the model, each distinct text once
+    keys = [cache_key(_cache_model_key(), t) for t in texts]
+    found = cache.get_many(list(dict.fromkeys(keys)))
+    todo = {}
+    for k, t in zip(keys, texts):
+        if k not in found and k not in todo:
+            todo[k] = t
+    if todo:
+        fresh = _encode_normalized(list(todo.values()), batch_size)
+        new = dict(zip(todo.keys(), fresh))
+        cache.put_many(new)
+        found.update(new)
+    return np.stack([found[k] for k in keys]).astype(np.float32, copy=False)
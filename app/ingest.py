@@ -0,0 +1,363 @@
+# app/ingest.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import hashlib
+import itertools
+import json
+import signal
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+from app.config import settings
+
+RESUME_EXTENSIONS = (".txt", ".md", ".pdf")
+
+
+# --- sources ----------------------------------------------------------
+
+def _item(source_id: str, filename: str, data: Optional[bytes] = None, text: Optional[str] = None) -> Dict[str, Any]:
+    payload = data if data is not None else (text or "").encode("utf-8")
+    return {
+        "id": source_id,
+        "filename": filename,
+        "data": data,
+        "text": text,
+        "content_hash": hashlib.sha256(payload).hexdigest(),
+    }
+
+
+def iter_directory(path: str) -> Iterator[Dict[str, Any]]:
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                full = os.path.join(root, name)
+                with open(full, "rb") as f:
+                    yield _item(os.path.relpath(full, path), name, data=f.read())
+
+
+def iter_zip(path: str) -> Iterator[Dict[str, Any]]:
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTENSIONS):
+                yield _item(info.filename, os.path.basename(info.filename), data=zf.read(info))
+
+
+def iter_manifest(path: str) -> Iterator[Dict[str, Any]]:
+    """JSONL lines with either {"path": ...} (relative to the manifest) or {"text": ...}, plus an optional "id"."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if "text" in entry:
+                yield _item(str(entry.get("id", n)), entry.get("filename", ""), text=entry["text"])
+            else:
+                full = os.path.join(base, entry["path"])
+                with open(full, "rb") as rf:
+                    yield _item(str(entry.get("id", entry["path"])), os.path.basename(full), data=rf.read())
+
+
+def iter_source(path: str) -> Iterator[Dict[str, Any]]:
+    if os.path.isdir(path):
+        return iter_directory(path)
+    if path.lower().endswith(".zip"):
+        return iter_zip(path)
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        return iter_manifest(path)
+    raise ValueError(f"unsupported source: {path} (expected a directory, .zip or .jsonl manifest)")
+
+
+# --- extraction (process pool) ----------------------------------------
+
+class _ExtractTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _ExtractTimeout()
+
+
+def _extract_worker(data: bytes, filename: str, timeout: float) -> Dict[str, Any]:
+    """Runs in a pool process; SIGALRM aborts a PDF that takes longer than `timeout`."""
+    from app.parsers import extract_text_from_bytes
+
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return {"ok": True, "text": extract_text_from_bytes(data, filename)}
+    except _ExtractTimeout:
+        return {"ok": False, "error": f"extraction timed out after {timeout}s"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _kill_pool(pool: ProcessPoolExecutor):
+    """Terminate the pool's workers (shutdown alone would wait on one stuck in C code) and discard queued work."""
+    for proc in list((getattr(pool, "_processes", None) or {}).values()):
+        proc.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_parallel(items: Iterable[Dict[str, Any]], workers: int, timeout: float, max_in_flight: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Extract text in a ProcessPoolExecutor, yielding items in input order with "text" or "error" set.
+    At most `max_in_flight` files are read ahead, so memory stays bounded on huge sources.
+    A file that outlives the worker's own timeout gets its pool killed and replaced; the other
+    in-flight files are resubmitted to the new pool.
+    """
+    max_in_flight = max_in_flight or workers * 4
+    pending: deque = deque()  # [item, future or None]
+    pool = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(item):
+        return pool.submit(_extract_worker, item["data"], item["filename"], timeout)
+
+    def replace_pool():
+        nonlocal pool
+        _kill_pool(pool)
+        pool = ProcessPoolExecutor(max_workers=workers)
+        for entry in pending:
+            fut = entry[1]
+            # keep results that finished before the kill; everything else runs again
+            if fut is not None and not (fut.done() and not fut.cancelled() and fut.exception() is None):
+                entry[1] = submit(entry[0])
+
+    def drain_one():
+        item, fut = pending.popleft()
+        if fut is None:
+            return item
+        try:
+            # the worker enforces the timeout itself; this is a backstop for stuck C code
+            res = fut.result(timeout=timeout * 2 if timeout else None)
+        except FutureTimeout:
+            res = {"ok": False, "error": f"extraction timed out after {timeout}s"}
+            replace_pool()
+        except Exception as e:
+            res = {"ok": False, "error": str(e)}
+        item["data"] = None
+        item["text"] = res.get("text")
+        if not res["ok"]:
+            item["error"] = res["error"]
+        return item
+
+    try:
+        for item in items:
+            if item["text"] is not None:
+                pending.append([item, None])  # manifest entries that already carry text
+            else:
+                pending.append([item, submit(item)])
+            while len(pending) >= max_in_flight:
+                yield drain_one()
+        while pending:
+            yield drain_one()
+    finally:
+        if pending:
+            _kill_pool(pool)  # abandoned early: don't wait on in-flight files
+        else:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# --- parsing ------------------------------------------------------------
+
+def parse_items(items: Iterable[Dict[str, Any]], n_process: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Run the parse_resume stages over extracted items; failed extractions pass straight through."""
+    from app.parsers import parse_resume_texts
+
+    ok_items, all_items = itertools.tee(items)
+    ok_texts = (it["text"] for it in ok_items if "error" not in it)
+    parsed = parse_resume_texts(ok_texts, n_process=n_process)
+    for item in all_items:
+        record = {"id": item["id"], "filename": item["filename"], "content_hash": item["content_hash"]}
+        if "error" in item:
+            record.update({"ok": False, "error": item["error"]})
+        else:
+            record.update({"ok": True, **next(parsed)})
+        yield record
+
+
+# --- sinks --------------------------------------------------------------
+
+class JsonlSink:
+    def __init__(self, path: str):
+        self.path = path
+
+    def done_hashes(self) -> Set[str]:
+        done = set()
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by an interrupted run
+                    if rec.get("ok"):
+                        done.add(rec["content_hash"])
+        return done
+
+    def __enter__(self):
+        self._f = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def write(self, record: Dict[str, Any]):
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def __exit__(self, *exc):
+        self._f.close()
+
+
+class ParquetSink:
+    """
+    Writes a directory of Parquet part files (one per run, flushed every `row_group` records).
+    Nested fields are stored as JSON strings. Requires pyarrow.
+    """
+
+    NESTED = ("basic", "sections", "bert_entities", "skills")
+
+    def __init__(self, path: str, row_group: int = 500):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("pyarrow not installed. Run `pip install pyarrow` or use --format jsonl")
+        self.path = path
+        self.row_group = row_group
+
+    def done_hashes(self) -> Set[str]:
+        import pyarrow.parquet as pq
+
+        done = set()
+        if os.path.isdir(self.path):
+            for name in sorted(os.listdir(self.path)):
+                if name.endswith(".parquet"):
+                    table = pq.read_table(os.path.join(self.path, name), columns=["content_hash", "ok"])
+                    for h, ok in zip(table.column("content_hash").to_pylist(), table.column("ok").to_pylist()):
+                        if ok:
+                            done.add(h)
+        return done
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        n = len([x for x in os.listdir(self.path) if x.endswith(".parquet")])
+        self._file = os.path.join(self.path, f"part-{n:05d}.parquet")
+        self._writer = None
+        self._rows = []
+        return self
+
+    def _row(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        row = {
+            "id": record["id"],
+            "filename": record["filename"],
+            "content_hash": record["content_hash"],
+            "ok": record["ok"],
+            "error": record.get("error"),
+            "raw": record.get("raw"),
+        }
+        for key in self.NESTED:
+            row[key] = json.dumps(record[key], ensure_ascii=False) if key in record else None
+        return row
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._rows:
+            return
+        # explicit schema: a row group whose optional columns are all None would otherwise be typed null
+        table = pa.Table.from_pylist(self._rows, schema=self.schema())
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._file, table.schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+    @classmethod
+    def schema(cls):
+        import pyarrow as pa
+
+        fields = [
+            ("id", pa.string()),
+            ("filename", pa.string()),
+            ("content_hash", pa.string()),
+            ("ok", pa.bool_()),
+            ("error", pa.string()),
+            ("raw", pa.string()),
+        ]
+        return pa.schema(fields + [(key, pa.string()) for key in cls.NESTED])
+
+    def write(self, record: Dict[str, Any]):
+        self._rows.append(self._row(record))
+        if len(self._rows) >= self.row_group:
+            self._flush()
+
+    def __exit__(self, *exc):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+# --- driver -------------------------------------------------------------
+
+def ingest(source: str, out: str, fmt: str = "jsonl", workers: Optional[int] = None, timeout: Optional[float] = None,
+           n_process: Optional[int] = None, resume: bool = True) -> Dict[str, Any]:
+    """Stream `source` through extract → parse → sink and return a throughput report."""
+    workers = workers or settings.INGEST_WORKERS or os.cpu_count() or 1
+    timeout = settings.INGEST_TIMEOUT if timeout is None else timeout
+    sink = ParquetSink(out) if fmt == "parquet" else JsonlSink(out)
+    done = sink.done_hashes() if resume else set()
+    stats = {"seen": 0, "skipped": 0, "parsed": 0, "failed": 0}
+
+    def todo():
+        seen_now = set()
+        for item in iter_source(source):
+            stats["seen"] += 1
+            # skip work already in the output, and byte-identical copies within this run
+            if item["content_hash"] in done or item["content_hash"] in seen_now:
+                stats["skipped"] += 1
+                continue
+            seen_now.add(item["content_hash"])
+            yield item
+
+    t0 = time.perf_counter()
+    with sink:
+        for record in parse_items(extract_parallel(todo(), workers, timeout), n_process=n_process):
+            sink.write(record)
+            stats["parsed" if record["ok"] else "failed"] += 1
+    elapsed = time.perf_counter() - t0
+    processed = stats["parsed"] + stats["failed"]
+    stats.update({
+        "seconds": round(elapsed, 3),
+        "docs_per_sec": round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+        "workers": workers,
+    })
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bulk-parse resumes from a directory, .zip or .jsonl manifest.")
+    ap.add_argument("source")
+    ap.add_argument("--out", required=True, help="output .jsonl file, or a directory for --format parquet")
+    ap.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    ap.add_argument("--workers", type=int, default=None, help="text extraction processes (default: all cores)")
+    ap.add_argument("--timeout", type=float, default=None, help="per-file extraction timeout in seconds")
+    ap.add_argument("--n-process", type=int, default=None, help="spaCy processes for the parse stage")
+    ap.add_argument("--no-resume", action="store_true", help="reprocess files already present in the output")
+    args = ap.parse_args(argv)
+
+    report = ingest(args.source, args.out, fmt=args.format, workers=args.workers, timeout=args.timeout,
+                    n_process=args.n_process, resume=not args.no_resume)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,44 +4,240 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import os
 import json
+import threading
+import time
 from app.config import settings
-from transformers import pipeline
+from app.telemetry import get_logger, stage
 
-# Optional: import Gemini
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
+log = get_logger("llm")
 
+# transformers and google-generativeai are imported on first use: either one
+# costs seconds at import time, and most processes only ever need one of them
+_genai = None
 
-def get_local_llm():
-    """Load a local model if configured."""
-    model_name = settings.LLM_MODEL or "google/flan-t5-small"
-    return pipeline("text2text-generation", model=model_name)
+
+def _import_genai():
+    """google.generativeai, or None when it is not installed."""
+    global _genai
+    if _genai is None:
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            return None
+        _genai = genai
+    return _genai
+
+
+_local_llms = {}
+_local_llms_lock = threading.Lock()
+
+
+def _generation_config(**overrides):
+    """Generation kwargs for the local pipeline, defaulting to settings."""
+    config = {"max_new_tokens": settings.LLM_MAX_TOKENS}
+    config.update(overrides)
+    return config
+
+
+def _registry_key(model_name, quantize, config):
+    return (model_name, quantize, tuple(sorted(config.items())))
+
+
+def _quantize_int8(model):
+    """Dynamic int8 quantization of the Linear layers (CPU inference only)."""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_entry(model_name=None, quantize=None, **generation):
+    """
+    Return (registry entry, loaded_now) for a local model, loading it on first use.
+    Entries are shared per process and keyed by model name, quantization + generation config.
+    """
+    model_name = model_name or settings.LLM_MODEL or "google/flan-t5-small"
+    quantize = settings.LLM_QUANTIZE if quantize is None else quantize
+    config = _generation_config(**generation)
+    key = _registry_key(model_name, quantize, config)
+    with _local_llms_lock:
+        entry = _local_llms.get(key)
+        loaded_now = entry is None
+        if loaded_now:
+            t0 = time.perf_counter()
+            with stage("llm_local", "load", model=model_name):
+                if settings.LLM_NUM_THREADS > 0:
+                    import torch
+                    torch.set_num_threads(settings.LLM_NUM_THREADS)
+                from transformers import pipeline
+                pipe = pipeline("text2text-generation", model=model_name)
+                if quantize:
+                    pipe.model = _quantize_int8(pipe.model)
+            entry = {
+                "model": model_name,
+                "quantized": quantize,
+                "pipeline": pipe,
+                "generation": config,
+                "load_time": time.perf_counter() - t0,
+                "calls": 0,
+            }
+            _local_llms[key] = entry
+        entry["last_used"] = time.time()
+    return entry, loaded_now
+
+
+def get_local_llm(model_name=None, **generation):
+    """Load a local model if configured (cached per process)."""
+    entry, _ = _load_entry(model_name, **generation)
+    return entry["pipeline"]
+
+
+def warm_local_llm(model_name=None, quantize=None, **generation):
+    """Load a local model ahead of the first request (e.g. at app startup)."""
+    entry, _ = _load_entry(model_name, quantize, **generation)
+    return {"model": entry["model"], "load_time": entry["load_time"]}
+
+
+def evict_idle_llms(max_idle_seconds=None):
+    """Drop local models that have not been used for `max_idle_seconds` (<= 0 disables)."""
+    if max_idle_seconds is None:
+        max_idle_seconds = settings.LLM_IDLE_EVICT_SECONDS
+    if max_idle_seconds <= 0:
+        return []
+    now = time.time()
+    evicted = []
+    with _local_llms_lock:
+        for key, entry in list(_local_llms.items()):
+            if now - entry["last_used"] >= max_idle_seconds:
+                del _local_llms[key]
+                evicted.append(entry["model"])
+    return evicted
+
+
+def loaded_llms():
+    """Summary of the models currently held in the registry."""
+    with _local_llms_lock:
+        return [
+            {
+                "model": e["model"],
+                "quantized": e["quantized"],
+                "generation": dict(e["generation"]),
+                "load_time": e["load_time"],
+                "idle": time.time() - e["last_used"],
+                "calls": e["calls"],
+            }
+            for e in _local_llms.values()
+        ]
+
+
+def call_local_timed(prompt: str, model_name=None, **generation):
+    """
+    Generate with the local model and report timings.
+    `load_time` is non-zero only on the call that loaded the model.
+    """
+    evict_idle_llms()
+    entry, loaded_now = _load_entry(model_name, **generation)
+    load_time = entry["load_time"] if loaded_now else 0.0
+    t0 = time.perf_counter()
+    with stage("llm_local", model=entry["model"]):
+        res = entry["pipeline"](prompt, **entry["generation"])
+    gen_time = time.perf_counter() - t0
+    entry["calls"] += 1
+    entry["last_used"] = time.time()
+    return res[0]["generated_text"], {"load_time": load_time, "generation_time": gen_time}
 
 
 def call_local(prompt: str):
     """Generate output using local Flan-T5 model."""
-    model = get_local_llm()
-    res = model(prompt, max_new_tokens=200)
-    return res[0]["generated_text"]
+    text, _ = call_local_timed(prompt)
+    return text
 
 
-def call_gemini(prompt: str):
-    """Generate output using Google Gemini API."""
+def generate_local_batch(prompts, batch_size=None, model_name=None, quantize=None, **generation):
+    """
+    Generate for many prompts with the local seq2seq model.
+    Prompts are tokenized once, sorted by length and run in padded batches of
+    `batch_size` under torch.inference_mode, so each batch wastes little padding.
+    Returns the outputs in input order.
+    """
+    import torch
+
+    if not prompts:
+        return []
+    batch_size = batch_size or settings.LLM_BATCH_SIZE
+    entry, _ = _load_entry(model_name, quantize, **generation)
+    model, tokenizer = entry["pipeline"].model, entry["pipeline"].tokenizer
+    max_len = min(getattr(tokenizer, "model_max_length", 512), 4096)
+    encoded = tokenizer(list(prompts), truncation=True, max_length=max_len)["input_ids"]
+    order = sorted(range(len(prompts)), key=lambda i: len(encoded[i]))
+
+    outputs = [None] * len(prompts)
+    t0 = time.perf_counter()
+    with torch.inference_mode(), stage("llm_local", model=entry["model"], prompts=len(prompts)):
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            batch = tokenizer.pad({"input_ids": [encoded[i] for i in bucket]}, return_tensors="pt")
+            generated = model.generate(**batch, **entry["generation"])
+            texts = tokenizer.batch_decode(generated, skip_special_tokens=True)
+            for i, text in zip(bucket, texts):
+                outputs[i] = text
+    entry["calls"] += len(prompts)
+    entry["last_used"] = time.time()
+    entry["last_batch_time"] = time.perf_counter() - t0
+    return outputs
+
+
+_gemini_model = None
+
+
+def get_gemini_model():
+    """Configure the Gemini client once and reuse one GenerativeModel per process."""
+    global _gemini_model
+    genai = _import_genai()
     if not genai:
         raise ImportError("google-generativeai not installed. Run `pip install google-generativeai`")
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-    model = genai.GenerativeModel("models/gemini-2.5-flash")
-    response = model.generate_content(prompt)
-    return response.text.strip()
+    if _gemini_model is None:
+        with stage("llm_gemini", "load"):
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+            _gemini_model = genai.GenerativeModel(settings.GEMINI_MODEL)
+    return _gemini_model
 
 
-def get_score_with_llm(job_title, job_desc, resume_text):
-    """Main scoring function."""
-    resume_trim = resume_text[:15000]   # 15000 chars max
-    job_trim = job_desc[:8000]
-    prompt = f"""
+def call_gemini(prompt: str):
+    """Generate output using Google Gemini API (per-attempt timeout, retries with backoff)."""
+    from app.llm_async import generate_blocking
+
+    with stage("llm_gemini", model=settings.GEMINI_MODEL):
+        return generate_blocking(prompt)
+
+
+# bump whenever the scoring prompt text changes, so cached scores are not reused
+PROMPT_VERSION = "score-v2"
+RESUME_PROMPT_CHARS = 15000
+JOB_PROMPT_CHARS = 8000
+
+
+def score_prompt_version():
+    """
+    PROMPT_VERSION plus the settings that change the prompt or the output in the current mode,
+    so toggling any of them does not serve scores cached under the old ones.
+    """
+    if settings.LLM_MODE.upper() == "GEMINI":
+        return PROMPT_VERSION
+    budget = (f"budget:{settings.LLM_PROMPT_MAX_TOKENS}:{settings.LLM_PROMPT_JOB_SHARE}"
+              if settings.LLM_PROMPT_BUDGET else "chars")
+    return f"{PROMPT_VERSION}|{budget}|int8:{int(settings.LLM_QUANTIZE)}|max_new:{settings.LLM_MAX_TOKENS}"
+
+
+def score_model_name():
+    """Name of the model get_score_with_llm will use in the current mode."""
+    if settings.LLM_MODE.upper() == "GEMINI":
+        return settings.GEMINI_MODEL
+    return settings.LLM_MODEL or "google/flan-t5-small"
+
+
+def build_score_prompt(job_title, job_desc, resume_text):
+    resume_trim = resume_text[:RESUME_PROMPT_CHARS]   # 15000 chars max
+    job_trim = job_desc[:JOB_PROMPT_CHARS]
+    return f"""
     You are an AI resume screener. Compare this resume to the job description.
     Return a JSON object with:
     {{
@@ -54,26 +250,99 @@ def get_score_with_llm(job_title, job_desc, resume_text):
     Resume: {resume_trim}
     """
 
+
+def build_local_prompt(job_title, job_desc, resume_text):
+    """Prompt for the local model: packed into its token budget unless LLM_PROMPT_BUDGET is off."""
+    return local_prompt(job_title, job_desc, resume_text)[0]
+
+
+def local_prompt(job_title, job_desc, resume_text):
+    """build_local_prompt plus which builder produced it: "budget", or "chars" (also the fallback)."""
+    if not settings.LLM_PROMPT_BUDGET:
+        return build_score_prompt(job_title, job_desc, resume_text), "chars"
     try:
-        if settings.LLM_MODE.upper() == "GEMINI":
-            try:
-                output = call_gemini(prompt)
-            except Exception as gem_err:
-                print(f"[WARN] Gemini failed: {gem_err}. Falling back to local LLM.")
-                output = call_local(prompt)
-        else:
-            output = call_local(prompt)
-            
+        from app.prompt_builder import build_budget_prompt
+        prompt, _ = build_budget_prompt(job_title, job_desc[:JOB_PROMPT_CHARS], resume_text[:RESUME_PROMPT_CHARS])
+    except Exception as e:
+        # the budgeted prompt needs spaCy and the tokenizer; scoring must not depend on them
+        log.warning("budget prompt failed: %s. Using the character-trimmed prompt.", e)
+        return build_score_prompt(job_title, job_desc, resume_text), "chars"
+    return prompt, "budget"
+
+
+def score_prompt_kind():
+    """The prompt builder score_prompt_version() describes; results built otherwise are not cached."""
+    if settings.LLM_MODE.upper() != "GEMINI" and settings.LLM_PROMPT_BUDGET:
+        return "budget"
+    return "chars"
 
 
+def parse_score_output(output):
+    """
+    Turn raw model output into the result dict returned by get_score_with_llm.
+    Output without a numeric score is a failed generation (ok False), never a score of 0.
+    """
+    try:
         # Try to extract JSON from model output
         start, end = output.find("{"), output.rfind("}")
         data = json.loads(output[start:end+1]) if start != -1 else {}
-        score = data.get("score") or 0
+        # small local models often answer with the bare number
+        score = data.get("score") if data else output.strip()
+        try:
+            score = float(score)
+        except (TypeError, ValueError):
+            return {"ok": False, "error": "no numeric score in model output", "raw": output}
         justification = data.get("justification") or output
         return {"ok": True, "score": int(score), "justification": justification, "raw": output}
+    except Exception as e:
+        return {"ok": False, "error": str(e), "raw": output or ""}
+
+
+def score_pairs_local(pairs, batch_size=None, quantize=None):
+    """
+    Batch scoring entry point: score many (job_title, job_desc, resume_text) triples
+    with the local model. Results match get_score_with_llm, in input order.
+    """
+    pairs = list(pairs)
+    model = settings.LLM_MODEL or "google/flan-t5-small"
+    try:
+        prompts = [build_local_prompt(*pair) for pair in pairs]
+        outputs = generate_local_batch(prompts, batch_size=batch_size, quantize=quantize)
+    except Exception as e:
+        return [{"ok": False, "error": str(e), "raw": "", "model": model} for _ in pairs]
+    results = []
+    for output in outputs:
+        result = parse_score_output(output)
+        result["model"] = model
+        results.append(result)
+    return results
 
+
+def get_score_with_llm(job_title, job_desc, resume_text):
+    """Main scoring function."""
+
+    timings = {"load_time": 0.0, "generation_time": 0.0}
+    model = score_model_name()
+    kind = "chars"
+    try:
+        if settings.LLM_MODE.upper() == "GEMINI":
+            try:
+                t0 = time.perf_counter()
+                output = call_gemini(build_score_prompt(job_title, job_desc, resume_text))
+                timings["generation_time"] = time.perf_counter() - t0
+            except Exception as gem_err:
+                log.warning("Gemini failed: %s. Falling back to local LLM.", gem_err)
+                model = settings.LLM_MODEL or "google/flan-t5-small"
+                prompt, kind = local_prompt(job_title, job_desc, resume_text)
+                output, timings = call_local_timed(prompt)
+        else:
+            prompt, kind = local_prompt(job_title, job_desc, resume_text)
+            output, timings = call_local_timed(prompt)
     except Exception as e:
-        return {"ok": False, "error": str(e), "raw": ""}
+        return {"ok": False, "error": str(e), "raw": "", "timings": timings, "model": model}
 
-    
+    result = parse_score_output(output)
+    result["timings"] = timings
+    result["model"] = model
+    result["prompt"] = kind
+    return result
@@ -0,0 +1,216 @@
+# app/llm_async.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.llm import build_score_prompt, parse_score_output, get_gemini_model
+
+
+class RetryableError(Exception):
+    """A failure worth retrying (rate limit, overload, timeout, dropped connection)."""
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (RetryableError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    # google.api_core errors carry an HTTP-ish status code
+    code = getattr(exc, "code", None)
+    code = getattr(code, "value", code)
+    return code in (429, 500, 502, 503, 504)
+
+
+class AsyncGeminiClient:
+    """
+    Shared asyncio client for Gemini scoring.
+    - at most `concurrency` requests in flight (semaphore)
+    - at most `rate` request starts per second (token bucket)
+    - per-attempt `timeout`, exponential backoff with full jitter up to `max_retries`
+    - identical prompts already in flight are coalesced into one request
+    With `base_url` set, requests go to that REST endpoint (e.g. benchmarks/gemini_stub.py)
+    instead of the google-generativeai SDK.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, rate: Optional[float] = None,
+                 timeout: Optional[float] = None, max_retries: Optional[int] = None,
+                 base_url: Optional[str] = None, backoff_base: float = 0.5, backoff_cap: float = 20.0):
+        self.concurrency = concurrency or settings.GEMINI_CONCURRENCY
+        self.timeout = timeout or settings.GEMINI_TIMEOUT
+        self.max_retries = settings.GEMINI_MAX_RETRIES if max_retries is None else max_retries
+        self.base_url = (settings.GEMINI_BASE_URL if base_url is None else base_url).rstrip("/")
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._rate = settings.GEMINI_RATE_PER_SEC if rate is None else rate
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._bucket: Optional[TokenBucket] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"requests": 0, "retries": 0, "coalesced": 0, "failures": 0}
+
+    def _ensure_loop_state(self):
+        # created lazily so they bind to the running event loop
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+            self._bucket = TokenBucket(self._rate)
+
+    def _rest_call(self, prompt: str) -> str:
+        url = f"{self.base_url}/v1beta/{settings.GEMINI_MODEL}:generateContent?key={settings.GEMINI_API_KEY}"
+        body = json.dumps({"contents": [{"parts": [{"text": prompt}]}]}).encode("utf-8")
+        req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                payload = json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code in (429, 500, 502, 503, 504):
+                raise RetryableError(f"HTTP {e.code}")
+            raise
+        except (urllib.error.URLError, TimeoutError) as e:
+            raise RetryableError(str(e))
+        parts = payload["candidates"][0]["content"]["parts"]
+        return "".join(p.get("text", "") for p in parts).strip()
+
+    async def _attempt(self, prompt: str) -> str:
+        if self.base_url:
+            if self._executor is None:
+                # one thread per allowed in-flight request; the default executor is far smaller
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._rest_call, prompt)
+        response = await get_gemini_model().generate_content_async(prompt)
+        return response.text.strip()
+
+    async def _generate(self, prompt: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            try:
+                async with self._sem:
+                    self.stats["requests"] += 1
+                    return await asyncio.wait_for(self._attempt(prompt), timeout=self.timeout)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["retries"] += 1
+                delay = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+                await asyncio.sleep(random.uniform(0, delay))
+
+    async def generate(self, prompt: str) -> str:
+        self._ensure_loop_state()
+        fut = self._inflight.get(prompt)
+        if fut is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(fut)
+        fut = asyncio.ensure_future(self._generate(prompt))
+        self._inflight[prompt] = fut
+        try:
+            return await asyncio.shield(fut)
+        finally:
+            if fut.done():
+                self._inflight.pop(prompt, None)
+            else:
+                fut.add_done_callback(lambda _: self._inflight.pop(prompt, None))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_blocking_client: Optional[AsyncGeminiClient] = None
+_blocking_loop: Optional[asyncio.AbstractEventLoop] = None
+_blocking_lock = threading.Lock()
+
+
+def _get_blocking_loop() -> asyncio.AbstractEventLoop:
+    global _blocking_loop
+    if _blocking_loop is None:
+        with _blocking_lock:
+            if _blocking_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="gemini-loop", daemon=True).start()
+                _blocking_loop = loop
+    return _blocking_loop
+
+
+def get_blocking_client() -> AsyncGeminiClient:
+    """The client behind generate_blocking, shared by every synchronous caller in the process."""
+    global _blocking_client
+    if _blocking_client is None:
+        with _blocking_lock:
+            if _blocking_client is None:
+                _blocking_client = AsyncGeminiClient()
+    return _blocking_client
+
+
+def generate_blocking(prompt: str, client: Optional[AsyncGeminiClient] = None) -> str:
+    """
+    Synchronous Gemini call with the async client's timeout, retries, rate limit and coalescing.
+    Runs on one background event loop, so threads calling this share the same limits.
+    """
+    fut = asyncio.run_coroutine_threadsafe((client or get_blocking_client()).generate(prompt), _get_blocking_loop())
+    return fut.result()
+
+
+async def score_resumes_async(job_title: str, job_desc: str, resumes: List[str],
+                              client: Optional[AsyncGeminiClient] = None) -> List[Dict[str, Any]]:
+    """Score many resumes against one job concurrently; results keep the input order."""
+    own_client = client is None
+    client = client or AsyncGeminiClient()
+
+    async def one(resume_text: str) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        try:
+            output = await client.generate(build_score_prompt(job_title, job_desc, resume_text))
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}", "raw": "",
+                    "timings": {"load_time": 0.0, "generation_time": time.perf_counter() - t0}}
+        result = parse_score_output(output)
+        result["timings"] = {"load_time": 0.0, "generation_time": time.perf_counter() - t0}
+        return result
+
+    try:
+        return await asyncio.gather(*(one(r) for r in resumes))
+    finally:
+        if own_client:
+            client.close()
+
+
+def score_resumes(job_title: str, job_desc: str, resumes: List[str], **client_kwargs) -> List[Dict[str, Any]]:
+    """Blocking wrapper around score_resumes_async for scripts and batch jobs."""
+    client = AsyncGeminiClient(**client_kwargs)
+    try:
+        return asyncio.run(score_resumes_async(job_title, job_desc, resumes, client))
+    finally:
+        client.close()
@@ -4,8 +4,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import streamlit as st
 from app.parsers import parse_resume_text_from_bytes
-from app.embeddings import get_embedding_model
 from app.scoring import score_with_llm, score_with_cosine
+from app.warmup import default_targets, start_background_warmup
 from app.config import settings
 
 st.set_page_config(page_title="Single Resume Screener (modular)", layout="wide")
@@ -24,6 +24,7 @@ with col1:
     uploaded = st.file_uploader("Upload resume (txt or pdf)", type=["txt", "pdf"])
     job_title = st.text_input("Job title", value="")
     job_desc = st.text_area("Job description", height=200)
+    rescore = st.checkbox("Re-score (ignore cached LLM result)", value=False)
     process = st.button("Process / Score")
 
 with col2:
@@ -33,7 +34,13 @@ with col2:
     justification_box = st.empty()
     raw_llm_box = st.empty()
 
-_ = get_embedding_model()
+@st.cache_resource(show_spinner=False)
+def warm_models():
+    """Start loading the model singletons once per server process, not on every rerun."""
+    targets = [t for t in default_targets() if t != "llm" or settings.LLM_WARMUP]
+    return start_background_warmup(targets)
+
+warmup_thread = warm_models()
 
 if process:
     if not uploaded:
@@ -41,6 +48,9 @@ if process:
     elif not job_desc.strip():
         st.error("Please paste a job description.")
     else:
+        if warmup_thread.is_alive():
+            with st.spinner("Loading models..."):
+                warmup_thread.join()
         data = uploaded.read()
         parsed_resume = parse_resume_text_from_bytes(data, uploaded.name)
         text = parsed_resume.get("raw")
@@ -56,11 +66,16 @@ if process:
             skills_box.table(extracted_skills)
 
             with st.spinner("Calling LLM for scoring (can be slow on CPU)..."):
-                llm_res = score_with_llm(job_title, job_desc, text)
+                llm_res = score_with_llm(job_title, job_desc, text, use_cache=not rescore)
             if llm_res.get("ok"):
                 score_box.subheader(f"Match score (LLM): {llm_res['score']} / 10")
                 justification_box.subheader("Justification (LLM)")
                 justification_box.write(llm_res.get("justification", ""))
+                timings = llm_res.get("timings") or {}
+                if llm_res.get("cached"):
+                    st.caption("Served from the score cache.")
+                elif timings:
+                    st.caption(f"LLM load: {timings.get('load_time', 0.0):.2f}s, generation: {timings.get('generation_time', 0.0):.2f}s")
                 raw_llm_box.subheader("Raw LLM output (debug)")
                 raw_llm_box.code(llm_res.get("raw", "")[:2000])
             else:
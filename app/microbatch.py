@@ -0,0 +1,113 @@
+# app/microbatch.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent single-item requests into one batched call.
+    The first queued item opens a batch; it is dispatched when `max_batch_size`
+    items are waiting or `max_wait_ms` has passed, whichever comes first.
+    `fn` takes a list of items and returns one result per item; it runs on a
+    dedicated thread, so the model sees one batched forward pass at a time.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], Sequence[Any]], max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, name: str = "batch"):
+        self.fn = fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"microbatch-{name}")
+        self.stats = {"batches": 0, "items": 0, "max_batch": 0}
+
+    def _ensure_started(self):
+        # created lazily so they bind to the running event loop
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            # a restarted worker keeps the queue, so items submitted before it died still run
+            # start from an empty context so the worker is not tied to the first caller's trace
+            self._worker = contextvars.Context().run(asyncio.ensure_future, self._run())
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_started()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, fut))
+        return await fut
+
+    async def _collect(self) -> List[tuple]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        try:
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # already taken off the queue: put back for the next worker
+            for entry in batch:
+                self._queue.put_nowait(entry)
+            raise
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.fn, items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"{self.name}: {len(results)} results for {len(items)} items")
+            except BaseException as e:
+                # includes cancellation: callers of this batch must not be left waiting
+                error = e if isinstance(e, Exception) else RuntimeError(f"{self.name} batcher stopped")
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(error)
+                if not isinstance(e, Exception):
+                    raise
+                continue
+            self.stats["batches"] += 1
+            self.stats["items"] += len(items)
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(items))
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
+    def snapshot(self) -> Dict[str, Any]:
+        s = dict(self.stats)
+        s["mean_batch"] = (s["items"] / s["batches"]) if s["batches"] else 0.0
+        return s
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # nothing will serve what is still queued
+        while self._queue is not None and not self._queue.empty():
+            _, fut = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError(f"{self.name} batcher closed"))
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,346 @@
+# app/onnx_backend.py
+"""
+ONNX Runtime backend for the sentence embedding and BERT NER models (INFERENCE_BACKEND=onnx
+or onnx-int8). Models are exported once into ONNX_DIR and then run through onnxruntime with
+full graph optimizations; the int8 variant is a dynamic (weight-only) quantization of the
+fp32 graph. Export and check parity against eager torch:
+
+    python -m app.onnx_backend export
+    python -m app.onnx_backend parity --variant int8
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import inspect
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from app.config import settings
+from app.telemetry import get_logger
+
+log = get_logger("onnx")
+
+VARIANTS = {"fp32": "model.onnx", "int8": "model.int8.onnx"}
+
+
+def _import_ort():
+    try:
+        import onnxruntime
+    except ImportError:
+        raise ImportError("onnxruntime not installed. Run `pip install onnxruntime onnx` or set INFERENCE_BACKEND=torch")
+    return onnxruntime
+
+
+def backend_variant(backend: Optional[str] = None) -> Optional[str]:
+    """'fp32' / 'int8' for the ONNX backends, None for eager torch."""
+    backend = (backend or settings.INFERENCE_BACKEND).lower()
+    if backend == "torch":
+        return None
+    if backend == "onnx":
+        return "fp32"
+    if backend == "onnx-int8":
+        return "int8"
+    raise ValueError(f"unknown INFERENCE_BACKEND {backend!r} (torch | onnx | onnx-int8)")
+
+
+def export_dir(model_name: str, root: Optional[str] = None) -> str:
+    return os.path.join(root or settings.ONNX_DIR, model_name.strip("/").replace("/", "__"))
+
+
+# --- export -------------------------------------------------------------
+
+def _torch_export(module, inputs: Dict[str, Any], path: str, output_name: str, opset: int):
+    import torch
+
+    names = list(inputs)
+    axes = {n: {0: "batch", 1: "sequence"} for n in names}
+    axes[output_name] = {0: "batch"} if output_name == "sentence_embedding" else {0: "batch", 1: "sequence"}
+    kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        kwargs["dynamo"] = False  # the TorchScript exporter handles dynamic axes without onnxscript
+    with torch.no_grad():
+        torch.onnx.export(module, tuple(inputs[n] for n in names), path, input_names=names,
+                          output_names=[output_name], dynamic_axes=axes, opset_version=opset,
+                          do_constant_folding=True, **kwargs)
+
+
+def quantize_int8(src: str, dst: str):
+    """Dynamic int8 quantization: weights stored as int8, activations quantized on the fly."""
+    _import_ort()
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+
+
+def export_embedding_model(model_name: Optional[str] = None, root: Optional[str] = None,
+                           opset: int = 14, int8: bool = True) -> str:
+    """
+    Export a SentenceTransformer (transformer + pooling) as one graph with a
+    `sentence_embedding` output, so the ONNX path pools exactly like model.encode.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model_name = model_name or settings.EMBEDDING_MODEL
+    out = export_dir(model_name, root)
+    os.makedirs(out, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer, pooling = st[0], st[1]
+    if pooling.pooling_mode_mean_tokens:
+        mode = "mean"
+    elif pooling.pooling_mode_cls_token:
+        mode = "cls"
+    else:
+        raise ValueError(f"{model_name}: only mean or CLS pooling can be exported")
+
+    class Pooled(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids=None):
+            hidden = self.model(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids)[0]
+            if mode == "cls":
+                return hidden[:, 0]
+            mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+            return (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+
+    tokenizer = transformer.tokenizer
+    sample = tokenizer(["a short example", "and a slightly longer example sentence"], padding=True, return_tensors="pt")
+    inputs = {n: sample[n] for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample}
+    module = Pooled(transformer.auto_model.eval())
+    _torch_export(module, inputs, os.path.join(out, VARIANTS["fp32"]), "sentence_embedding", opset)
+    tokenizer.save_pretrained(out)
+    with open(os.path.join(out, "export.json"), "w", encoding="utf-8") as f:
+        json.dump({"kind": "embedding", "model": model_name, "pooling": mode,
+                   "max_seq_length": st.max_seq_length, "dim": st.get_sentence_embedding_dimension()}, f, indent=2)
+    if int8:
+        quantize_int8(os.path.join(out, VARIANTS["fp32"]), os.path.join(out, VARIANTS["int8"]))
+    log.info("exported %s to %s", model_name, out)
+    return out
+
+
+def export_token_classifier(model_name: Optional[str] = None, root: Optional[str] = None,
+                            opset: int = 14, int8: bool = True) -> str:
+    """Export a token-classification model (`logits` output); config and tokenizer are saved alongside."""
+    import torch
+    from transformers import AutoModelForTokenClassification, AutoTokenizer
+
+    model_name = model_name or settings.BERT_NER_MODEL
+    out = export_dir(model_name, root)
+    os.makedirs(out, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForTokenClassification.from_pretrained(model_name).eval()
+    sample = tokenizer(["Jane Doe works at Acme", "in Berlin"], padding=True, return_tensors="pt")
+    inputs = {n: sample[n] for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample}
+
+    class Logits(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, *args):
+            return self.inner(**dict(zip(inputs, args))).logits
+
+    _torch_export(Logits(model), inputs, os.path.join(out, VARIANTS["fp32"]), "logits", opset)
+    tokenizer.save_pretrained(out)
+    model.config.save_pretrained(out)
+    with open(os.path.join(out, "export.json"), "w", encoding="utf-8") as f:
+        json.dump({"kind": "token-classification", "model": model_name}, f, indent=2)
+    if int8:
+        quantize_int8(os.path.join(out, VARIANTS["fp32"]), os.path.join(out, VARIANTS["int8"]))
+    log.info("exported %s to %s", model_name, out)
+    return out
+
+
+# --- inference ----------------------------------------------------------
+
+def make_session(path: str):
+    ort = _import_ort()
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if settings.ONNX_INTRA_OP_THREADS > 0:
+        opts.intra_op_num_threads = settings.ONNX_INTRA_OP_THREADS
+    if settings.ONNX_INTER_OP_THREADS > 0:
+        opts.inter_op_num_threads = settings.ONNX_INTER_OP_THREADS
+    return ort.InferenceSession(path, sess_options=opts, providers=["CPUExecutionProvider"])
+
+
+def _model_path(model_name: str, variant: str, export_fn) -> str:
+    """Path of the requested variant, exporting the model first if it is not there yet."""
+    path = os.path.join(export_dir(model_name), VARIANTS[variant])
+    fp32 = os.path.join(export_dir(model_name), VARIANTS["fp32"])
+    if not os.path.exists(path) and os.path.exists(fp32):
+        quantize_int8(fp32, path)
+    elif not os.path.exists(path):
+        log.info("no ONNX export of %s in %s; exporting now", model_name, settings.ONNX_DIR)
+        export_fn(model_name, int8=variant == "int8")
+    return path
+
+
+class OnnxSentenceEncoder:
+    """The subset of the SentenceTransformer API the app uses (encode, get_sentence_embedding_dimension)."""
+
+    def __init__(self, model_dir: str, variant: str = "fp32"):
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, "export.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.variant = variant
+        self.session = make_session(os.path.join(model_dir, VARIANTS[variant]))
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.max_seq_length = self.meta["max_seq_length"]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.meta["dim"]
+
+    def encode(self, sentences: List[str], batch_size: int = 32, convert_to_numpy: bool = True, **_) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = np.zeros((len(texts), self.meta["dim"]), dtype=np.float32)
+        # like SentenceTransformer.encode: batch by length so padding stays small
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        for i in range(0, len(texts), batch_size):
+            idx = order[i:i + batch_size]
+            enc = self.tokenizer([texts[j] for j in idx], padding=True, truncation=True,
+                                 max_length=self.max_seq_length, return_tensors="np")
+            feeds = {n: enc[n].astype(np.int64) for n in self.input_names}
+            out[idx] = self.session.run(["sentence_embedding"], feeds)[0]
+        return out[0] if single else out
+
+
+class _OrtTokenClassifier:
+    """Stands in for the torch model inside a transformers token-classification pipeline."""
+
+    def __init__(self, model_dir: str, variant: str):
+        from transformers import AutoConfig
+
+        self.config = AutoConfig.from_pretrained(model_dir)
+        self.session = make_session(os.path.join(model_dir, VARIANTS[variant]))
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def can_generate(self) -> bool:
+        return False
+
+    def __call__(self, **inputs):
+        import torch
+
+        feeds = {n: inputs[n].cpu().numpy().astype(np.int64) for n in self.input_names}
+        return {"logits": torch.from_numpy(self.session.run(["logits"], feeds)[0])}
+
+
+def load_sentence_encoder(model_name: Optional[str] = None, variant: str = "fp32") -> OnnxSentenceEncoder:
+    model_name = model_name or settings.EMBEDDING_MODEL
+    _model_path(model_name, variant, export_embedding_model)
+    return OnnxSentenceEncoder(export_dir(model_name), variant)
+
+
+def load_token_classifier(model_name: Optional[str] = None, variant: str = "fp32"):
+    """A token-classification pipeline (aggregation_strategy="simple") whose forward pass runs in onnxruntime."""
+    from transformers import AutoTokenizer, TokenClassificationPipeline
+
+    model_name = model_name or settings.BERT_NER_MODEL
+    _model_path(model_name, variant, export_token_classifier)
+    model_dir = export_dir(model_name)
+
+    class OnnxTokenClassificationPipeline(TokenClassificationPipeline):
+        def check_model_type(self, supported_models):
+            pass  # the ORT stand-in is not a registered transformers class
+
+    return OnnxTokenClassificationPipeline(model=_OrtTokenClassifier(model_dir, variant),
+                                           tokenizer=AutoTokenizer.from_pretrained(model_dir),
+                                           framework="pt", aggregation_strategy="simple", device=-1)
+
+
+# --- parity -------------------------------------------------------------
+
+PARITY_TEXTS = [
+    "Senior Python developer with 6 years of experience building REST APIs in Django and FastAPI.",
+    "Jane Doe led the data platform team at Acme Corp in Berlin, migrating ETL jobs to Spark.",
+    "Skills: Kubernetes, Docker, AWS, PostgreSQL, machine learning, NLP.",
+    "BSc Computer Science, University of Toronto, 2016. Worked at Google and Shopify.",
+    "short",
+]
+
+
+def _cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+    b = b / np.maximum(np.linalg.norm(b, axis=1, keepdims=True), 1e-12)
+    return np.sum(a * b, axis=1)
+
+
+def parity(variant: str = "fp32", texts: Optional[List[str]] = None, tolerance: Optional[float] = None,
+           embedding_model: Optional[str] = None, ner_model: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compare the ONNX variant with eager torch on `texts`. Embeddings are compared as
+    normalized vectors, NER as softmax probabilities per token; each check passes when the
+    max absolute difference is within `tolerance` (ONNX_PARITY_TOLERANCE / ONNX_INT8_TOLERANCE).
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from transformers import AutoModelForTokenClassification, AutoTokenizer
+
+    texts = texts or PARITY_TEXTS
+    if tolerance is None:
+        tolerance = settings.ONNX_INT8_TOLERANCE if variant == "int8" else settings.ONNX_PARITY_TOLERANCE
+    embedding_model = embedding_model or settings.EMBEDDING_MODEL
+    ner_model = ner_model or settings.BERT_NER_MODEL
+    report: Dict[str, Any] = {"variant": variant, "tolerance": tolerance}
+
+    ref = SentenceTransformer(embedding_model, device="cpu").encode(texts, convert_to_numpy=True)
+    got = load_sentence_encoder(embedding_model, variant).encode(texts)
+    ref_n = ref / np.linalg.norm(ref, axis=1, keepdims=True)
+    got_n = got / np.linalg.norm(got, axis=1, keepdims=True)
+    diff = float(np.abs(ref_n - got_n).max())
+    report["embedding"] = {"max_abs_diff": diff, "min_cosine": float(_cosine_rows(ref, got).min()),
+                           "ok": diff <= tolerance}
+
+    tokenizer = AutoTokenizer.from_pretrained(ner_model)
+    model = AutoModelForTokenClassification.from_pretrained(ner_model).eval()
+    enc = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+    with torch.no_grad():
+        ref_logits = model(**enc).logits.numpy()
+    _model_path(ner_model, variant, export_token_classifier)
+    got_logits = _OrtTokenClassifier(export_dir(ner_model), variant)(**enc)["logits"].numpy()
+    mask = enc["attention_mask"].numpy().astype(bool)
+
+    def softmax(x):
+        e = np.exp(x - x.max(-1, keepdims=True))
+        return e / e.sum(-1, keepdims=True)
+
+    diff = float(np.abs(softmax(ref_logits) - softmax(got_logits))[mask].max())
+    agree = float((ref_logits.argmax(-1) == got_logits.argmax(-1))[mask].mean())
+    report["ner"] = {"max_abs_diff": diff, "label_agreement": agree, "ok": diff <= tolerance}
+    report["ok"] = report["embedding"]["ok"] and report["ner"]["ok"]
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export the embedding/NER models to ONNX and check parity with torch.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    exp = sub.add_parser("export", help="export fp32 (+ int8) graphs into ONNX_DIR")
+    exp.add_argument("--embedding-model", default=settings.EMBEDDING_MODEL)
+    exp.add_argument("--ner-model", default=settings.BERT_NER_MODEL)
+    exp.add_argument("--no-int8", action="store_true")
+    exp.add_argument("--opset", type=int, default=14)
+    par = sub.add_parser("parity", help="compare ONNX outputs with eager torch; exit 1 beyond the tolerance")
+    par.add_argument("--variant", choices=sorted(VARIANTS), default="fp32")
+    par.add_argument("--tolerance", type=float)
+    par.add_argument("--embedding-model", default=settings.EMBEDDING_MODEL)
+    par.add_argument("--ner-model", default=settings.BERT_NER_MODEL)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "export":
+        for fn, name in ((export_embedding_model, args.embedding_model), (export_token_classifier, args.ner_model)):
+            print(fn(name, opset=args.opset, int8=not args.no_int8))
+        return
+    report = parity(args.variant, tolerance=args.tolerance, embedding_model=args.embedding_model, ner_model=args.ner_model)
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,39 +2,220 @@
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import importlib.util
 import re
-from io import BytesIO
-from typing import Dict, Any, List
-from pdfminer.high_level import extract_text as extract_pdf_text
-import spacy
-from spacy.matcher import PhraseMatcher
-from transformers import pipeline
+import threading
+from io import BytesIO, StringIO
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from app.config import settings
+from app.telemetry import get_logger, stage, timed
 from . import skills as skills_module
 
+# spaCy, pdfminer and transformers are imported on first use, so importing this
+# module (and everything that imports it) stays cheap
+if TYPE_CHECKING:
+    from spacy.matcher import PhraseMatcher
+
 EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
 PHONE_RE = re.compile(r"(\+?\d{1,3}[\s\-]?)?(\(?\d{2,4}\)?[\s\-]?)?\d{3,4}[\s\-]?\d{3,4}")
 
 _nlp = None
 _token_classifier = None
+_token_classifier_failed = False  # a failed load is not retried on every resume
+_ner_lock = threading.Lock()
+_skill_matcher = None
+_load_lock = threading.Lock()
+_matcher_lock = threading.Lock()
+log = get_logger("parsers")
 
 def get_spacy():
     global _nlp
     if _nlp is None:
-        _nlp = spacy.load(settings.SPACY_MODEL)
+        with _load_lock:
+            if _nlp is None:
+                with stage("spacy", "load"):
+                    import spacy
+                    _nlp = spacy.load(settings.SPACY_MODEL)
     return _nlp
 
-def get_token_classifier():
-    global _token_classifier
-    if _token_classifier is None:
+# spaCy NER only looks at the head of the resume, where names/orgs/contacts live
+NER_SNIPPET_CHARS = 15000
+# components NER depends on; tagger/parser/lemmatizer are never used
+_NER_COMPONENTS = ("tok2vec", "ner")
+
+def _disabled_for_ner(nlp) -> List[str]:
+    return [name for name in nlp.pipe_names if name not in _NER_COMPONENTS]
+
+class ResumeDoc:
+    """
+    One resume's text plus its spaCy analyses, computed once and shared by the extractors.
+    `doc` is an NER-only Doc over the first NER_SNIPPET_CHARS characters;
+    `tokens` is a tokenizer-only Doc over the full text (the same Doc when the text is short).
+    """
+
+    def __init__(self, text: str, doc=None):
+        self.text = text or ""
+        self._doc = doc
+        self._tokens = None
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            nlp = get_spacy()
+            self._doc = nlp(self.text[:NER_SNIPPET_CHARS], disable=_disabled_for_ner(nlp))
+        return self._doc
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            if len(self.text) <= NER_SNIPPET_CHARS:
+                self._tokens = self.doc
+            else:
+                self._tokens = get_spacy().make_doc(self.text)
+        return self._tokens
+
+def iter_resume_docs(texts: Iterable[str], n_process: Optional[int] = None, batch_size: Optional[int] = None) -> Iterator[ResumeDoc]:
+    """Bulk ResumeDoc construction: NER runs through nlp.pipe, optionally across processes."""
+    nlp = get_spacy()
+    pairs = ((text[:NER_SNIPPET_CHARS], text) for text in ((t or "") for t in texts))
+    docs = nlp.pipe(
+        pairs,
+        as_tuples=True,
+        disable=_disabled_for_ner(nlp),
+        n_process=n_process or settings.SPACY_N_PROCESS,
+        batch_size=batch_size or settings.SPACY_BATCH_SIZE,
+    )
+    for doc, text in docs:
+        yield ResumeDoc(text, doc)
+
+def _load_token_classifier():
+    from app.onnx_backend import backend_variant, load_token_classifier
+
+    variant = backend_variant()
+    if variant is not None:
         try:
-            _token_classifier = pipeline("token-classification", model=settings.BERT_NER_MODEL, aggregation_strategy="simple", device=-1)
+            return load_token_classifier(settings.BERT_NER_MODEL, variant)
         except Exception as e:
-            print(f"[parsers] Warning: could not load token-classifier '{settings.BERT_NER_MODEL}': {e}")
-            _token_classifier = None
+            log.warning("ONNX NER backend unavailable (%s); using torch", e)
+    from transformers import pipeline
+    return pipeline("token-classification", model=settings.BERT_NER_MODEL, aggregation_strategy="simple", device=-1)
+
+def get_token_classifier():
+    """BERT NER pipeline singleton, or None when it could not be loaded (logged once)."""
+    global _token_classifier, _token_classifier_failed
+    if _token_classifier is None and not _token_classifier_failed:
+        with _ner_lock:
+            if _token_classifier is None and not _token_classifier_failed:
+                try:
+                    with stage("bert_ner", "load", backend=settings.INFERENCE_BACKEND):
+                        _token_classifier = _load_token_classifier()
+                except Exception as e:
+                    log.warning("could not load token-classifier '%s': %s", settings.BERT_NER_MODEL, e)
+                    _token_classifier_failed = True
     return _token_classifier
 
-def extract_text_from_bytes(data: bytes, filename: str = "") -> str:
+def _pdfminer_pages(data: bytes) -> Iterator[str]:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    rsrcmgr = PDFResourceManager()
+    out = StringIO()
+    # Resumes are single-column, so skip pdfminer's multi-column reading-order analysis
+    # (boxes_flow=None), which is also its most expensive layout step.
+    laparams = LAParams(boxes_flow=None, detect_vertical=False)
+    device = TextConverter(rsrcmgr, out, laparams=laparams)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    try:
+        with BytesIO(data) as f:
+            for page in PDFPage.get_pages(f, caching=True):
+                interpreter.process_page(page)
+                yield out.getvalue()
+                out.seek(0)
+                out.truncate(0)
+    finally:
+        device.close()
+
+def _pypdfium2_pages(data: bytes) -> Iterator[str]:
+    import pypdfium2 as pdfium
+    pdf = pdfium.PdfDocument(data)
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range().replace("\r\n", "\n") + "\f"
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+def _pymupdf_pages(data: bytes) -> Iterator[str]:
+    try:
+        import pymupdf
+    except ImportError:  # PyMuPDF < 1.24 only ships the `fitz` name
+        import fitz as pymupdf
+    with pymupdf.open(stream=data, filetype="pdf") as pdf:
+        for page in pdf:
+            yield page.get_text() + "\f"
+
+PDF_BACKENDS = {
+    "pymupdf": (("pymupdf", "fitz"), _pymupdf_pages),
+    "pypdfium2": (("pypdfium2",), _pypdfium2_pages),
+    "pdfminer": (("pdfminer",), _pdfminer_pages),
+}
+
+def available_pdf_backends() -> List[str]:
+    names = []
+    for name, (modules, _) in PDF_BACKENDS.items():
+        # find_spec checks installation without paying for the import
+        if any(importlib.util.find_spec(module) is not None for module in modules):
+            names.append(name)
+    return names
+
+def pdf_backend(backend: Optional[str] = None) -> str:
+    """Resolve a PDF_BACKEND name ("auto" picks the fastest installed one)."""
+    backend = (backend or settings.PDF_BACKEND).lower()
+    if backend == "auto":
+        return (available_pdf_backends() or ["pdfminer"])[0]
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"unknown PDF_BACKEND {backend!r} (auto | {' | '.join(PDF_BACKENDS)})")
+    return backend
+
+def iter_pdf_pages(data: bytes, backend: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the text of a PDF one page at a time. `backend` is "auto" (fastest installed),
+    "pymupdf", "pypdfium2" or "pdfminer"; failures fall back to pdfminer.
+    """
+    backend = pdf_backend(backend)
+    pages = PDF_BACKENDS[backend][1]
+    if backend == "pdfminer":
+        yield from pages(data)
+        return
+    done = 0
+    try:
+        for text in pages(data):
+            done += 1
+            yield text
+    except Exception as e:
+        log.warning("%s failed on page %d: %s; falling back to pdfminer", backend, done + 1, e)
+        yield from islice(_pdfminer_pages(data), done, None)
+
+def extract_pdf_text_budget(data: bytes, max_chars: Optional[int] = None, backend: Optional[str] = None) -> str:
+    """Concatenate pages until `max_chars` characters have been read (None/0 reads everything)."""
+    parts, total = [], 0
+    for text in iter_pdf_pages(data, backend):
+        parts.append(text)
+        total += len(text)
+        if max_chars and total >= max_chars:
+            break
+    return "".join(parts)
+
+@timed("extract_text")
+def extract_text_from_bytes(data: bytes, filename: str = "", max_chars: Optional[int] = None) -> str:
     name = (filename or "").lower()
     if name.endswith(".txt") or name.endswith(".md"):
         try:
@@ -42,21 +223,23 @@ def extract_text_from_bytes(data: bytes, filename: str = "") -> str:
         except Exception:
             return str(data)
     if name.endswith(".pdf"):
+        # a misconfigured backend must fail loudly, not turn every PDF into ""
+        backend = pdf_backend()
         try:
-            with BytesIO(data) as f:
-                text = extract_pdf_text(f)
-                return text or ""
-        except Exception:
+            # later stages only look at the first ~20k chars, so stop parsing pages there
+            budget = settings.PDF_MAX_CHARS if max_chars is None else max_chars
+            return extract_pdf_text_budget(data, budget, backend) or ""
+        except Exception as e:
+            log.warning("could not extract text from %s: %s", filename, e)
             return ""
     try:
         return data.decode("utf-8", errors="ignore")
     except Exception:
         return ""
 
-def extract_basic_fields(text: str) -> Dict[str, Any]:
-    nlp = get_spacy()
-    snippet = text[:15000]
-    doc = nlp(snippet)
+def extract_basic_fields(text: str, rdoc: Optional[ResumeDoc] = None) -> Dict[str, Any]:
+    rdoc = rdoc or ResumeDoc(text)
+    doc = rdoc.doc
     names = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
     orgs = [ent.text for ent in doc.ents if ent.label_ in ("ORG",)]
     email = EMAIL_RE.search(text)
@@ -71,29 +254,75 @@ def extract_basic_fields(text: str) -> Dict[str, Any]:
 # alias expected by main.py
 parse_basic_fields = extract_basic_fields
 
-def extract_entities_with_bert(text: str, max_chunk: int = 2000) -> List[Dict[str, Any]]:
-    classifier = get_token_classifier()
-    if classifier is None:
+def _is_sentence_break(text: str, offsets, i: int) -> bool:
+    """True if a sentence/line ends right after token i."""
+    tok_end = offsets[i][1]
+    if text[offsets[i][0]:tok_end] in (".", "!", "?"):
+        return True
+    nxt = offsets[i + 1][0] if i + 1 < len(offsets) else len(text)
+    return "\n" in text[tok_end:nxt]
+
+def _token_windows(text: str, tokenizer, max_tokens: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Split `text` into windows of at most `max_tokens` tokens, consecutive windows sharing
+    `overlap` tokens. Window ends are pulled back to a sentence/line break inside the
+    overlap when there is one. Returns (char_start, char_end, own_start, own_end) where
+    the "own" range is the part of the window whose entities this window is trusted for
+    (the overlap is split at its midpoint between neighbouring windows).
+    """
+    offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+    n = len(offsets)
+    if n == 0:
         return []
-    items = []
-    for i in range(0, len(text), max_chunk):
-        chunk = text[i:i + max_chunk]
-        try:
-            out = classifier(chunk)
-        except Exception as e:
-            print(f"[parsers] token-classifier chunk error: {e}")
-            out = []
-        for ent in out:
-            label = ent.get("entity_group") or ent.get("entity") or ent.get("label") or None
-            text_ent = ent.get("word") or ent.get("word") or None
-            if label and text_ent:
-                items.append({
-                    "label": label,
-                    "text": text_ent,
-                    "score": float(ent.get("score", 1.0)),
-                    "start": ent.get("start"),
-                    "end": ent.get("end")
-                })
+    overlap = max(0, min(overlap, max_tokens // 2))
+    spans = []  # token ranges [ts, te)
+    ts = 0
+    while True:
+        te = min(ts + max_tokens, n)
+        if te < n:
+            for i in range(te - 1, te - 1 - overlap, -1):
+                if i > ts and _is_sentence_break(text, offsets, i):
+                    te = i + 1
+                    break
+        spans.append((ts, te))
+        if te >= n:
+            break
+        ts = max(te - overlap, ts + 1)
+
+    windows = []
+    for w, (ts, te) in enumerate(spans):
+        own_ts = ts if w == 0 else (ts + spans[w - 1][1]) // 2
+        own_te = te if w == len(spans) - 1 else (spans[w + 1][0] + te) // 2
+        char_start, char_end = offsets[ts][0], offsets[te - 1][1]
+        own_start = 0 if w == 0 else offsets[own_ts][0]
+        own_end = len(text) if w == len(spans) - 1 else offsets[own_te][0]
+        windows.append((char_start, char_end, own_start, own_end))
+    return windows
+
+def _char_windows(text: str, size: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """Fallback for tokenizers without offset mapping: fixed character windows with overlap."""
+    windows = []
+    step = max(1, size - overlap)
+    starts = list(range(0, max(len(text) - overlap, 1), step)) if text else []
+    for w, cs in enumerate(starts):
+        ce = min(cs + size, len(text))
+        own_start = 0 if w == 0 else cs + overlap // 2
+        own_end = len(text) if w == len(starts) - 1 else starts[w + 1] + overlap // 2
+        windows.append((cs, ce, own_start, own_end))
+    return windows
+
+def _ner_windows(text: str, classifier) -> List[Tuple[int, int, int, int]]:
+    tokenizer = getattr(classifier, "tokenizer", None)
+    max_tokens = settings.BERT_NER_WINDOW_TOKENS
+    if tokenizer is not None:
+        # leave room for [CLS]/[SEP]
+        max_tokens = min(max_tokens, getattr(tokenizer, "model_max_length", 512) - 2)
+        if getattr(tokenizer, "is_fast", False):
+            return _token_windows(text, tokenizer, max_tokens, settings.BERT_NER_OVERLAP_TOKENS)
+    # ~4 characters per word piece keeps fallback windows under the model limit
+    return _char_windows(text, max_tokens * 3, settings.BERT_NER_OVERLAP_TOKENS * 3)
+
+def _dedupe_entities(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     seen = set()
     uniq = []
     for e in items:
@@ -103,36 +332,123 @@ def extract_entities_with_bert(text: str, max_chunk: int = 2000) -> List[Dict[st
             uniq.append(e)
     return uniq
 
-def extract_skills_from_taxonomy(text: str, taxonomy: Dict[str, List[str]]) -> List[Dict[str, Any]]:
-    nlp = get_spacy()
-    matcher = PhraseMatcher(nlp.vocab)
-
-    # Create patterns for PhraseMatcher
-    patterns = {}
-    for canonical, variations in taxonomy.items():
-        patterns[canonical] = [nlp(variation) for variation in variations]
-
-    for canonical, pattern_list in patterns.items():
-        matcher.add(canonical, None, *pattern_list)
-
-    doc = nlp(text)
-    matches = matcher(doc)
-
+def extract_entities_with_bert_many(texts: List[str], batch_size: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+    """
+    BERT NER over many documents. Every document is cut into overlapping token windows,
+    and the windows of all documents go through the pipeline as one batched list.
+    Offsets in the result refer to positions in the original documents.
+    """
+    classifier = get_token_classifier()
+    if classifier is None:
+        return [[] for _ in texts]
+    chunks, owners = [], []
+    for doc_idx, text in enumerate(texts):
+        for window in _ner_windows(text or "", classifier):
+            chunks.append(text[window[0]:window[1]])
+            owners.append((doc_idx, window))
+
+    results: List[List[Dict[str, Any]]] = [[] for _ in texts]
+    if not chunks:
+        return results
+    try:
+        with stage("bert_ner", docs=len(texts), windows=len(chunks)):
+            outputs = classifier(chunks, batch_size=batch_size or settings.BERT_NER_BATCH_SIZE)
+    except Exception as e:
+        log.warning("token-classifier batch error: %s", e)
+        return results
+
+    best: Dict[Tuple[int, int, int, str], Dict[str, Any]] = {}
+    for (doc_idx, (char_start, _, own_start, own_end)), out in zip(owners, outputs):
+        for ent in out:
+            label = ent.get("entity_group") or ent.get("entity") or ent.get("label") or None
+            text_ent = ent.get("word") or None
+            if not (label and text_ent) or ent.get("start") is None:
+                continue
+            start = char_start + int(ent["start"])
+            end = char_start + int(ent["end"])
+            # entities in an overlap belong to the window that sees them with most context
+            if not own_start <= start < own_end:
+                continue
+            key = (doc_idx, start, end, label)
+            score = float(ent.get("score", 1.0))
+            if key not in best or score > best[key]["score"]:
+                best[key] = {"label": label, "text": text_ent, "score": score, "start": start, "end": end}
+
+    for (doc_idx, _, _, _), ent in sorted(best.items(), key=lambda kv: (kv[0][0], kv[0][1])):
+        results[doc_idx].append(ent)
+    return [_dedupe_entities(items) for items in results]
+
+def extract_entities_with_bert(text: str) -> List[Dict[str, Any]]:
+    return extract_entities_with_bert_many([text])[0]
+
+def _taxonomy_fingerprint(taxonomy: Dict[str, List[str]]) -> int:
+    return hash(tuple((canonical, tuple(variations)) for canonical, variations in taxonomy.items()))
+
+def invalidate_skill_matcher():
+    """
+    Drop the compiled skill matcher. Call this after editing a taxonomy dict in place
+    (e.g. SKILLS["Python"].append("py3")): get_skill_matcher only notices a different dict
+    or a change in the number of skills on its own.
+    """
+    global _skill_matcher
+    with _matcher_lock:
+        _skill_matcher = None
+
+def get_skill_matcher(taxonomy: Dict[str, List[str]]) -> "PhraseMatcher":
+    """
+    PhraseMatcher for `taxonomy`, compiled once and reused until the taxonomy changes.
+    Patterns only need tokens, so they are built with nlp.make_doc (no tagger/parser/NER).
+    Fingerprinting a large taxonomy costs milliseconds, so the same dict with the same
+    number of skills is trusted as unchanged; in-place edits need invalidate_skill_matcher().
+    A different dict is fingerprinted, and an equal one reuses the compiled matcher.
+    """
+    global _skill_matcher
+    nlp = get_spacy()
+    cached = _skill_matcher
+    # the cache keeps a reference to the taxonomy, so its id() cannot be reused
+    if cached is not None and cached[0] is nlp and cached[1] is taxonomy and cached[2] == len(taxonomy):
+        return cached[4]
+    with _matcher_lock:
+        fingerprint = _taxonomy_fingerprint(taxonomy)
+        cached = _skill_matcher
+        if cached is not None and cached[0] is nlp and cached[3] == fingerprint:
+            matcher = cached[4]
+        else:
+            from spacy.matcher import PhraseMatcher
+            matcher = PhraseMatcher(nlp.vocab)
+            for canonical, variations in taxonomy.items():
+                matcher.add(canonical, list(nlp.tokenizer.pipe(variations)))
+        _skill_matcher = (nlp, taxonomy, len(taxonomy), fingerprint, matcher)
+    return matcher
+
+def _skills_in_doc(doc, matcher: "PhraseMatcher") -> List[Dict[str, Any]]:
     found = []
-    seen_canonical_skills = set()
-
-    for match_id, start, end in matches:
-        canonical_skill = nlp.vocab.strings[match_id]
-        if canonical_skill not in seen_canonical_skills:
-            found.append({
-                "skill": canonical_skill,
-                "match": doc[start:end].text,
-                "confidence": 1.0
-            })
-            seen_canonical_skills.add(canonical_skill)
-
+    seen_canonical_skills = set()
+    for match_id, start, end in matcher(doc):
+        canonical_skill = doc.vocab.strings[match_id]
+        if canonical_skill not in seen_canonical_skills:
+            found.append({
+                "skill": canonical_skill,
+                "match": doc[start:end].text,
+                "confidence": 1.0
+            })
+            seen_canonical_skills.add(canonical_skill)
     return found
 
+def extract_skills_from_taxonomy(text: str, taxonomy: Dict[str, List[str]], rdoc: Optional[ResumeDoc] = None) -> List[Dict[str, Any]]:
+    matcher = get_skill_matcher(taxonomy)
+    if rdoc is not None:
+        return _skills_in_doc(rdoc.tokens, matcher)
+    # matching works on tokens only, so skip the rest of the pipeline
+    return _skills_in_doc(get_spacy().make_doc(text), matcher)
+
+def extract_skills_from_texts(texts: Iterable[str], taxonomy: Dict[str, List[str]], batch_size: int = 64) -> List[List[Dict[str, Any]]]:
+    """Skill matching over many documents, tokenized in batches with nlp.pipe."""
+    nlp = get_spacy()
+    matcher = get_skill_matcher(taxonomy)
+    docs = nlp.pipe(texts, batch_size=batch_size, disable=nlp.pipe_names)
+    return [_skills_in_doc(doc, matcher) for doc in docs]
+
 def extract_sections(text: str) -> Dict[str, str]:
     lower = text.lower()
     sections = {}
@@ -142,13 +458,18 @@ def extract_sections(text: str) -> Dict[str, str]:
             sections[key] = text[idx: idx + length]
     return sections
 
-def parse_resume_text_from_bytes(data: bytes, filename: str = "") -> Dict[str, Any]:
-    raw = extract_text_from_bytes(data, filename)
+def parse_resume(rdoc: ResumeDoc, bert_entities: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Run every extractor over one shared ResumeDoc (BERT entities may be precomputed in bulk)."""
+    raw = rdoc.text
     raw_trim = raw[:20000] if raw else ""
-    basic = extract_basic_fields(raw)
-    sections = extract_sections(raw)
-    bert_entities = extract_entities_with_bert(raw)
-    taxonomy_skills = extract_skills_from_taxonomy(raw, skills_module.SKILLS)
+    with stage("spacy_fields"):
+        basic = extract_basic_fields(raw, rdoc)
+    with stage("sections"):
+        sections = extract_sections(raw)
+    if bert_entities is None:
+        bert_entities = extract_entities_with_bert(raw)
+    with stage("skills"):
+        taxonomy_skills = extract_skills_from_taxonomy(raw, skills_module.SKILLS, rdoc)
     skills = taxonomy_skills
     return {
         "raw": raw_trim,
@@ -157,3 +478,32 @@ def parse_resume_text_from_bytes(data: bytes, filename: str = "") -> Dict[str, A
         "bert_entities": bert_entities,
         "skills": skills
     }
+
+def parse_resume_text_from_bytes(data: bytes, filename: str = "") -> Dict[str, Any]:
+    raw = extract_text_from_bytes(data, filename)
+    return parse_resume(ResumeDoc(raw))
+
+def parse_resume_texts(texts: Iterable[str], n_process: Optional[int] = None, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Bulk version of parse_resume for already-extracted texts: spaCy runs via nlp.pipe
+    and BERT NER windows from a whole group of resumes share batched forward passes.
+    """
+    group_size = batch_size or settings.SPACY_BATCH_SIZE
+    group: List[ResumeDoc] = []
+    for rdoc in iter_resume_docs(texts, n_process=n_process, batch_size=batch_size):
+        group.append(rdoc)
+        if len(group) >= group_size:
+            yield from _parse_group(group)
+            group = []
+    if group:
+        yield from _parse_group(group)
+
+def _parse_group(rdocs: List[ResumeDoc]) -> Iterator[Dict[str, Any]]:
+    entities = extract_entities_with_bert_many([r.text for r in rdocs])
+    for rdoc, ents in zip(rdocs, entities):
+        yield parse_resume(rdoc, ents)
+
+def parse_resumes_from_bytes(files: Iterable[Tuple[bytes, str]], n_process: Optional[int] = None, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Bulk version of parse_resume_text_from_bytes over (data, filename) pairs."""
+    texts = (extract_text_from_bytes(data, filename) for data, filename in files)
+    return parse_resume_texts(texts, n_process=n_process, batch_size=batch_size)
@@ -0,0 +1,95 @@
+# app/profiling.py
+"""
+Opt-in profiling of the full pipeline for a single resume:
+
+    python -m app.profiling resume.pdf --job job.txt --out profile
+
+Writes <out>.html (pyinstrument flame view) when pyinstrument is installed, otherwise
+<out>.prof (cProfile; open with snakeviz or convert with flameprof), plus <out>.trace.json
+with the per-stage timings and RSS of the run.
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+from typing import Any, Dict
+
+from app.telemetry import metrics, trace_request
+
+
+def run_pipeline(data: bytes, filename: str, job_title: str = "", job_desc: str = "", use_llm: bool = True) -> Dict[str, Any]:
+    """parse -> embed -> score, the same path the UI takes for one upload."""
+    from app.parsers import parse_resume_text_from_bytes
+    from app.scoring import score_with_llm, score_with_cosine
+
+    parsed = parse_resume_text_from_bytes(data, filename)
+    result = {"parsed": {"chars": len(parsed["raw"]), "skills": [s["skill"] for s in parsed["skills"]]}}
+    if job_desc:
+        result["cosine"] = score_with_cosine(parsed["raw"], job_desc)
+        if use_llm:
+            llm = score_with_llm(job_title, job_desc, parsed["raw"], use_cache=False)
+            result["llm"] = {k: llm.get(k) for k in ("ok", "score", "error", "model")}
+    return result
+
+
+def profile_resume(path: str, job_desc: str = "", job_title: str = "", out: str = "profile",
+                   use_llm: bool = True, profiler: str = "auto") -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        data = f.read()
+    if profiler == "auto":
+        try:
+            import pyinstrument  # noqa: F401
+            profiler = "pyinstrument"
+        except ImportError:
+            profiler = "cprofile"
+
+    with trace_request(f"profile {os.path.basename(path)}") as tr:
+        if profiler == "pyinstrument":
+            from pyinstrument import Profiler
+
+            prof = Profiler()
+            prof.start()
+            try:
+                result = run_pipeline(data, os.path.basename(path), job_title, job_desc, use_llm)
+            finally:
+                prof.stop()
+            profile_path = f"{out}.html"
+            with open(profile_path, "w", encoding="utf-8") as f:
+                f.write(prof.output_html())
+        else:
+            import cProfile
+
+            prof = cProfile.Profile()
+            try:
+                result = prof.runcall(run_pipeline, data, os.path.basename(path), job_title, job_desc, use_llm)
+            finally:
+                profile_path = f"{out}.prof"
+                prof.dump_stats(profile_path)
+
+    trace_path = f"{out}.trace.json"
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump(tr.to_dict(), f, indent=2)
+    return {"result": result, "profile": profile_path, "trace": trace_path, "stages": metrics.snapshot()}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Profile the pipeline on one resume and dump a flame view + trace.")
+    ap.add_argument("resume", help=".pdf/.txt resume")
+    ap.add_argument("--job", help="job description text file (enables scoring)")
+    ap.add_argument("--title", default="")
+    ap.add_argument("--out", default="profile", help="output path prefix")
+    ap.add_argument("--no-llm", action="store_true", help="skip LLM scoring")
+    ap.add_argument("--profiler", choices=("auto", "pyinstrument", "cprofile"), default="auto")
+    args = ap.parse_args(argv)
+
+    job_desc = ""
+    if args.job:
+        with open(args.job, "r", encoding="utf-8", errors="ignore") as f:
+            job_desc = f.read()
+    report = profile_resume(args.resume, job_desc, args.title, args.out, not args.no_llm, args.profiler)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
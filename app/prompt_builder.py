@@ -0,0 +1,147 @@
+# app/prompt_builder.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+PROMPT_HEADER = """
+    You are an AI resume screener. Compare this resume to the job description.
+    Return a JSON object with:
+    {{
+      "score": <integer 1-10>,
+      "justification": "<brief reason>"
+    }}
+
+    Job Title: {job_title}
+    Job Description: """
+
+RESUME_LABEL = "\n    Resume: "
+
+# order in which resume content is spent against the token budget
+SECTION_PRIORITY = ("experience", "projects", "education")
+
+_tokenizers: Dict[str, object] = {}
+_tokenizer_lock = threading.Lock()
+
+
+def get_prompt_tokenizer(model_name: Optional[str] = None):
+    """Tokenizer of the local LLM (loaded on its own, without model weights)."""
+    model_name = model_name or settings.LLM_MODEL or "google/flan-t5-small"
+    tok = _tokenizers.get(model_name)
+    if tok is None:
+        with _tokenizer_lock:
+            tok = _tokenizers.get(model_name)
+            if tok is None:
+                from transformers import AutoTokenizer
+                tok = _tokenizers[model_name] = AutoTokenizer.from_pretrained(model_name)
+    return tok
+
+
+def context_tokens(model_name: Optional[str] = None) -> int:
+    """Input context size of the local model, capped by LLM_PROMPT_MAX_TOKENS when set."""
+    limit = getattr(get_prompt_tokenizer(model_name), "model_max_length", 512)
+    if limit > 100000:  # tokenizers without a configured limit report a huge sentinel
+        limit = 512
+    if settings.LLM_PROMPT_MAX_TOKENS > 0:
+        limit = min(limit, settings.LLM_PROMPT_MAX_TOKENS)
+    return limit
+
+
+@lru_cache(maxsize=4096)
+def _encode(model_name: str, text: str) -> Tuple[int, Tuple[int, ...]]:
+    """(token count, end-char offset of each token); cached so each text is tokenized once."""
+    tok = get_prompt_tokenizer(model_name)
+    if getattr(tok, "is_fast", False):
+        enc = tok(text, add_special_tokens=False, return_offsets_mapping=True)
+        ends = tuple(end for _, end in enc["offset_mapping"])
+        return len(ends), ends
+    ids = tok(text, add_special_tokens=False)["input_ids"]
+    # slow tokenizers have no offsets: approximate with proportional character cuts
+    n = len(ids)
+    return n, tuple(round(len(text) * (i + 1) / n) for i in range(n))
+
+
+def count_tokens(text: str, model_name: Optional[str] = None) -> int:
+    return _encode(model_name or settings.LLM_MODEL or "google/flan-t5-small", text)[0]
+
+
+def truncate_to_tokens(text: str, budget: int, model_name: Optional[str] = None) -> Tuple[str, int]:
+    """Longest prefix of `text` within `budget` tokens, and the tokens it uses."""
+    if budget <= 0 or not text:
+        return "", 0
+    n, ends = _encode(model_name or settings.LLM_MODEL or "google/flan-t5-small", text)
+    if n <= budget:
+        return text, n
+    return text[:ends[budget - 1]], budget
+
+
+def resume_blocks(resume_text: str) -> List[Tuple[str, str]]:
+    """
+    Resume content in priority order: extracted skills, then experience / projects /
+    education sections (without overlapping each other), then the remaining head of the resume.
+    """
+    from app import parsers, skills as skills_module
+
+    blocks = []
+    found = parsers.extract_skills_from_taxonomy(resume_text, skills_module.SKILLS)
+    if found:
+        blocks.append(("skills", "Skills: " + ", ".join(s["skill"] for s in found)))
+
+    sections = parsers.extract_sections(resume_text)
+    lower = resume_text.lower()
+    starts = {key: lower.find(key) for key in sections}
+    for key in SECTION_PRIORITY:
+        if key not in sections:
+            continue
+        body = sections[key]
+        # stop where another extracted section begins, so no text is sent twice
+        for other, idx in starts.items():
+            offset = idx - starts[key]
+            if other != key and 0 < offset < len(body):
+                body = body[:offset]
+        blocks.append((key, body.strip()))
+
+    head_end = min(starts.values()) if starts else len(resume_text)
+    head = resume_text[:head_end].strip()
+    if head:
+        blocks.append(("header", head))
+    return blocks
+
+
+def build_budget_prompt(job_title: str, job_desc: str, resume_text: str,
+                        model_name: Optional[str] = None, job_share: Optional[float] = None) -> Tuple[str, Dict]:
+    """
+    Scoring prompt that fits the local model's context window.
+    The fixed template is counted first, the job description may use up to `job_share`
+    of what is left, and the rest is filled with resume blocks in priority order.
+    Returns (prompt, stats) where stats records the token budget and what was included.
+    """
+    model_name = model_name or settings.LLM_MODEL or "google/flan-t5-small"
+    job_share = settings.LLM_PROMPT_JOB_SHARE if job_share is None else job_share
+    total = context_tokens(model_name) - 1  # room for </s>
+
+    header = PROMPT_HEADER.format(job_title=job_title)
+    used = count_tokens(header, model_name) + count_tokens(RESUME_LABEL, model_name)
+    remaining = max(0, total - used)
+
+    job_part, job_used = truncate_to_tokens((job_desc or "").strip(), int(remaining * job_share), model_name)
+    remaining -= job_used
+
+    included, parts = [], []
+    for name, block in resume_blocks(resume_text or ""):
+        if remaining <= 0:
+            break
+        # blocks are joined with a newline; reserve a token for it
+        piece, n = truncate_to_tokens(block, remaining - 1, model_name)
+        if piece:
+            parts.append(piece)
+            included.append(name if len(piece) == len(block) else f"{name} (truncated)")
+            remaining -= n + 1
+
+    prompt = header + job_part + RESUME_LABEL + "\n".join(parts) + "\n    "
+    stats = {"budget": total, "estimated_tokens": total - max(remaining, 0), "job_tokens": job_used, "included": included}
+    return prompt, stats
@@ -0,0 +1,351 @@
+# app/records.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from app import skills as skills_module
+
+# span arrays: offsets index into CompactRecord.text, which is a prefix of the original text
+SPAN_DTYPE = np.dtype([("kind", "u1"), ("start", "<u4"), ("end", "<u4")])
+ENTITY_DTYPE = np.dtype([("label", "u1"), ("start", "<u4"), ("end", "<u4"), ("score", "<f4")])
+SKILL_DTYPE = np.dtype([("skill", "<u2"), ("match", "<u2")])
+TABLES = {"fields": SPAN_DTYPE, "sections": SPAN_DTYPE, "entities": ENTITY_DTYPE, "skills": SKILL_DTYPE}
+
+FIELD_KINDS = ("names", "orgs", "email", "phone")
+
+
+class Vocab:
+    """String <-> small int interning; ids are stable for the life of the process."""
+
+    __slots__ = ("names", "_ids", "limit")
+
+    def __init__(self, names: Iterable[str] = (), limit: int = 2 ** 16):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.limit = limit
+        for name in names:
+            self.intern(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[i]
+
+    def intern(self, name: str) -> int:
+        idx = self._ids.get(name)
+        if idx is None:
+            if len(self.names) >= self.limit:
+                raise OverflowError(f"vocabulary full ({self.limit} entries)")
+            idx = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+
+# process-wide vocabularies, seeded so the common ids never change
+SKILL_VOCAB = Vocab(skills_module.SKILLS)
+MATCH_VOCAB = Vocab(alias for aliases in skills_module.SKILLS.values() for alias in aliases)
+LABEL_VOCAB = Vocab(("PER", "ORG", "LOC", "MISC"), limit=256)
+SECTION_VOCAB = Vocab(("experience", "education", "projects"), limit=256)
+
+
+@dataclass
+class CompactRecord:
+    """
+    Memory-light form of a parse_resume record. `text` is the only string: sections,
+    contact fields and entities are (start, end) spans into it, skills are interned ids.
+    `loose` holds the rare values a span cannot reproduce exactly (None almost always).
+    """
+
+    __slots__ = ("text", "raw_len", "fields", "sections", "entities", "skills", "loose")
+    text: str
+    raw_len: int
+    fields: np.ndarray
+    sections: np.ndarray
+    entities: np.ndarray
+    skills: np.ndarray
+    loose: Optional[Dict[str, Any]]
+
+    @property
+    def raw(self) -> str:
+        return self.text[:self.raw_len]
+
+    def skill_names(self) -> List[str]:
+        return [SKILL_VOCAB[i] for i in self.skills["skill"]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The parse_resume dict this record was built from (entity scores at float32 precision)."""
+        loose = self.loose or {}
+        text = self.text
+        basic: Dict[str, Any] = {"names": [], "orgs": [], "email": None, "phone": None}
+        for i, (kind, start, end) in enumerate(self.fields.tolist()):
+            value = loose.get(f"fields.{i}", text[start:end])
+            if FIELD_KINDS[kind] in ("names", "orgs"):
+                basic[FIELD_KINDS[kind]].append(value)
+            else:
+                basic[FIELD_KINDS[kind]] = value
+        sections = {SECTION_VOCAB[kind]: text[start:end] for kind, start, end in self.sections.tolist()}
+        sections.update({key[9:]: value for key, value in loose.items() if key.startswith("sections.")})
+        entities = []
+        for i, (label, start, end, score) in enumerate(self.entities.tolist()):
+            entities.append({"label": LABEL_VOCAB[label], "text": loose.get(f"entities.{i}", text[start:end]),
+                             "score": score, "start": start, "end": end})
+        skills = [{"skill": SKILL_VOCAB[s], "match": MATCH_VOCAB[m], "confidence": loose.get(f"skills.{i}", 1.0)}
+                  for i, (s, m) in enumerate(self.skills.tolist())]
+        return {"raw": self.raw, "basic": basic, "sections": sections, "bert_entities": entities, "skills": skills}
+
+
+def _locate(text: str, value: str, hint: int = 0) -> int:
+    if text.startswith(value, hint):
+        return hint
+    return text.find(value)
+
+
+def compact(record: Dict[str, Any], text: Optional[str] = None) -> CompactRecord:
+    """
+    Build a CompactRecord from a parse_resume dict. Pass the full extracted `text` when it
+    is at hand; sections and entities past the 20k-char "raw" cut can then be spans too (the kept
+    buffer grows only as far as the furthest span). Without it, the buffer is record["raw"].
+    """
+    raw = record.get("raw") or ""
+    source = text if text is not None and text.startswith(raw) else raw
+    loose: Dict[str, Any] = {}
+    furthest = len(raw)
+
+    sections = []
+    for name, value in (record.get("sections") or {}).items():
+        start = _locate(source, value, source.lower().find(name))
+        if start < 0:
+            # not reproducible from the buffer (e.g. past the end of "raw"); keep the string
+            loose[f"sections.{name}"] = value
+            continue
+        sections.append((SECTION_VOCAB.intern(name), start, start + len(value)))
+        furthest = max(furthest, start + len(value))
+
+    entities = []
+    for i, ent in enumerate(record.get("bert_entities") or []):
+        start, end = int(ent.get("start") or 0), int(ent.get("end") or 0)
+        entities.append((LABEL_VOCAB.intern(ent["label"]), start, end, float(ent.get("score", 1.0))))
+        if source[start:end] == ent["text"]:
+            furthest = max(furthest, end)
+        else:
+            loose[f"entities.{i}"] = ent["text"]
+
+    fields = []
+    basic = record.get("basic") or {}
+    for kind, key in enumerate(FIELD_KINDS):
+        values = basic.get(key)
+        for value in (values if isinstance(values, list) else [values] if values is not None else []):
+            start = source.find(value)
+            if start < 0:
+                start = 0
+                loose[f"fields.{len(fields)}"] = value
+            else:
+                furthest = max(furthest, start + len(value))
+            fields.append((kind, start, start + len(value)))
+
+    skills = []
+    for i, s in enumerate(record.get("skills") or []):
+        skills.append((SKILL_VOCAB.intern(s["skill"]), MATCH_VOCAB.intern(s.get("match", ""))))
+        if s.get("confidence", 1.0) != 1.0:
+            loose[f"skills.{i}"] = s["confidence"]
+
+    rec = CompactRecord(
+        text=source[:furthest],
+        raw_len=len(raw),
+        fields=np.array(fields, dtype=SPAN_DTYPE),
+        sections=np.array(sections, dtype=SPAN_DTYPE),
+        entities=np.array(entities, dtype=ENTITY_DTYPE),
+        skills=np.array(skills, dtype=SKILL_DTYPE),
+        loose=None,
+    )
+    if loose:
+        rec.loose = loose
+    return rec
+
+
+def parse_resume_compact(data: bytes, filename: str = "") -> CompactRecord:
+    """parsers.parse_resume_text_from_bytes, returned as a CompactRecord."""
+    from app.parsers import ResumeDoc, extract_text_from_bytes, parse_resume
+
+    text = extract_text_from_bytes(data, filename)
+    return compact(parse_resume(ResumeDoc(text)), text)
+
+
+# --- columnar on-disk store -------------------------------------------------
+
+class RecordWriter:
+    """
+    Streams CompactRecords into a directory of flat columns:
+    text.bin (UTF-8 buffers back to back) + text_offsets.npy, one structured
+    <table>.npy per span/skill table with <table>_offsets.npy, and meta.json
+    (ids, vocabularies, loose values). Read it back with RecordStore.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._text = open(os.path.join(self.path, "text.bin"), "wb")
+        self._text_offsets = [0]
+        self._raw_lens: List[int] = []
+        self._tables: Dict[str, List[np.ndarray]] = {name: [] for name in TABLES}
+        self._counts: Dict[str, List[int]] = {name: [0] for name in TABLES}
+        self._ids: List[str] = []
+        self._loose: Dict[str, Dict[str, Any]] = {}
+        return self
+
+    def write(self, rid: str, rec: CompactRecord):
+        buf = rec.text.encode("utf-8")
+        self._text.write(buf)
+        self._text_offsets.append(self._text_offsets[-1] + len(buf))
+        self._raw_lens.append(rec.raw_len)
+        for name in TABLES:
+            arr = getattr(rec, name)
+            self._tables[name].append(arr)
+            self._counts[name].append(self._counts[name][-1] + len(arr))
+        if rec.loose:
+            self._loose[str(len(self._ids))] = rec.loose
+        self._ids.append(rid)
+
+    def __exit__(self, *exc):
+        self._text.close()
+        np.save(os.path.join(self.path, "text_offsets.npy"), np.asarray(self._text_offsets, dtype=np.int64))
+        np.save(os.path.join(self.path, "raw_len.npy"), np.asarray(self._raw_lens, dtype=np.uint32))
+        for name, dtype in TABLES.items():
+            parts = self._tables[name]
+            np.save(os.path.join(self.path, f"{name}.npy"), np.concatenate(parts) if parts else np.zeros(0, dtype))
+            np.save(os.path.join(self.path, f"{name}_offsets.npy"), np.asarray(self._counts[name], dtype=np.int64))
+        meta = {
+            "ids": self._ids,
+            "vocab": {"skills": SKILL_VOCAB.names, "matches": MATCH_VOCAB.names,
+                      "labels": LABEL_VOCAB.names, "sections": SECTION_VOCAB.names},
+            "loose": self._loose,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+
+def _remap(stored: List[str], vocab: Vocab) -> Optional[np.ndarray]:
+    """stored id -> process id, or None when the two vocabularies agree (the usual case)."""
+    ids = np.array([vocab.intern(name) for name in stored], dtype=np.int64)
+    return None if np.array_equal(ids, np.arange(len(ids))) else ids
+
+
+class RecordStore:
+    """
+    Read side of RecordWriter. Every column is memory-mapped, so opening is O(1) in
+    the data size; store[i] slices views out of the maps and decodes only that text.
+    """
+
+    def __init__(self, path: str, mmap: bool = True):
+        mode = "r" if mmap else None
+        self.path = path
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.ids: List[str] = meta["ids"]
+        self._row_of = {rid: i for i, rid in enumerate(self.ids)}
+        self._loose = meta.get("loose", {})
+        text_path = os.path.join(path, "text.bin")
+        self._text = (np.memmap(text_path, dtype=np.uint8, mode="r") if mmap and os.path.getsize(text_path)
+                      else np.fromfile(text_path, dtype=np.uint8))
+        self._text_offsets = np.load(os.path.join(path, "text_offsets.npy"), mmap_mode=mode)
+        self._raw_len = np.load(os.path.join(path, "raw_len.npy"), mmap_mode=mode)
+        self._tables = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in TABLES}
+        self._offsets = {name: np.load(os.path.join(path, f"{name}_offsets.npy"), mmap_mode=mode) for name in TABLES}
+        vocab = meta["vocab"]
+        self._maps = {
+            ("skills", "skill"): _remap(vocab["skills"], SKILL_VOCAB),
+            ("skills", "match"): _remap(vocab["matches"], MATCH_VOCAB),
+            ("entities", "label"): _remap(vocab["labels"], LABEL_VOCAB),
+            ("sections", "kind"): _remap(vocab["sections"], SECTION_VOCAB),
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def text_bytes(self, i: int) -> memoryview:
+        """Zero-copy UTF-8 bytes of record i's text buffer."""
+        return memoryview(self._text[self._text_offsets[i]:self._text_offsets[i + 1]])
+
+    def table(self, name: str, i: int) -> np.ndarray:
+        rows = self._tables[name][self._offsets[name][i]:self._offsets[name][i + 1]]
+        maps = [(col, m) for (table, col), m in self._maps.items() if table == name and m is not None]
+        if maps:
+            rows = rows.copy()
+            for col, m in maps:
+                rows[col] = m[rows[col]]
+        return rows
+
+    def __getitem__(self, i: int) -> CompactRecord:
+        loose = self._loose.get(str(i))
+        return CompactRecord(
+            text=bytes(self.text_bytes(i)).decode("utf-8"),
+            raw_len=int(self._raw_len[i]),
+            fields=self.table("fields", i),
+            sections=self.table("sections", i),
+            entities=self.table("entities", i),
+            skills=self.table("skills", i),
+            loose=dict(loose) if loose else None,
+        )
+
+    def get(self, rid: str) -> Optional[CompactRecord]:
+        row = self._row_of.get(rid)
+        return None if row is None else self[row]
+
+    def __iter__(self) -> Iterator[Tuple[str, CompactRecord]]:
+        for i, rid in enumerate(self.ids):
+            yield rid, self[i]
+
+    def skill_ids(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(record row, skill id) for every skill of every record, straight from the skills column."""
+        counts = np.diff(self._offsets["skills"])
+        skills = self._tables["skills"]["skill"]
+        m = self._maps[("skills", "skill")]
+        return np.repeat(np.arange(len(self.ids)), counts), (skills if m is None else m[skills])
+
+
+def write_records(path: str, items: Iterable[Tuple[str, CompactRecord]]) -> int:
+    n = 0
+    with RecordWriter(path) as writer:
+        for rid, rec in items:
+            writer.write(rid, rec)
+            n += 1
+    return n
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Convert parsed resume records to the compact columnar store.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    conv = sub.add_parser("convert", help="ingest .jsonl output -> record store directory")
+    conv.add_argument("source")
+    conv.add_argument("out")
+    show = sub.add_parser("show", help="print one record of a store as the parse_resume dict")
+    show.add_argument("store")
+    show.add_argument("id")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "convert":
+        def items():
+            with open(args.source, "r", encoding="utf-8") as f:
+                for line in f:
+                    rec = json.loads(line) if line.strip() else None
+                    if rec and rec.get("ok", True):
+                        yield str(rec["id"]), compact(rec)
+        n = write_records(args.out, items())
+        print(f"wrote {n} records to {args.out}")
+        return
+    rec = RecordStore(args.store).get(args.id)
+    if rec is None:
+        sys.exit(f"no record {args.id!r}")
+    print(json.dumps(rec.to_dict(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# app/resume_index.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def _normalize_rows(mat: np.ndarray) -> np.ndarray:
+    mat = np.asarray(mat, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat[None, :]
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def kmeans(data: np.ndarray, n_clusters: int, iters: int = 20, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on unit vectors; returns (n_clusters, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(data))
+    centroids = data[rng.choice(len(data), n_clusters, replace=False)].copy()
+    for _ in range(iters):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_clusters)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        nonempty = counts > 0
+        centroids[nonempty] = np.add.reduceat(data[order], starts[nonempty], axis=0)
+        # re-seed empty clusters from random points
+        empty = np.flatnonzero(~nonempty)
+        if len(empty):
+            centroids[empty] = data[rng.integers(len(data), size=len(empty))]
+        centroids = _normalize_rows(centroids)
+    return centroids
+
+
+class ResumeIndex:
+    """
+    Searchable pool of resume embeddings.
+    Vectors are unit-normalized float32 rows of one contiguous matrix, so cosine
+    similarity is a single matmul. Deletes are tombstones until compact()/save().
+    Exact search scans every live row; after build_ivf() an approximate IVF mode
+    (k-means partitions, probing the `nprobe` closest lists) is available for large pools.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self.centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:self._size]
+
+    def _reserve(self, extra: int):
+        need = self._size + extra
+        cap = len(self._vectors)
+        if need <= cap and self._vectors.flags.writeable:
+            return
+        new_cap = max(need, cap * 2, 1024)
+        grown = np.zeros((new_cap, self.dim), dtype=np.float32)
+        grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+        alive = np.zeros(new_cap, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._alive = alive
+        assign = np.full(new_cap, -1, dtype=np.int32)
+        assign[:self._size] = self._assign[:self._size]
+        self._assign = assign
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Add (or replace) resumes by id."""
+        vecs = _normalize_rows(vectors)
+        if len(ids) != len(vecs):
+            raise ValueError("ids and vectors must have the same length")
+        if vecs.shape[1] != self.dim:
+            raise ValueError(f"expected dim {self.dim}, got {vecs.shape[1]}")
+        self.delete([i for i in ids if i in self._row_of])
+        self._reserve(len(ids))
+        start, end = self._size, self._size + len(ids)
+        self._vectors[start:end] = vecs
+        self._alive[start:end] = True
+        for offset, rid in enumerate(ids):
+            self._ids.append(rid)
+            self._row_of[rid] = start + offset
+        if self.centroids is not None:
+            self._assign[start:end] = np.argmax(vecs @ self.centroids.T, axis=1)
+            self._lists = None
+        self._size = end
+
+    def add_texts(self, ids: Sequence[str], texts: Sequence[str], batch_size: Optional[int] = None):
+        """Embed resume texts with app.embeddings and add them."""
+        from app.embeddings import embed_list
+
+        self.add(ids, embed_list(list(texts), batch_size=batch_size))
+
+    def delete(self, ids: Sequence[str]) -> int:
+        removed = 0
+        for rid in ids:
+            row = self._row_of.pop(rid, None)
+            if row is not None:
+                if not self._alive.flags.writeable:
+                    self._alive = self._alive.copy()
+                self._alive[row] = False
+                removed += 1
+        if removed:
+            self._lists = None
+        return removed
+
+    def compact(self):
+        """Drop tombstoned rows so the matrix is dense again."""
+        keep = np.flatnonzero(self._alive[:self._size])
+        self._vectors = np.ascontiguousarray(self._vectors[keep])
+        self._assign = self._assign[keep].copy()
+        self._ids = [self._ids[i] for i in keep]
+        self._row_of = {rid: i for i, rid in enumerate(self._ids)}
+        self._size = len(keep)
+        self._alive = np.ones(self._size, dtype=bool)
+        self._lists = None
+
+    # --- search -------------------------------------------------------
+
+    def _results(self, rows: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+        return [{"id": self._ids[r], "similarity": float(s)} for r, s in zip(rows, scores)]
+
+    def search(self, query: np.ndarray, top_k: int = 10, nprobe: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Top-k resumes by cosine similarity to `query`.
+        Exact unless `nprobe` is given and an IVF partitioning has been built.
+        """
+        if top_k <= 0 or not len(self):
+            return []
+        q = _normalize_rows(query)[0]
+        if nprobe and self.centroids is not None:
+            return self._search_ivf(q, top_k, nprobe)
+        scores = self.vectors @ q
+        scores[~self._alive[:self._size]] = -np.inf
+        best = _top_k(scores, min(top_k, len(self)))
+        return self._results(best, scores[best])
+
+    def search_text(self, text: str, top_k: int = 10, nprobe: Optional[int] = None) -> List[Dict[str, Any]]:
+        from app.embeddings import embed_text
+
+        return self.search(embed_text(text), top_k=top_k, nprobe=nprobe)
+
+    def build_ivf(self, n_lists: Optional[int] = None, iters: int = 10, seed: int = 0, sample_per_list: int = 64):
+        """
+        Partition live vectors with k-means (default ~sqrt(N) lists).
+        Centroids are trained on a sample of `sample_per_list` vectors per list.
+        """
+        live = np.flatnonzero(self._alive[:self._size])
+        if not len(live):
+            raise ValueError("cannot build IVF on an empty index")
+        n_lists = n_lists or max(1, int(np.sqrt(len(live))))
+        rng = np.random.default_rng(seed)
+        sample = n_lists * sample_per_list
+        train_rows = live if len(live) <= sample else rng.choice(live, sample, replace=False)
+        self.centroids = kmeans(self._vectors[train_rows], n_lists, iters=iters, seed=seed)
+        if not self._assign.flags.writeable or len(self._assign) < self._size:
+            self._assign = np.full(max(self._size, len(self._vectors)), -1, dtype=np.int32)
+        for i in range(0, self._size, 65536):  # bound the temporary score matrix
+            block = self._vectors[i:min(i + 65536, self._size)]
+            self._assign[i:i + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        self._lists = None
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            live = np.flatnonzero(self._alive[:self._size])
+            order = live[np.argsort(self._assign[live], kind="stable")]
+            bounds = np.searchsorted(self._assign[order], np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(len(self.centroids))]
+        return self._lists
+
+    def _search_ivf(self, q: np.ndarray, top_k: int, nprobe: int) -> List[Dict[str, Any]]:
+        lists = self._inverted_lists()
+        probe = _top_k(self.centroids @ q, min(nprobe, len(lists)))
+        rows = np.concatenate([lists[c] for c in probe])
+        if not len(rows):
+            return []
+        scores = self._vectors[rows] @ q
+        best = _top_k(scores, min(top_k, len(rows)))
+        return self._results(rows[best], scores[best])
+
+    # --- persistence --------------------------------------------------
+
+    def save(self, path: str):
+        """Write vectors.npy (+ ivf.npz) and ids.json into directory `path`."""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), self.vectors)
+        with open(os.path.join(path, "ids.json"), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "ids": self._ids}, f)
+        ivf_path = os.path.join(path, "ivf.npz")
+        if self.centroids is not None:
+            np.savez(ivf_path, centroids=self.centroids, assign=self._assign[:self._size])
+        elif os.path.exists(ivf_path):
+            os.remove(ivf_path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ResumeIndex":
+        """Load a saved index; with mmap=True the vector matrix is memory-mapped, not copied."""
+        with open(os.path.join(path, "ids.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["dim"])
+        index._vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r" if mmap else None)
+        index._size = len(index._vectors)
+        index._ids = list(meta["ids"])
+        index._row_of = {rid: i for i, rid in enumerate(index._ids)}
+        index._alive = np.ones(index._size, dtype=bool)
+        index._assign = np.full(index._size, -1, dtype=np.int32)
+        ivf_path = os.path.join(path, "ivf.npz")
+        if os.path.exists(ivf_path):
+            with np.load(ivf_path) as ivf:
+                index.centroids = ivf["centroids"]
+                index._assign = ivf["assign"].astype(np.int32)
+        return index
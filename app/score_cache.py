@@ -0,0 +1,119 @@
+# app/score_cache.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def score_key(model: str, prompt_version: str, job_title: str, job_trim: str, resume_trim: str) -> str:
+    """Key from the model, prompt template version and hashes of the exact prompt inputs."""
+    parts = [model, prompt_version, _sha(job_title), _sha(job_trim), _sha(resume_trim)]
+    return _sha("\0".join(parts))
+
+
+class ScoreCache:
+    """
+    Persistent cache of successful LLM scoring results (SQLite).
+    Entries expire after `ttl` seconds; beyond `max_items` rows the least recently
+    used entries are evicted.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_items: int = 50000):
+        self.path = path
+        self.ttl = ttl
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, score REAL NOT NULL, justification TEXT, "
+            "raw TEXT, created REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_access ON scores(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT model, score, justification, raw, created FROM scores WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl and now - row[4] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM scores WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE scores SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        model, score, justification, raw, created = row
+        return {"ok": True, "score": score, "justification": justification, "raw": raw,
+                "model": model, "cached_at": created}
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store a successful result; anything with ok=False is ignored."""
+        if not result.get("ok"):
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scores (key, model, score, justification, raw, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, result.get("model", ""), float(result["score"]), result.get("justification", ""),
+                 result.get("raw", ""), now, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            if count > self.max_items:
+                if self.ttl:
+                    self._conn.execute("DELETE FROM scores WHERE created < ?", (now - self.ttl,))
+                self._conn.execute(
+                    "DELETE FROM scores WHERE key IN "
+                    "(SELECT key FROM scores ORDER BY last_access ASC LIMIT "
+                    "MAX(0, (SELECT COUNT(*) FROM scores) - ?))",
+                    (int(self.max_items * 0.9),),
+                )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM scores")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        with self._lock:
+            items = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0, "items": items}
+
+
+_cache: Optional[ScoreCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_score_cache() -> Optional[ScoreCache]:
+    """Process-wide score cache, or None when SCORE_CACHE_ENABLED is off."""
+    global _cache
+    if not settings.SCORE_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScoreCache(settings.SCORE_CACHE_PATH, ttl=settings.SCORE_CACHE_TTL,
+                                max_items=settings.SCORE_CACHE_MAX_ITEMS)
+    return _cache
@@ -82,7 +82,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import json
 from typing import Optional, Dict, Any
-from app.llm import get_score_with_llm
+from app.llm import get_score_with_llm, score_model_name, score_prompt_kind, score_prompt_version, JOB_PROMPT_CHARS, RESUME_PROMPT_CHARS
+from app.score_cache import get_score_cache, score_key
 from app.embeddings import embed_text
 import numpy as np
 from app.config import settings
@@ -126,15 +127,36 @@ def parse_llm_json(raw_text: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def score_with_llm(job_title: str, job_desc: str, resume_text: str) -> Dict[str, Any]:
+def _llm_cache_key(job_title: str, job_desc: str, resume_text: str) -> str:
+    return score_key(
+        score_model_name(),
+        score_prompt_version(),
+        job_title or "",
+        (job_desc or "")[:JOB_PROMPT_CHARS],
+        (resume_text or "")[:RESUME_PROMPT_CHARS],
+    )
+
+
+def score_with_llm(job_title: str, job_desc: str, resume_text: str, use_cache: bool = True) -> Dict[str, Any]:
     """
     Ask Gemini or local Flan model for a resume match score + justification.
     Falls back to local if Gemini fails (handled inside llm.py).
+    Successful results are memoized in the score cache; pass use_cache=False to bypass it.
     """
+    cache = get_score_cache() if use_cache else None
+    key = _llm_cache_key(job_title, job_desc, resume_text) if cache is not None else None
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            hit["score"] = round(min(max(float(hit["score"]), 1.0), 10.0), 2)
+            hit["timings"] = {"load_time": 0.0, "generation_time": 0.0}
+            hit["cached"] = True
+            return hit
+
     result = get_score_with_llm(job_title, job_desc, resume_text)
 
     if not result.get("ok"):
-        return {"ok": False, "error": result.get("error"), "raw": result.get("raw")}
+        return {"ok": False, "error": result.get("error"), "raw": result.get("raw"), "timings": result.get("timings")}
 
     score = float(result.get("score", 0))
     justification = result.get("justification", "")
@@ -142,19 +164,31 @@ def score_with_llm(job_title: str, job_desc: str, resume_text: str) -> Dict[str,
 
     # Clamp score 1–10
     score = min(max(score, 1.0), 10.0)
-    return {
+    out = {
         "ok": True,
         "score": round(score, 2),
         "justification": justification,
         "raw": raw,
+        "timings": result.get("timings"),
+        "model": result.get("model"),
+        "cached": False,
     }
+    # a Gemini failure answered by the local fallback, or a budget prompt that fell back to
+    # character trimming, must not be stored under the key of what was asked for
+    if cache is not None and result.get("model") == score_model_name() and result.get("prompt") == score_prompt_kind():
+        cache.put(key, out)
+    return out
 
 
 def score_with_cosine(resume_text: str, job_desc: str) -> Dict[str, Any]:
-    """Simple cosine similarity fallback scoring."""
-    r_vec = embed_text(resume_text)
-    j_vec = embed_text(job_desc)
-    sim = cosine_sim(r_vec, j_vec)
+    """Simple cosine similarity fallback scoring (pooled over resume chunks when EMBED_CHUNKED is on)."""
+    if settings.EMBED_CHUNKED:
+        from app.chunked import chunked_similarity
+        sim = chunked_similarity(resume_text, job_desc)
+    else:
+        r_vec = embed_text(resume_text)
+        j_vec = embed_text(job_desc)
+        sim = cosine_sim(r_vec, j_vec)
     sim_clamped = max(0.0, min(1.0, sim))
     score = round(1 + 9 * sim_clamped, 2)
     return {"score": score, "similarity": float(sim_clamped)}
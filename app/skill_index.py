@@ -0,0 +1,321 @@
+# app/skill_index.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from app import skills as skills_module
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+_TOKEN_RE = re.compile(r'\(|\)|"[^"]*"|[^\s()]+')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def _bits_to_rows(bitmap: np.ndarray, size: int) -> np.ndarray:
+    """Positions of the set bits (bit j of word j // 64 is resume row j)."""
+    bits = np.unpackbits(bitmap.astype("<u8", copy=False).view(np.uint8), bitorder="little")
+    return np.flatnonzero(bits[:size])
+
+
+def popcount(bitmaps: np.ndarray) -> np.ndarray:
+    """Set bits per bitmap (last axis), via a byte lookup table."""
+    as_bytes = np.ascontiguousarray(bitmaps).astype("<u8", copy=False).view(np.uint8)
+    return _POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def _alias_map(taxonomy: Dict[str, List[str]]) -> Dict[str, str]:
+    """lowercase canonical name or alias -> canonical name"""
+    lookup = {}
+    for canon, aliases in taxonomy.items():
+        for alias in aliases:
+            lookup.setdefault(alias.lower(), canon)
+    for canon in taxonomy:
+        lookup[canon.lower()] = canon
+    return lookup
+
+
+class SkillIndex:
+    """
+    Inverted index from canonical skills (skills.SKILLS) to resume ids.
+    Each skill's posting list is a bitmap: one row of a uint64 matrix where bit j
+    marks resume row j, so AND/OR/NOT queries and counts are whole-word numpy ops.
+    Re-adding an id replaces its skills; deletes are tombstones until compact()/save().
+    """
+
+    def __init__(self, skills: Optional[Sequence[str]] = None, taxonomy: Optional[Dict[str, List[str]]] = None):
+        taxonomy = taxonomy or skills_module.SKILLS
+        self.skills: List[str] = list(skills if skills is not None else taxonomy)
+        self._skill_row = {s: i for i, s in enumerate(self.skills)}
+        self._aliases = _alias_map(taxonomy)
+        for name in self.skills:
+            self._aliases.setdefault(name.lower(), name)
+        self._bits = np.zeros((len(self.skills), 0), dtype=np.uint64)
+        self._alive = np.zeros(0, dtype=np.uint64)
+        self._size = 0
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _words(self) -> int:
+        return (self._size + 63) // 64
+
+    def _reserve(self, extra: int):
+        need = (self._size + extra + 63) // 64
+        cap = self._bits.shape[1]
+        if need <= cap and self._bits.flags.writeable:
+            return
+        new_cap = max(need, cap * 2, 16)
+        grown = np.zeros((len(self.skills), new_cap), dtype=np.uint64)
+        grown[:, :cap] = self._bits
+        self._bits = grown
+        alive = np.zeros(new_cap, dtype=np.uint64)
+        alive[:cap] = self._alive
+        self._alive = alive
+
+    def _skill_rows(self, names: Iterable[str]) -> List[int]:
+        rows = set()
+        for name in names:
+            canon = self._aliases.get(name.lower(), name)
+            if canon not in self._skill_row:
+                # a skill outside the taxonomy gets its own (empty so far) bitmap
+                self._skill_row[canon] = len(self.skills)
+                self.skills.append(canon)
+                self._aliases.setdefault(canon.lower(), canon)
+                self._bits = np.vstack([self._bits, np.zeros((1, self._bits.shape[1]), dtype=np.uint64)])
+            rows.add(self._skill_row[canon])
+        return sorted(rows)
+
+    def add(self, ids: Sequence[str], skill_lists: Sequence[Iterable[str]]):
+        """Add (or replace) resumes by id; each entry is the resume's canonical skill names."""
+        if len(ids) != len(skill_lists):
+            raise ValueError("ids and skill_lists must have the same length")
+        self.delete([i for i in ids if i in self._row_of])
+        rows = [self._skill_rows(names) for names in skill_lists]
+        self._reserve(len(ids))
+        doc_rows = np.arange(self._size, self._size + len(ids), dtype=np.int64)
+        skill_idx = np.fromiter((s for r in rows for s in r), dtype=np.int64)
+        doc_idx = np.repeat(doc_rows, [len(r) for r in rows])
+        one = np.uint64(1)
+        np.bitwise_or.at(self._bits, (skill_idx, doc_idx >> 6), one << (doc_idx & 63).astype(np.uint64))
+        np.bitwise_or.at(self._alive, doc_rows >> 6, one << (doc_rows & 63).astype(np.uint64))
+        for offset, rid in enumerate(ids):
+            self._ids.append(rid)
+            self._row_of[rid] = self._size + offset
+        self._size += len(ids)
+
+    def add_records(self, records: Iterable[Dict[str, Any]]):
+        """Add parse_resume / ingest records ({"id", "skills": [{"skill": ...}]}); failed records are skipped."""
+        ids, lists = [], []
+        for rec in records:
+            if rec.get("ok", True) and "skills" in rec:
+                ids.append(str(rec["id"]))
+                lists.append([s["skill"] for s in rec["skills"]])
+        self.add(ids, lists)
+
+    def add_texts(self, ids: Sequence[str], texts: Sequence[str]):
+        """Run the taxonomy matcher over raw resume texts and add them."""
+        from app.parsers import extract_skills_from_texts
+
+        # taxonomy aliases are lowercase and the phrase matcher is case-sensitive
+        found = extract_skills_from_texts((t.lower() for t in texts), skills_module.SKILLS)
+        self.add(list(ids), [[s["skill"] for s in f] for f in found])
+
+    def delete(self, ids: Sequence[str]) -> int:
+        removed = 0
+        for rid in ids:
+            row = self._row_of.pop(rid, None)
+            if row is None:
+                continue
+            if not self._bits.flags.writeable:
+                self._bits, self._alive = self._bits.copy(), self._alive.copy()
+            mask = ~np.uint64(1 << (row & 63))
+            self._bits[:, row >> 6] &= mask
+            self._alive[row >> 6] &= mask
+            removed += 1
+        return removed
+
+    def compact(self):
+        """Drop tombstoned rows so bit positions are dense again."""
+        keep = _bits_to_rows(self._alive, self._size)
+        if len(keep) == self._size:
+            return
+        n_words = (len(keep) + 63) // 64
+        bits = np.zeros((len(self.skills), n_words), dtype=np.uint64)
+        for s in range(len(self.skills)):
+            dense = np.zeros(n_words * 64, dtype=np.uint8)
+            dense[np.searchsorted(keep, _bits_to_rows(self._bits[s], self._size))] = 1
+            bits[s] = np.packbits(dense, bitorder="little").view("<u8")
+        self._bits = bits
+        self._ids = [self._ids[i] for i in keep]
+        self._row_of = {rid: i for i, rid in enumerate(self._ids)}
+        self._size = len(keep)
+        alive = np.zeros(n_words * 64, dtype=np.uint8)
+        alive[:self._size] = 1
+        self._alive = np.packbits(alive, bitorder="little").view("<u8").astype(np.uint64)
+
+    # --- queries ------------------------------------------------------
+
+    def bitmap(self, skill: str) -> np.ndarray:
+        canon = self._aliases.get(skill.lower(), skill)
+        row = self._skill_row.get(canon)
+        if row is None:
+            raise KeyError(f"unknown skill: {skill!r}")
+        return self._bits[row, :self._words()]
+
+    def query(self, expr: str) -> np.ndarray:
+        """
+        Bitmap of the resumes matching a boolean skill expression, e.g.
+        'Kubernetes AND Python AND NOT Java' or '(AWS OR GCP) AND "Big Data"'.
+        Skills may be canonical names or aliases (any case); multi-word names can be quoted
+        or written bare. Operators are uppercase only, so a lowercase "and"/"or"/"not" is part
+        of a skill name. Operators bind NOT > AND > OR.
+        """
+        tokens = _TOKEN_RE.findall(expr)
+        pos = 0
+
+        def peek():
+            return tokens[pos] if pos < len(tokens) else None
+
+        def take():
+            nonlocal pos
+            pos += 1
+            return tokens[pos - 1]
+
+        def parse_or():
+            bm = parse_and()
+            while peek() == "OR":
+                take()
+                bm = bm | parse_and()
+            return bm
+
+        def parse_and():
+            bm = parse_not()
+            while peek() == "AND":
+                take()
+                bm = bm & parse_not()
+            return bm
+
+        def parse_not():
+            if peek() == "NOT":
+                take()
+                return ~parse_not() & self._alive[:self._words()]
+            if peek() == "(":
+                take()
+                bm = parse_or()
+                if peek() != ")":
+                    raise ValueError(f"missing ')' in {expr!r}")
+                take()
+                return bm
+            words = []
+            while peek() is not None and peek() not in _OPERATORS and peek() not in ("(", ")"):
+                words.append(take().strip('"'))
+            if not words:
+                raise ValueError(f"expected a skill at token {pos} in {expr!r}")
+            return self.bitmap(" ".join(words))
+
+        result = parse_or()
+        if pos != len(tokens):
+            raise ValueError(f"unexpected {tokens[pos]!r} in {expr!r}")
+        return result & self._alive[:self._words()]
+
+    def ids(self, expr: str) -> List[str]:
+        return [self._ids[r] for r in _bits_to_rows(self.query(expr), self._size)]
+
+    def count(self, expr: str) -> int:
+        return int(popcount(self.query(expr)))
+
+    def counts(self) -> Dict[str, int]:
+        """Resumes per skill."""
+        live = self._bits[:, :self._words()] & self._alive[:self._words()]
+        return {s: int(c) for s, c in zip(self.skills, popcount(live))}
+
+    def prefilter(self, resumes: Iterable[Tuple[str, str]], expr: str) -> List[Tuple[str, str]]:
+        """(resume_id, text) pairs that satisfy `expr`; ids missing from the index are dropped."""
+        keep = set(self.ids(expr))
+        return [(rid, text) for rid, text in resumes if rid in keep]
+
+    # --- persistence --------------------------------------------------
+
+    def save(self, path: str):
+        """Write bitmaps.npy (skills x words, uint64) and ids.json into directory `path`."""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "bitmaps.npy"), np.ascontiguousarray(self._bits[:, :self._words()]))
+        with open(os.path.join(path, "ids.json"), "w", encoding="utf-8") as f:
+            json.dump({"skills": self.skills, "ids": self._ids}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "SkillIndex":
+        """Load a saved index; with mmap=True the bitmaps are memory-mapped and copied only on the first update."""
+        with open(os.path.join(path, "ids.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["skills"])
+        index._bits = np.load(os.path.join(path, "bitmaps.npy"), mmap_mode="r" if mmap else None)
+        index._ids = list(meta["ids"])
+        index._row_of = {rid: i for i, rid in enumerate(index._ids)}
+        index._size = len(index._ids)
+        alive = np.zeros(index._bits.shape[1] * 64, dtype=np.uint8)
+        alive[:index._size] = 1
+        index._alive = np.packbits(alive, bitorder="little").view("<u8").astype(np.uint64)
+        return index
+
+
+def prefilter_resumes(resumes: Sequence[Tuple[str, str]], expr: str,
+                      index: Optional[SkillIndex] = None) -> List[Tuple[str, str]]:
+    """
+    Hard skill requirements in front of cosine/LLM ranking: keep only the (id, text) pairs
+    matching `expr`. Without a prebuilt index, one is built from the texts (taxonomy matching
+    only, far cheaper than embedding or scoring them).
+    """
+    if index is None:
+        index = SkillIndex()
+        index.add_texts([rid for rid, _ in resumes], [text for _, text in resumes])
+    return index.prefilter(resumes, expr)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build and query the inverted skill index.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    build = sub.add_parser("build", help="index a resume directory or an ingest .jsonl output")
+    build.add_argument("source")
+    build.add_argument("--out", required=True, help="index directory")
+    query = sub.add_parser("query", help="ids matching a boolean skill expression")
+    query.add_argument("index")
+    query.add_argument("expr", help="e.g. 'Kubernetes AND Python AND NOT Java'")
+    query.add_argument("--count", action="store_true", help="only print the number of matches")
+    counts = sub.add_parser("counts", help="resumes per skill")
+    counts.add_argument("index")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        index = SkillIndex.load(args.out, mmap=False) if os.path.exists(os.path.join(args.out, "ids.json")) else SkillIndex()
+        if args.source.endswith(".jsonl"):
+            with open(args.source, "r", encoding="utf-8") as f:
+                index.add_records(json.loads(line) for line in f if line.strip())
+        else:
+            from app.batch import iter_resume_files
+
+            pairs = list(iter_resume_files(args.source))
+            index.add_texts([rid for rid, _ in pairs], [text for _, text in pairs])
+        index.save(args.out)
+        print(f"indexed {len(index)} resumes, {len(index.skills)} skills -> {args.out}")
+    elif args.cmd == "query":
+        index = SkillIndex.load(args.index)
+        if args.count:
+            print(index.count(args.expr))
+        else:
+            for rid in index.ids(args.expr):
+                print(rid)
+    else:
+        for skill, n in sorted(SkillIndex.load(args.index).counts().items(), key=lambda x: -x[1]):
+            print(f"{n:>8}  {skill}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # app/skills.py
 
 # Skill taxonomy with aliases
+# (after editing it in place at runtime, call app.parsers.invalidate_skill_matcher())
 SKILLS = {
     "Python": ["python", "py"],
     "Java": ["java"],
@@ -0,0 +1,303 @@
+# app/telemetry.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.config import settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# --- logging ------------------------------------------------------------
+
+_logging_configured = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the "resume_scanner" namespace; configured from LOG_LEVEL on first use."""
+    global _logging_configured
+    if not _logging_configured:
+        root = logging.getLogger("resume_scanner")
+        if not root.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+            root.addHandler(handler)
+        root.setLevel(settings.LOG_LEVEL.upper())
+        _logging_configured = True
+    return logging.getLogger(f"resume_scanner.{name}")
+
+
+# --- memory -------------------------------------------------------------
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> int:
+    """Resident set size in bytes (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def peak_rss() -> int:
+    """Peak resident set size of the process so far, in bytes."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+
+
+class _PeakSampler:
+    """
+    One daemon thread that polls current_rss() every `interval` seconds while any stage is
+    open and raises each open stage's running peak. Idle (blocked on an event) otherwise.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: Dict[int, List[int]] = {}
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def open(self, rss: int) -> List[int]:
+        cell = [rss]
+        with self._lock:
+            self._open[id(cell)] = cell
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return cell
+
+    def close(self, cell: List[int]) -> int:
+        with self._lock:
+            self._open.pop(id(cell), None)
+        return cell[0]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._open
+                if idle:
+                    self._wake.clear()
+            if idle:
+                self._wake.wait()
+                continue
+            rss = current_rss()
+            with self._lock:
+                for cell in self._open.values():
+                    if rss > cell[0]:
+                        cell[0] = rss
+            time.sleep(settings.TELEMETRY_RSS_SAMPLE_MS / 1000.0)
+
+
+_sampler = _PeakSampler()
+
+# --- metrics ------------------------------------------------------------
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class StageMetrics:
+    """Per (stage, kind) latency histograms plus the largest RSS growth and peak RSS seen in one run of the stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[tuple, Dict[str, Any]] = {}
+
+    def observe(self, stage: str, kind: str, seconds: float, rss_delta: int, error: bool = False, rss_peak: int = 0):
+        with self._lock:
+            s = self._series.get((stage, kind))
+            if s is None:
+                s = self._series[(stage, kind)] = {"count": 0, "sum": 0.0, "max": 0.0, "errors": 0,
+                                                   "buckets": [0] * len(BUCKETS), "rss_growth_max": 0,
+                                                   "rss_peak_max": 0}
+            s["count"] += 1
+            s["sum"] += seconds
+            s["max"] = max(s["max"], seconds)
+            s["errors"] += int(error)
+            s["rss_growth_max"] = max(s["rss_growth_max"], rss_delta)
+            s["rss_peak_max"] = max(s["rss_peak_max"], rss_peak)
+            for i, le in enumerate(BUCKETS):
+                if seconds <= le:
+                    s["buckets"][i] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {f"{stage}:{kind}": {k: v for k, v in s.items() if k != "buckets"}
+                    for (stage, kind), s in sorted(self._series.items())}
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def prometheus(self, prefix: str = "resume_scanner") -> str:
+        """Text exposition format (histogram per stage/kind, RSS growth gauges, error counters)."""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Wall time spent per pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+            for (stage, kind), s in series:
+                labels = f'stage="{stage}",kind="{kind}"'
+                for le, n in zip(BUCKETS, s["buckets"]):
+                    lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="{le}"}} {n}')
+                lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="+Inf"}} {s["count"]}')
+                lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {s['sum']:.6f}")
+                lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {s['count']}")
+            lines += [f"# HELP {prefix}_stage_errors_total Stage invocations that raised.",
+                      f"# TYPE {prefix}_stage_errors_total counter"]
+            lines += [f'{prefix}_stage_errors_total{{stage="{stage}",kind="{kind}"}} {s["errors"]}'
+                      for (stage, kind), s in series]
+            lines += [f"# HELP {prefix}_stage_rss_growth_bytes Largest RSS increase between entering and leaving a stage.",
+                      f"# TYPE {prefix}_stage_rss_growth_bytes gauge"]
+            lines += [f'{prefix}_stage_rss_growth_bytes{{stage="{stage}",kind="{kind}"}} {s["rss_growth_max"]}'
+                      for (stage, kind), s in series]
+            lines += [f"# HELP {prefix}_stage_peak_rss_bytes Highest process RSS observed while a stage was running.",
+                      f"# TYPE {prefix}_stage_peak_rss_bytes gauge"]
+            lines += [f'{prefix}_stage_peak_rss_bytes{{stage="{stage}",kind="{kind}"}} {s["rss_peak_max"]}'
+                      for (stage, kind), s in series]
+        lines += [f"# TYPE {prefix}_process_rss_bytes gauge", f"{prefix}_process_rss_bytes {current_rss()}",
+                  f"# TYPE {prefix}_process_peak_rss_bytes gauge", f"{prefix}_process_peak_rss_bytes {peak_rss()}"]
+        return "\n".join(lines) + "\n"
+
+
+metrics = StageMetrics()
+
+# --- traces -------------------------------------------------------------
+
+
+class Trace:
+    """Spans recorded while handling one request (or one CLI run)."""
+
+    def __init__(self, name: str, trace_id: Optional[str] = None):
+        self.name = name
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.start = time.perf_counter()
+        self.started_at = time.time()
+        self.spans: List[Dict[str, Any]] = []
+        self._depth = 0
+        # stages also run in to_thread workers that share this trace
+        self._lock = threading.Lock()
+
+    def _enter(self) -> int:
+        with self._lock:
+            self._depth += 1
+            return self._depth - 1
+
+    def _exit(self, span: Dict[str, Any]):
+        with self._lock:
+            self._depth -= 1
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": round(time.perf_counter() - self.start, 6),
+            "spans": self.spans,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("resume_scanner_trace", default=None)
+# finished traces, newest last, for lookup by id (e.g. the API's /traces endpoint)
+recent_traces: "deque[Trace]" = deque(maxlen=256)
+
+
+@contextmanager
+def trace_request(name: str, trace_id: Optional[str] = None) -> Iterator[Trace]:
+    """Collect the spans of every stage run inside this block (also in to_thread workers)."""
+    tr = Trace(name, trace_id)
+    token = _current_trace.set(tr)
+    try:
+        yield tr
+    finally:
+        _current_trace.reset(token)
+        recent_traces.append(tr)
+        if settings.TRACE_LOG:
+            get_logger("trace").info(tr.to_json())
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def find_trace(trace_id: str) -> Optional[Trace]:
+    for tr in reversed(recent_traces):
+        if tr.trace_id == trace_id:
+            return tr
+    return None
+
+
+@contextmanager
+def stage(name: str, kind: str = "run", **attrs):
+    """
+    Time a pipeline stage. `kind` separates model loading ("load") from the work itself
+    ("run"). Records a metrics observation and, inside trace_request, a span with RSS figures.
+    Two memory figures: `rss_delta` (RSS on exit minus on entry, what the stage kept, e.g. a
+    model load) and `rss_peak` (highest RSS while it ran, polled every TELEMETRY_RSS_SAMPLE_MS
+    and raised to ru_maxrss when the stage set a new process peak), so a stage that allocates
+    and frees a large buffer still shows it. Concurrent stages share one process RSS.
+    """
+    if not settings.TELEMETRY_ENABLED:
+        yield
+        return
+    tr = _current_trace.get()
+    rss0 = current_rss()
+    maxrss0 = peak_rss()
+    cell = _sampler.open(rss0) if settings.TELEMETRY_RSS_SAMPLE_MS > 0 else [rss0]
+    t0 = time.perf_counter()
+    error = False
+    depth = tr._enter() if tr is not None else 0
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        rss = current_rss()
+        rss_peak = max(_sampler.close(cell), rss)
+        maxrss = peak_rss()
+        if maxrss > maxrss0:
+            # the process peak moved during this stage, possibly between two polls
+            rss_peak = max(rss_peak, maxrss)
+        metrics.observe(name, kind, elapsed, rss - rss0, error, rss_peak)
+        if tr is not None:
+            span = {"stage": name, "kind": kind, "depth": depth,
+                    "offset": round(t0 - tr.start, 6), "seconds": round(elapsed, 6),
+                    "rss": rss, "rss_delta": rss - rss0, "rss_peak": rss_peak}
+            if error:
+                span["error"] = True
+            span.update(attrs)
+            tr._exit(span)
+
+
+def timed(name: str, kind: str = "run"):
+    """Decorator form of stage()."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with stage(name, kind):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
@@ -0,0 +1,86 @@
+# app/warmup.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.config import settings
+from app.telemetry import get_logger
+
+log = get_logger("warmup")
+
+
+def _embedding():
+    from app.embeddings import get_embedding_model
+    get_embedding_model()
+
+
+def _spacy():
+    from app.parsers import get_spacy
+    get_spacy()
+
+
+def _local_llm():
+    from app.llm import warm_local_llm
+    warm_local_llm()
+
+
+def _bert_ner():
+    from app.parsers import get_token_classifier
+    get_token_classifier()
+
+
+WARMUP_TARGETS: Dict[str, Callable[[], None]] = {
+    "embedding": _embedding,
+    "spacy": _spacy,
+    "llm": _local_llm,
+    "ner": _bert_ner,
+}
+
+
+def default_targets() -> List[str]:
+    """Models the app will need under the current settings."""
+    targets = ["embedding", "spacy", "ner"]
+    if settings.LLM_MODE.upper() != "GEMINI":
+        targets.append("llm")
+    return targets
+
+
+def warmup(targets: Optional[List[str]] = None, report: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """Load each target model now; fills and returns `report` with per-target load time or error."""
+    report = {} if report is None else report
+    for name in targets or default_targets():
+        t0 = time.perf_counter()
+        try:
+            WARMUP_TARGETS[name]()
+            report[name] = {"ok": True, "seconds": round(time.perf_counter() - t0, 3)}
+        except Exception as e:
+            log.warning("warmup of %s failed: %s", name, e)
+            report[name] = {"ok": False, "error": str(e)}
+    return report
+
+
+def start_background_warmup(targets: Optional[List[str]] = None, report: Optional[Dict[str, Dict]] = None) -> threading.Thread:
+    """
+    Preload models on a daemon thread so startup is not blocked. The loaders are
+    guarded by locks, so a request that arrives first simply waits for the same load.
+    Pass `report` to watch progress; it is filled as each target finishes.
+    """
+    thread = threading.Thread(target=warmup, args=(targets, report), name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Preload (and download) the models used by the app.")
+    ap.add_argument("targets", nargs="*", choices=sorted(WARMUP_TARGETS), help="default: everything the current settings use")
+    args = ap.parse_args(argv)
+    print(json.dumps(warmup(args.targets or None), indent=2))
+
+
+if __name__ == "__main__":
+    main()
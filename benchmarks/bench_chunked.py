@@ -0,0 +1,106 @@
+# benchmarks/bench_chunked.py
+"""
+Memory per resume and query latency of chunked (multi-vector) embeddings against the
+single-vector mode. Resumes are synthetic texts chunked with app.chunked.chunk_text;
+vectors are random unit vectors by default, or real embeddings with --model:
+
+    python benchmarks/bench_chunked.py --n 20000 --words 900
+    python benchmarks/bench_chunked.py --n 500 --model
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import time
+
+import numpy as np
+from app.chunked import ChunkStore, chunk_text
+from app.resume_index import ResumeIndex
+
+VOCAB = ("python django docker kubernetes aws sql react java team led built designed shipped "
+         "pipeline service api data model customers latency migration testing reviewed").split()
+HEADINGS = ("Summary", "Experience", "Projects", "Education", "Skills")
+
+
+def synthetic_resume(words, rng):
+    """Resume-shaped text: headed sections of 8-20 word sentences."""
+    lines, left = [], words
+    for heading in HEADINGS:
+        lines.append(heading)
+        for _ in range(max(1, words // (len(HEADINGS) * 14))):
+            n = int(rng.integers(8, 21))
+            lines.append(" ".join(rng.choice(VOCAB, n)) + ".")
+            left -= n
+            if left <= 0:
+                break
+    return "\n".join(lines)
+
+
+def unit_rows(n, dim, rng):
+    v = rng.standard_normal((n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def timed_queries(fn, queries):
+    fn(queries[0])  # warm
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - t0) * 1000 / len(queries)
+
+
+def run(n, words, dim, queries, pooling, k, use_model=False, seed=0):
+    rng = np.random.default_rng(seed)
+    texts = [synthetic_resume(int(rng.integers(words // 2, words * 3 // 2)), rng) for _ in range(n)]
+    chunks = [chunk_text(t) for t in texts]
+
+    if use_model:
+        from app.chunked import embed_chunks_many
+        from app.embeddings import embed_list
+
+        single = embed_list(texts)
+        chunk_vecs = embed_chunks_many(texts)
+        dim = single.shape[1]
+    else:
+        single = unit_rows(n, dim, rng)
+        chunk_vecs = [unit_rows(len(c), dim, rng) for c in chunks]
+    qs = unit_rows(queries, dim, rng)
+
+    index = ResumeIndex(dim)
+    index.add([str(i) for i in range(n)], single)
+    rows = [{
+        "mode": "single-float32",
+        "bytes_per_resume": index.vectors.nbytes / n,
+        "ms_per_query": timed_queries(lambda q: index.search(q, 10), qs),
+    }]
+    for dtype in ("float32", "float16", "int8"):
+        store = ChunkStore(dim, dtype)
+        for i, vecs in enumerate(chunk_vecs):
+            store.add(str(i), vecs)
+        rows.append({
+            "mode": f"chunked-{dtype}",
+            "bytes_per_resume": store.nbytes / n,
+            "ms_per_query": timed_queries(lambda q: store.search(q, 10, pooling=pooling, k=k), qs),
+        })
+    counts = [len(c) for c in chunks]
+    return {"n": n, "dim": dim, "mean_chunks": float(np.mean(counts)), "max_chunks": int(max(counts)),
+            "pooling": pooling, "results": rows}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--n", type=int, default=20000, help="resumes in the pool")
+    ap.add_argument("--words", type=int, default=900, help="mean resume length in words")
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--queries", type=int, default=20)
+    ap.add_argument("--pooling", choices=("max", "topk"), default="max")
+    ap.add_argument("--k", type=int, default=3, help="chunks averaged by topk pooling")
+    ap.add_argument("--model", action="store_true", help="embed with the configured model instead of random vectors")
+    args = ap.parse_args(argv)
+
+    print(json.dumps(run(args.n, args.words, args.dim, args.queries, args.pooling, args.k, args.model), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_dedup.py
+"""
+Near-duplicate detection with app.dedup: recall/precision on edited copies of synthetic
+resumes, and lookup latency as the store grows (random background signatures are
+bulk-loaded up to --stored, so a million-entry store is quick to build):
+
+    python benchmarks/bench_dedup.py --stored 1000000 --queries 200
+    python benchmarks/bench_dedup.py --stored 10000 --edits 0.05 0.10 0.20 0.40
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import random
+import tempfile
+import time
+
+import numpy as np
+from app.dedup import DedupStore
+from benchmarks.corpus import synthetic_resume
+
+
+def mutate(text: str, rate: float, rng: random.Random) -> str:
+    """
+    Re-tailor about `rate` of the lines: reword a few words, drop the line or add a new one
+    after it, which is how candidates adapt a resume for another requisition.
+    """
+    lines = text.split("\n")
+    vocab = text.split()
+    out = []
+    for line in lines:
+        if rng.random() >= rate:
+            out.append(line)
+            continue
+        action = rng.random()
+        if action < 0.5:
+            words = line.split(" ")
+            for _ in range(max(1, len(words) // 5)):
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+            out.append(" ".join(words))
+        elif action < 0.75:
+            out += [line, "- " + " ".join(rng.choice(vocab) for _ in range(12))]
+        # else: line dropped
+    return "\n".join(out)
+
+
+def fill(store: DedupStore, n: int, batch: int = 20000, seed: int = 0):
+    """Bulk-load n random signatures; they collide with real ones only by chance."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, batch):
+        k = min(batch, n - start)
+        sigs = rng.integers(0, 2 ** 32, size=(k, store.hasher.num_perm), dtype=np.uint64).astype(np.uint32)
+        ids = [f"bg_{start + i}" for i in range(k)]
+        store.add_signatures(sigs, ids, [f"bg{start + i}" for i in range(k)])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate detection.")
+    ap.add_argument("--stored", type=int, default=100000, help="signatures in the store while querying")
+    ap.add_argument("--originals", type=int, default=200, help="real resumes stored before querying")
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--edits", type=float, nargs="+", default=[0.0, 0.05, 0.10, 0.20, 0.40])
+    ap.add_argument("--threshold", type=float, default=0.8)
+    ap.add_argument("--num-perm", type=int, default=128)
+    ap.add_argument("--db", help="store path (default: temp file)")
+    args = ap.parse_args(argv)
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DedupStore(args.db or os.path.join(tmp, "dedup.sqlite"), threshold=args.threshold,
+                           num_perm=args.num_perm)
+        originals = [synthetic_resume(rng, jobs=rng.randint(1, 5), bullets=rng.randint(3, 7))
+                     for _ in range(args.originals)]
+        t0 = time.perf_counter()
+        for i, text in enumerate(originals):
+            store.add(text, {"raw": text[:100]}, doc_id=f"orig_{i}")
+        add_ms = (time.perf_counter() - t0) * 1000 / len(originals)
+
+        t0 = time.perf_counter()
+        fill(store, max(0, args.stored - len(originals)))
+        fill_s = time.perf_counter() - t0
+
+        report = {"stored": len(store), "bands": store.bands, "rows": store.rows,
+                  "add_ms": round(add_ms, 3), "bulk_load_s": round(fill_s, 1), "edits": {}}
+        for rate in args.edits:
+            latencies, found, right = [], 0, 0
+            for q in range(args.queries):
+                i = rng.randrange(len(originals))
+                query = mutate(originals[i], rate, rng)
+                t = time.perf_counter()
+                match, kind, sim, _ = store.find(query)
+                latencies.append(time.perf_counter() - t)
+                if kind != "none":
+                    found += 1
+                    right += match["doc_id"] == f"orig_{i}"
+            lat = np.asarray(latencies) * 1000
+            report["edits"][str(rate)] = {
+                "detected": round(found / args.queries, 3),
+                "correct_match": round(right / found, 3) if found else 0.0,
+                "p50_ms": round(float(np.percentile(lat, 50)), 3),
+                "p95_ms": round(float(np.percentile(lat, 95)), 3),
+            }
+
+        # unrelated resumes should come back as new documents
+        fresh = [synthetic_resume(rng) for _ in range(args.queries)]
+        false_pos = sum(store.find(t)[1] != "none" for t in fresh)
+        report["false_positive_rate"] = round(false_pos / len(fresh), 4)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
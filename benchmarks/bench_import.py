@@ -0,0 +1,86 @@
+# benchmarks/bench_import.py
+"""
+Cold import time of the app modules, measured with `python -X importtime` in a fresh
+interpreter per module. Prints the cumulative time of each module and the heaviest
+imports it pulled in. With --check it exits non-zero when a module exceeds --max-ms or
+imports one of the heavy ML packages at load time, so it can run as a regression test:
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --check --max-ms 500
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import re
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+MODULES = ("app.config", "app.embeddings", "app.llm", "app.parsers", "app.scoring",
+           "app.batch", "app.cascade", "app.ingest", "app.warmup")
+
+# must only be imported when a model is first used
+HEAVY = ("torch", "transformers", "sentence_transformers", "spacy", "google.generativeai", "pdfminer")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(module, python=sys.executable):
+    """(cumulative µs of `module`, {name: cumulative µs} of everything it imported)."""
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    entries = []  # (name, cumulative_us, nesting depth), children listed before their parent
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            entries.append((m.group(4), int(m.group(2)), len(m.group(3))))
+    top = max(i for i, e in enumerate(entries) if e[0] == module)
+    depth = entries[top][2]
+    # imports made by interpreter startup (site, .pth hooks) precede the module's own subtree
+    cumulative = {}
+    for name, us, d in reversed(entries[:top]):
+        if d <= depth:
+            break
+        cumulative[name] = us
+    return entries[top][1], cumulative
+
+
+def report(modules, top):
+    rows = []
+    for module in modules:
+        total_us, cumulative = measure(module)
+        heavy = sorted(name for name in cumulative if name in HEAVY)
+        heaviest = sorted(((us, name) for name, us in cumulative.items() if "." not in name), reverse=True)[:top]
+        rows.append({
+            "module": module,
+            "ms": round(total_us / 1000, 1),
+            "heavy_imports": heavy,
+            "heaviest": [{"name": name, "ms": round(us / 1000, 1)} for us, name in heaviest],
+        })
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Import-time report for the app modules.")
+    ap.add_argument("modules", nargs="*", default=list(MODULES))
+    ap.add_argument("--top", type=int, default=5, help="heaviest top-level imports listed per module")
+    ap.add_argument("--check", action="store_true", help="fail on heavy imports or modules over --max-ms")
+    ap.add_argument("--max-ms", type=float, default=1000.0)
+    args = ap.parse_args(argv)
+
+    rows = report(args.modules, args.top)
+    print(json.dumps(rows, indent=2))
+    if args.check:
+        failures = [f"{r['module']}: imports {', '.join(r['heavy_imports'])}" for r in rows if r["heavy_imports"]]
+        failures += [f"{r['module']}: {r['ms']} ms > {args.max_ms} ms" for r in rows if r["ms"] > args.max_ms]
+        for failure in failures:
+            print(f"[FAIL] {failure}", file=sys.stderr)
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
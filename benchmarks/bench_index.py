@@ -0,0 +1,81 @@
+# benchmarks/bench_index.py
+"""
+Recall vs. latency of the IVF (approximate) mode of app.resume_index against exact search.
+Uses synthetic clustered unit vectors, so no embedding model is needed:
+
+    python benchmarks/bench_index.py --n 200000 --dim 384 --queries 100
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import time
+
+import numpy as np
+from app.resume_index import ResumeIndex
+
+
+def synthetic_vectors(n, dim, n_topics=200, noise=1.5, seed=0):
+    """Unit vectors scattered around `n_topics` centres, loosely mimicking sentence embeddings."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    topic = rng.integers(n_topics, size=n)
+    vecs = centres[topic] + noise * rng.standard_normal((n, dim)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs
+
+
+def run(n, dim, queries, top_k, n_lists, nprobes, noise=1.5, seed=0):
+    data = synthetic_vectors(n + queries, dim, noise=noise, seed=seed)
+    corpus, qs = data[:n], data[n:]
+
+    index = ResumeIndex(dim)
+    index.add([str(i) for i in range(n)], corpus)
+
+    t0 = time.perf_counter()
+    index.build_ivf(n_lists)
+    build_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    exact = [{r["id"] for r in index.search(q, top_k)} for q in qs]
+    exact_ms = (time.perf_counter() - t0) * 1000 / queries
+
+    rows = [{"mode": "exact", "nprobe": None, "recall": 1.0, "ms_per_query": exact_ms}]
+    for nprobe in nprobes:
+        t0 = time.perf_counter()
+        approx = [{r["id"] for r in index.search(q, top_k, nprobe=nprobe)} for q in qs]
+        ms = (time.perf_counter() - t0) * 1000 / queries
+        recall = float(np.mean([len(a & e) / len(e) for a, e in zip(approx, exact)]))
+        rows.append({"mode": "ivf", "nprobe": nprobe, "recall": recall, "ms_per_query": ms})
+    return {
+        "n": n, "dim": dim, "top_k": top_k, "n_lists": len(index.centroids),
+        "build_seconds": build_time, "results": rows,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--n", type=int, default=100000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--lists", type=int, default=None, help="IVF lists (default sqrt(n))")
+    ap.add_argument("--noise", type=float, default=1.5, help="spread around topic centres (higher = harder)")
+    ap.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    ap.add_argument("--json", help="also write results to this file")
+    args = ap.parse_args(argv)
+
+    report = run(args.n, args.dim, args.queries, args.top_k, args.lists, args.nprobe, noise=args.noise)
+    print(f"n={report['n']} dim={report['dim']} lists={report['n_lists']} "
+          f"build={report['build_seconds']:.2f}s top_k={report['top_k']}")
+    print(f"{'mode':<6} {'nprobe':>6} {'recall':>7} {'ms/query':>9}")
+    for r in report["results"]:
+        print(f"{r['mode']:<6} {str(r['nprobe'] or '-'):>6} {r['recall']:>7.3f} {r['ms_per_query']:>9.3f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
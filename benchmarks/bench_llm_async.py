@@ -0,0 +1,47 @@
+# benchmarks/bench_llm_async.py
+"""
+Concurrent Gemini scoring against the local stub server (benchmarks/gemini_stub.py):
+wall time for N resumes vs. the sequential estimate, plus retry/coalescing counts.
+
+    python benchmarks/bench_llm_async.py --resumes 500 --latency 0.5 --fail-rate 0.05
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+
+from app.llm_async import score_resumes
+from benchmarks.gemini_stub import start_stub
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--resumes", type=int, default=500)
+    ap.add_argument("--duplicates", type=float, default=0.1, help="fraction of resumes that repeat another")
+    ap.add_argument("--latency", type=float, default=0.5)
+    ap.add_argument("--fail-rate", type=float, default=0.05)
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--rate", type=float, default=200.0)
+    args = ap.parse_args(argv)
+
+    server, url, counter = start_stub(latency=args.latency, fail_rate=args.fail_rate)
+    n_unique = max(1, int(args.resumes * (1 - args.duplicates)))
+    resumes = [f"Resume {i % n_unique}: python engineer, {i % n_unique} years" for i in range(args.resumes)]
+
+    t0 = time.perf_counter()
+    results = score_resumes("Engineer", "python backend role", resumes, base_url=url,
+                            concurrency=args.concurrency, rate=args.rate, timeout=10, max_retries=5,
+                            backoff_base=0.05)
+    wall = time.perf_counter() - t0
+    server.shutdown()
+
+    ok = sum(1 for r in results if r["ok"])
+    print(f"resumes:            {len(resumes)} ({ok} ok)")
+    print(f"stub requests:      {counter['requests']}")
+    print(f"wall time:          {wall:.2f}s ({len(resumes) / wall:.1f} resumes/s)")
+    print(f"sequential approx.: {len(resumes) * args.latency:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
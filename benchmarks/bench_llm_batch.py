@@ -0,0 +1,52 @@
+# benchmarks/bench_llm_batch.py
+"""
+Local Flan-T5 scoring throughput (prompts/sec) for several batch sizes, with and
+without dynamic int8 quantization. Needs the model in the local HF cache:
+
+    python benchmarks/bench_llm_batch.py --prompts 32 --batch-sizes 1 4 8 16 --quantize
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import random
+import time
+
+from app.llm import build_local_prompt, generate_local_batch, warm_local_llm
+
+WORDS = ("python docker kubernetes designed built led migrated service pipeline team latency "
+         "customers platform data analysis sql aws react improved reduced launched").split()
+
+
+def synthetic_pairs(n, seed=0):
+    rng = random.Random(seed)
+    job = "Backend engineer: python, sql, docker, aws. Build and run data services."
+    pairs = []
+    for _ in range(n):
+        # varied lengths so length bucketing matters
+        words = rng.randint(40, 400)
+        pairs.append(("Backend Engineer", job, " ".join(rng.choice(WORDS) for _ in range(words))))
+    return pairs
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--prompts", type=int, default=32)
+    ap.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    ap.add_argument("--max-new-tokens", type=int, default=32)
+    ap.add_argument("--quantize", action="store_true", help="also measure the int8 model")
+    args = ap.parse_args(argv)
+
+    prompts = [build_local_prompt(*p) for p in synthetic_pairs(args.prompts)]
+    print(f"{'int8':<5} {'batch':>5} {'prompts/s':>10} {'s total':>8}")
+    for quantize in ([False, True] if args.quantize else [False]):
+        warm_local_llm(quantize=quantize, max_new_tokens=args.max_new_tokens)
+        for bs in args.batch_sizes:
+            t0 = time.perf_counter()
+            generate_local_batch(prompts, batch_size=bs, quantize=quantize, max_new_tokens=args.max_new_tokens)
+            elapsed = time.perf_counter() - t0
+            print(f"{str(quantize):<5} {bs:>5} {len(prompts) / elapsed:>10.2f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_onnx.py
+"""
+Eager torch vs. ONNX Runtime fp32 vs. ONNX Runtime int8 for the embedding model and the
+BERT NER pipeline on CPU: single-text latency (p50/p95), batched throughput and model load,
+plus the parity figures of each ONNX variant against torch:
+
+    python benchmarks/bench_onnx.py --texts 64
+    ONNX_INTRA_OP_THREADS=4 python benchmarks/bench_onnx.py --only embedding
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+from app.config import settings
+from benchmarks.corpus import synthetic_resume
+
+BACKENDS = ("torch", "onnx-fp32", "onnx-int8")
+
+
+def measure(fn: Callable, texts: List[str], batch: Callable) -> Dict[str, Any]:
+    fn(texts[:1])  # first call: lazy init, allocator warmup
+    lat = []
+    for t in texts:
+        t0 = time.perf_counter()
+        fn([t])
+        lat.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    batch(texts)
+    wall = time.perf_counter() - t0
+    lat_ms = np.asarray(lat) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(lat_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(lat_ms, 95)), 3),
+        "batch_throughput": round(len(texts) / wall, 2),  # texts per second
+    }
+
+
+def load_embedding(backend: str, model: str):
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model, device="cpu")
+    from app.onnx_backend import load_sentence_encoder
+    return load_sentence_encoder(model, backend.split("-")[1])
+
+
+def load_ner(backend: str, model: str):
+    if backend == "torch":
+        from transformers import pipeline
+        return pipeline("token-classification", model=model, aggregation_strategy="simple", device=-1)
+    from app.onnx_backend import load_token_classifier
+    return load_token_classifier(model, backend.split("-")[1])
+
+
+def bench_embedding(model: str, texts: List[str], batch_size: int) -> Dict[str, Any]:
+    report = {}
+    for backend in BACKENDS:
+        t0 = time.perf_counter()
+        enc = load_embedding(backend, model)
+        load = time.perf_counter() - t0
+        row = measure(lambda xs: enc.encode(xs, batch_size=batch_size, convert_to_numpy=True), texts,
+                      lambda xs: enc.encode(xs, batch_size=batch_size, convert_to_numpy=True))
+        row["load_s"] = round(load, 2)
+        report[backend] = row
+    return report
+
+
+def bench_ner(model: str, texts: List[str], batch_size: int) -> Dict[str, Any]:
+    report = {}
+    for backend in BACKENDS:
+        t0 = time.perf_counter()
+        clf = load_ner(backend, model)
+        load = time.perf_counter() - t0
+        # the NER input is windowed text, as extract_entities_with_bert_many feeds it
+        row = measure(lambda xs: clf(xs, batch_size=batch_size), texts, lambda xs: clf(xs, batch_size=batch_size))
+        row["load_s"] = round(load, 2)
+        report[backend] = row
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark torch vs ONNX Runtime fp32/int8 inference.")
+    ap.add_argument("--texts", type=int, default=64)
+    ap.add_argument("--words", type=int, default=120, help="approximate words per text")
+    ap.add_argument("--batch-size", type=int, default=settings.EMBED_BATCH_SIZE)
+    ap.add_argument("--embedding-model", default=settings.EMBEDDING_MODEL)
+    ap.add_argument("--ner-model", default=settings.BERT_NER_MODEL)
+    ap.add_argument("--only", choices=("embedding", "ner"))
+    ap.add_argument("--no-parity", action="store_true")
+    args = ap.parse_args(argv)
+
+    rng = random.Random(0)
+    texts = [" ".join(synthetic_resume(rng).split()[:args.words]) for _ in range(args.texts)]
+    report: Dict[str, Any] = {
+        "texts": len(texts),
+        "words": args.words,
+        "cpus": os.cpu_count(),
+        "intra_op_threads": settings.ONNX_INTRA_OP_THREADS,
+        "inter_op_threads": settings.ONNX_INTER_OP_THREADS,
+    }
+    if args.only in (None, "embedding"):
+        report["embedding"] = bench_embedding(args.embedding_model, texts, args.batch_size)
+    if args.only in (None, "ner"):
+        report["ner"] = bench_ner(args.ner_model, texts, settings.BERT_NER_BATCH_SIZE)
+    if not args.no_parity:
+        from app.onnx_backend import parity
+
+        report["parity"] = {v: parity(v, texts[:8], embedding_model=args.embedding_model, ner_model=args.ner_model)
+                            for v in ("fp32", "int8")}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_pdf.py
+"""
+PDF text extraction: compares every installed backend (pymupdf, pypdfium2, pdfminer), reading
+whole documents vs. stopping at the PDF_MAX_CHARS budget. Fixtures are generated multi-page
+resumes unless --dir points at real PDFs:
+
+    python benchmarks/bench_pdf.py --docs 20 --pages 6
+    python benchmarks/bench_pdf.py --dir ~/resume_pdfs
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import random
+import time
+
+from app.config import settings
+from app.parsers import available_pdf_backends, extract_pdf_text_budget
+from benchmarks.pdfgen import make_pdf
+
+WORDS = ("python docker kubernetes designed built led migrated service pipeline team latency "
+         "customers platform data analysis sql aws react improved reduced launched").split()
+
+
+def synthetic_pdfs(n_docs, pages, lines_per_page=50, seed=0):
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(n_docs):
+        doc_pages = [[" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines_per_page)]
+                     for _ in range(pages)]
+        docs.append(make_pdf(doc_pages))
+    return docs
+
+
+def load_dir(path):
+    docs = []
+    for name in sorted(os.listdir(path)):
+        if name.lower().endswith(".pdf"):
+            with open(os.path.join(path, name), "rb") as f:
+                docs.append(f.read())
+    return docs
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dir", help="directory of fixture PDFs (default: generate synthetic ones)")
+    ap.add_argument("--docs", type=int, default=20)
+    ap.add_argument("--pages", type=int, default=6)
+    ap.add_argument("--budget", type=int, default=settings.PDF_MAX_CHARS)
+    args = ap.parse_args(argv)
+
+    docs = load_dir(args.dir) if args.dir else synthetic_pdfs(args.docs, args.pages)
+    print(f"{len(docs)} PDFs, budget {args.budget} chars")
+    print(f"{'backend':<10} {'mode':<7} {'ms/doc':>9} {'chars/doc':>10}")
+    for backend in available_pdf_backends():
+        for mode, budget in (("full", 0), ("budget", args.budget)):
+            t0 = time.perf_counter()
+            chars = sum(len(extract_pdf_text_budget(d, budget, backend)) for d in docs)
+            ms = (time.perf_counter() - t0) * 1000 / len(docs)
+            print(f"{backend:<10} {mode:<7} {ms:>9.1f} {chars // len(docs):>10}")
+
+
+if __name__ == "__main__":
+    main()
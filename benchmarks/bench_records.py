@@ -0,0 +1,144 @@
+# benchmarks/bench_records.py
+"""
+Memory of N parsed resumes held as parse_resume dicts vs. app.records.CompactRecord, and
+the on-disk side: JSONL (what ingest writes) vs. the memory-mapped RecordStore.
+Records are synthetic resumes with parse_resume-shaped output (sections, contact fields,
+taxonomy skills and BERT-like entities); --parse runs the real parser instead:
+
+    python benchmarks/bench_records.py --n 20000
+    python benchmarks/bench_records.py --n 500 --parse
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import gc
+import json
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from app import parsers, skills as skills_module
+from app.records import RecordStore, compact, write_records
+from benchmarks.corpus import COMPANIES, FIRST, LAST, ROLES, SCHOOLS, synthetic_resume
+
+
+def synthetic_record(text: str, rng: random.Random) -> Dict[str, Any]:
+    """parse_resume-shaped dict without the models: entities are the generator's names/companies."""
+    entities = []
+    for label, words in (("PER", FIRST + LAST), ("ORG", COMPANIES + SCHOOLS), ("MISC", ROLES)):
+        for w in words:
+            start = text.find(w)
+            while start >= 0:
+                entities.append({"label": label, "text": w, "score": rng.uniform(0.6, 1.0),
+                                 "start": start, "end": start + len(w)})
+                start = text.find(w, start + len(w))
+    entities.sort(key=lambda e: e["start"])
+    email = parsers.EMAIL_RE.search(text)
+    phone = parsers.PHONE_RE.search(text)
+    return {
+        "raw": text[:20000],
+        "basic": {"names": [text.split("\n", 1)[0]], "orgs": [c for c in COMPANIES if c in text],
+                  "email": email.group(0) if email else None, "phone": phone.group(0) if phone else None},
+        "sections": parsers.extract_sections(text),
+        "bert_entities": entities,
+        "skills": _alias_skills(text.lower()),
+    }
+
+
+def _alias_skills(lower: str) -> List[Dict[str, Any]]:
+    """Same shape as the taxonomy matcher's output, via a plain word scan (the matcher is not what's measured)."""
+    words = set(re.findall(r"[a-z0-9+#.\-]+", lower))
+    found = []
+    for canonical, aliases in skills_module.SKILLS.items():
+        hit = next((a for a in aliases if a in words or (" " in a and a in lower)), None)
+        if hit:
+            found.append({"skill": canonical, "match": hit, "confidence": 1.0})
+    return found
+
+
+def traced(build: Callable[[], List[Any]]):
+    """(result, bytes still allocated by it, peak bytes) under tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Memory benchmark: parse_resume dicts vs compact records.")
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--parse", action="store_true", help="use parsers.parse_resume (needs the spaCy/BERT models)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    def records():
+        # regenerated for every measurement so each one owns its texts
+        rng = random.Random(args.seed)
+        for i in range(args.n):
+            text = synthetic_resume(rng, jobs=rng.randint(1, 6), bullets=rng.randint(3, 8))
+            if args.parse:
+                yield text, parsers.parse_resume(parsers.ResumeDoc(text))
+            else:
+                yield text, synthetic_record(text, rng)
+
+    # warm the matcher / vocabularies outside the measured region
+    for _ in zip(range(3), records()):
+        pass
+    dicts, dict_bytes, _ = traced(lambda: [rec for _, rec in records()])
+    compacts, compact_bytes, compact_peak = traced(lambda: [compact(rec, text) for text, rec in records()])
+    entities = sum(len(d["bert_entities"]) for d in dicts)
+    report = {
+        "records": args.n,
+        "entities_per_record": round(entities / args.n, 1),
+        "dict_bytes": dict_bytes,
+        "compact_bytes": compact_bytes,
+        "dict_bytes_per_record": dict_bytes // args.n,
+        "compact_bytes_per_record": compact_bytes // args.n,
+        "reduction": round(dict_bytes / compact_bytes, 2),
+        "compact_peak_bytes": compact_peak,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = os.path.join(tmp, "records.jsonl")
+        with open(jsonl, "w", encoding="utf-8") as f:
+            for i, d in enumerate(dicts):
+                f.write(json.dumps({"id": str(i), **d}, ensure_ascii=False) + "\n")
+        store_dir = os.path.join(tmp, "store")
+        write_records(store_dir, ((str(i), c) for i, c in enumerate(compacts)))
+        del dicts, compacts
+        report["jsonl_disk_bytes"] = os.path.getsize(jsonl)
+        report["store_disk_bytes"] = dir_size(store_dir)
+
+        gc.collect()
+        t0 = time.perf_counter()
+        with open(jsonl, "r", encoding="utf-8") as f:
+            loaded = [json.loads(line) for line in f]
+        report["jsonl_load_s"] = round(time.perf_counter() - t0, 3)
+        del loaded
+
+        t0 = time.perf_counter()
+        store, store_open_bytes, _ = traced(lambda: RecordStore(store_dir))
+        report["store_open_s"] = round(time.perf_counter() - t0, 3)
+        report["store_open_heap_bytes"] = store_open_bytes  # ids + offsets maps; columns stay on disk
+        rows = random.Random(1).sample(range(len(store)), min(1000, len(store)))
+        t0 = time.perf_counter()
+        for r in rows:
+            store[r]
+        report["store_get_us"] = round((time.perf_counter() - t0) / len(rows) * 1e6, 1)
+        del store
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_skill_index.py
+"""
+Boolean skill queries on the bitmap index (app.skill_index) against a linear scan over
+per-resume skill lists, which is what filtering parsed records costs without an index:
+
+    python benchmarks/bench_skill_index.py --n 1000000
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import tempfile
+import time
+
+import numpy as np
+from app.skill_index import SkillIndex
+from app.skills import SKILLS
+
+QUERIES = (
+    ("Kubernetes AND Python AND NOT Java",
+     lambda s: "Kubernetes" in s and "Python" in s and "Java" not in s),
+    ("(Cloud Computing OR Docker) AND SQL",
+     lambda s: ("Cloud Computing" in s or "Docker" in s) and "SQL" in s),
+    ("NOT (Java OR C++)",
+     lambda s: "Java" not in s and "C++" not in s),
+)
+
+
+def synthetic_skills(n: int, rng: np.random.Generator):
+    names = np.array(sorted(SKILLS))
+    popularity = rng.dirichlet(np.ones(len(names)) * 0.7)
+    counts = rng.integers(2, 9, size=n)
+    return [set(names[rng.choice(len(names), k, replace=False, p=popularity)]) for k in counts]
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the bitmap skill index.")
+    ap.add_argument("--n", type=int, default=200000, help="resumes in the index")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    skills = synthetic_skills(args.n, rng)
+    ids = [f"r{i}" for i in range(args.n)]
+
+    t0 = time.perf_counter()
+    index = SkillIndex()
+    index.add(ids, skills)
+    build_s = time.perf_counter() - t0
+
+    report = {"n": args.n, "build_s": round(build_s, 2), "queries": {}}
+    for expr, scan in QUERIES:
+        hits = index.count(expr)
+        assert hits == sum(1 for s in skills if scan(s)), expr
+        report["queries"][expr] = {
+            "matches": hits,
+            "bitmap_ms": round(best_of(lambda: index.query(expr)), 3),
+            "bitmap_ids_ms": round(best_of(lambda: index.ids(expr)), 3),
+            "scan_ms": round(best_of(lambda: [i for i, s in zip(ids, skills) if scan(s)], 2), 3),
+        }
+    report["counts_ms"] = round(best_of(index.counts), 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        index.save(tmp)
+        report["save_s"] = round(time.perf_counter() - t0, 3)
+        report["bitmap_bytes"] = os.path.getsize(os.path.join(tmp, "bitmaps.npy"))
+        t0 = time.perf_counter()
+        loaded = SkillIndex.load(tmp)
+        report["load_mmap_s"] = round(time.perf_counter() - t0, 3)
+        report["mmap_query_ms"] = round(best_of(lambda: loaded.query(QUERIES[0][0])), 3)
+        del loaded
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_skills.py
+"""
+Skill matching throughput: the compiled, cached PhraseMatcher in app.parsers versus
+rebuilding the matcher (with full-pipeline patterns) for every resume, as was done before.
+Taxonomies are synthetic so the scale can go well past app.skills.SKILLS:
+
+    python benchmarks/bench_skills.py --skills 10000 --aliases 3 --docs 200
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import random
+import time
+
+from spacy.matcher import PhraseMatcher
+from app import parsers
+from app.skills import SKILLS
+
+
+def synthetic_taxonomy(n_skills, aliases, seed=0):
+    rng = random.Random(seed)
+    taxonomy = {k: list(v) for k, v in SKILLS.items()}
+    syllables = ["ka", "zo", "ri", "tex", "lon", "py", "net", "flux", "dra", "qu", "vi", "sor"]
+    i = 0
+    while len(taxonomy) < n_skills:
+        name = "".join(rng.choice(syllables) for _ in range(3)) + str(i)
+        taxonomy[name.title()] = [name] + [f"{name} {rng.choice(syllables)}" for _ in range(aliases - 1)]
+        i += 1
+    return taxonomy
+
+
+def synthetic_resumes(taxonomy, n_docs, words=600, seed=0):
+    rng = random.Random(seed)
+    aliases = [a for variations in taxonomy.values() for a in variations]
+    filler = "designed built shipped maintained team project data service users platform".split()
+    docs = []
+    for _ in range(n_docs):
+        toks = [rng.choice(aliases) if rng.random() < 0.05 else rng.choice(filler) for _ in range(words)]
+        docs.append(" ".join(toks))
+    return docs
+
+
+def rebuild_per_call(text, taxonomy):
+    """The original implementation: new matcher and nlp() on every alias and on the resume."""
+    nlp = parsers.get_spacy()
+    matcher = PhraseMatcher(nlp.vocab)
+    for canonical, variations in taxonomy.items():
+        matcher.add(canonical, [nlp(v) for v in variations])
+    return matcher(nlp(text))
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--skills", type=int, default=10000)
+    ap.add_argument("--aliases", type=int, default=3)
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--baseline-docs", type=int, default=3, help="docs to time the rebuild-per-call baseline on")
+    args = ap.parse_args(argv)
+
+    taxonomy = synthetic_taxonomy(args.skills, args.aliases)
+    docs = synthetic_resumes(taxonomy, args.docs)
+    n_aliases = sum(len(v) for v in taxonomy.values())
+    print(f"taxonomy: {len(taxonomy)} skills / {n_aliases} aliases, {len(docs)} resumes")
+
+    compile_s = timed(lambda: parsers.get_skill_matcher(taxonomy))
+    single_s = timed(lambda: [parsers.extract_skills_from_taxonomy(d, taxonomy) for d in docs])
+    piped_s = timed(lambda: parsers.extract_skills_from_texts(docs, taxonomy))
+    base_docs = docs[:args.baseline_docs]
+    base_s = timed(lambda: [rebuild_per_call(d, taxonomy) for d in base_docs])
+
+    print(f"compile matcher once:        {compile_s * 1000:9.1f} ms")
+    print(f"cached matcher, per resume:  {single_s * 1000 / len(docs):9.2f} ms")
+    print(f"cached matcher, nlp.pipe:    {piped_s * 1000 / len(docs):9.2f} ms")
+    print(f"rebuild per call (baseline): {base_s * 1000 / len(base_docs):9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
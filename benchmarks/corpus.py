@@ -0,0 +1,129 @@
+# benchmarks/corpus.py
+"""
+Offline generator of synthetic resumes and job descriptions for the benchmark suite.
+Resumes are written as .txt and, optionally, as PDF variants of the same text:
+
+    python benchmarks/corpus.py --out /tmp/corpus --resumes 500 --jobs 10
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import random
+import textwrap
+from typing import Dict, List
+
+from app.skills import SKILLS
+from benchmarks.pdfgen import make_pdf
+
+FIRST = ("Alex", "Maria", "Wei", "Priya", "John", "Fatima", "Lucas", "Aiko", "Omar", "Sara", "Dmitri", "Chloe")
+LAST = ("Smith", "Garcia", "Chen", "Patel", "Okafor", "Nguyen", "Rossi", "Kim", "Haddad", "Novak", "Silva", "Brown")
+COMPANIES = ("Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises",
+             "Hooli", "Vandelay Imports", "Cyberdyne Systems", "Soylent Inc")
+ROLES = ("Software Engineer", "Data Scientist", "Backend Developer", "ML Engineer", "DevOps Engineer",
+         "Full Stack Developer", "Data Analyst", "Platform Engineer")
+SCHOOLS = ("State University", "Institute of Technology", "City College", "National University")
+VERBS = ("Built", "Designed", "Led", "Maintained", "Migrated", "Optimized", "Shipped", "Automated", "Scaled")
+OBJECTS = ("a data pipeline", "the billing service", "an internal dashboard", "the search backend",
+           "a recommendation model", "CI/CD workflows", "REST APIs", "the event ingestion layer")
+OUTCOMES = ("cutting latency by {n}%", "serving {n}k daily users", "reducing costs by {n}%",
+            "improving accuracy by {n} points", "with a team of {n} engineers")
+
+PAGE_LINES = 55
+LINE_CHARS = 95
+
+
+def _skills(rng: random.Random, k: int) -> List[str]:
+    names = rng.sample(sorted(SKILLS), k)
+    # mention skills by one of their aliases, as real resumes do
+    return [rng.choice(SKILLS[n]) if rng.random() < 0.5 else n for n in names]
+
+
+def _bullet(rng: random.Random, skills: List[str]) -> str:
+    return (f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} and {rng.choice(skills)}, "
+            f"{rng.choice(OUTCOMES).format(n=rng.randint(2, 60))}.")
+
+
+def synthetic_resume(rng: random.Random, jobs: int = 3, bullets: int = 5) -> str:
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+    skills = _skills(rng, rng.randint(5, 10))
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience in {', '.join(skills[:3])}.",
+        "",
+        "Experience",
+    ]
+    for _ in range(jobs):
+        lines.append(f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)} ({rng.randint(2008, 2020)} - {rng.randint(2021, 2025)})")
+        lines += [f"- {_bullet(rng, skills)}" for _ in range(bullets)]
+    lines += ["", "Projects"]
+    lines += [f"- {_bullet(rng, skills)}" for _ in range(max(1, bullets // 2))]
+    lines += ["", "Education", f"BSc Computer Science, {rng.choice(SCHOOLS)}, {rng.randint(2005, 2020)}",
+              "", "Skills", ", ".join(skills)]
+    return "\n".join(lines)
+
+
+def synthetic_job(rng: random.Random) -> Dict[str, str]:
+    role = rng.choice(ROLES)
+    must, nice = _skills(rng, 4), _skills(rng, 2)
+    desc = (f"We are looking for a {role} to join {rng.choice(COMPANIES)}. You will {rng.choice(VERBS).lower()} "
+            f"{rng.choice(OBJECTS)} and work closely with product teams. Requirements: {', '.join(must)}. "
+            f"Nice to have: {', '.join(nice)}. {rng.randint(2, 8)}+ years of experience.")
+    return {"title": role, "description": desc}
+
+
+def text_to_pdf(text: str) -> bytes:
+    lines = []
+    for line in text.splitlines():
+        lines += textwrap.wrap(line, LINE_CHARS) or [""]
+    pages = [lines[i:i + PAGE_LINES] for i in range(0, len(lines), PAGE_LINES)] or [[""]]
+    return make_pdf(pages)
+
+
+def generate(out: str, n_resumes: int, n_jobs: int, pdf: bool = True, seed: int = 0,
+             min_jobs: int = 1, max_jobs: int = 5) -> Dict:
+    """Write resumes/, jobs/ and manifest.json under `out`; returns the manifest."""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out, "resumes"), exist_ok=True)
+    os.makedirs(os.path.join(out, "jobs"), exist_ok=True)
+    manifest = {"seed": seed, "resumes": [], "jobs": []}
+    for i in range(n_resumes):
+        text = synthetic_resume(rng, jobs=rng.randint(min_jobs, max_jobs), bullets=rng.randint(3, 7))
+        rid = f"resume_{i:06d}"
+        with open(os.path.join(out, "resumes", f"{rid}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+        entry = {"id": rid, "txt": f"resumes/{rid}.txt"}
+        if pdf:
+            with open(os.path.join(out, "resumes", f"{rid}.pdf"), "wb") as f:
+                f.write(text_to_pdf(text))
+            entry["pdf"] = f"resumes/{rid}.pdf"
+        manifest["resumes"].append(entry)
+    for i in range(n_jobs):
+        job = synthetic_job(rng)
+        jid = f"job_{i:04d}"
+        with open(os.path.join(out, "jobs", f"{jid}.json"), "w", encoding="utf-8") as f:
+            json.dump(job, f)
+        manifest["jobs"].append({"id": jid, "path": f"jobs/{jid}.json"})
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate a synthetic resume / job description corpus.")
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--resumes", type=int, default=200)
+    ap.add_argument("--jobs", type=int, default=5)
+    ap.add_argument("--no-pdf", action="store_true", help="only write .txt resumes")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    manifest = generate(args.out, args.resumes, args.jobs, pdf=not args.no_pdf, seed=args.seed)
+    print(f"wrote {len(manifest['resumes'])} resumes and {len(manifest['jobs'])} jobs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
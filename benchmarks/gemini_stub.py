@@ -0,0 +1,72 @@
+# benchmarks/gemini_stub.py
+"""
+Local stand-in for the Gemini generateContent REST endpoint, for exercising
+app.llm_async without network access or API quota:
+
+    python benchmarks/gemini_stub.py --port 8765 --latency 0.5 --fail-rate 0.1
+    GEMINI_BASE_URL=http://127.0.0.1:8765 ...
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(latency: float, fail_rate: float, counter: dict):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            with counter["lock"]:
+                counter["requests"] += 1
+            time.sleep(latency)
+            if ":generateContent" not in self.path:
+                self.send_error(404)
+                return
+            if random.random() < fail_rate:
+                self.send_error(503, "stub overloaded")
+                return
+            prompt = body["contents"][0]["parts"][0]["text"]
+            score = 1 + len(prompt) % 10
+            text = json.dumps({"score": score, "justification": "stub response"})
+            payload = json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_stub(port: int = 0, latency: float = 0.2, fail_rate: float = 0.0):
+    """Run the stub in a background thread; returns (server, base_url, counter)."""
+    counter = {"requests": 0, "lock": threading.Lock()}
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency, fail_rate, counter))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", counter
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.2)
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    args = ap.parse_args(argv)
+    server, url, _ = start_stub(args.port, args.latency, args.fail_rate)
+    print(f"Gemini stub listening on {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
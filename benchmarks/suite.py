@@ -0,0 +1,245 @@
+# benchmarks/suite.py
+"""
+End-to-end benchmark suite: throughput and p50/p95 latency for every pipeline stage on a
+synthetic corpus (see benchmarks/corpus.py), on CPU with locally cached models only.
+
+    python benchmarks/suite.py run --resumes 200 --jobs 5 --out results.json
+    python benchmarks/suite.py run --corpus /tmp/corpus --stages extract_pdf embed_batch
+    python benchmarks/suite.py compare baseline.json results.json --tolerance 0.15
+
+`compare` exits with status 1 when a stage got slower (p50/p95 up, or throughput down)
+by more than the tolerance, so it can gate CI.
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# measure the pipeline itself: no network, no result caches
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+os.environ.setdefault("EMBED_CACHE_ENABLED", "0")
+os.environ.setdefault("SCORE_CACHE_ENABLED", "0")
+os.environ.setdefault("LLM_MODE", "LOCAL")
+
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from app.config import settings
+from benchmarks.corpus import generate
+
+STAGES = ("extract_txt", "extract_pdf", "spacy_fields", "skill_matching", "bert_ner",
+          "embed_single", "embed_batch", "cosine_rank", "llm_score")
+
+
+def summarize(latencies: Sequence[float], items: int, wall: float, load: float = 0.0) -> Dict[str, Any]:
+    lat = np.asarray(latencies) * 1000
+    return {
+        "calls": len(lat),
+        "items": items,
+        "throughput": round(items / wall, 3) if wall > 0 else 0.0,  # items per second
+        "p50_ms": round(float(np.percentile(lat, 50)), 3),
+        "p95_ms": round(float(np.percentile(lat, 95)), 3),
+        "mean_ms": round(float(lat.mean()), 3),
+        "load_s": round(load, 3),
+    }
+
+
+def time_calls(fn: Callable, args_list: Sequence[Any], items_per_call: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+    """Run fn once untimed (model load, first-call overhead), then time every call."""
+    t0 = time.perf_counter()
+    fn(args_list[0])
+    load = time.perf_counter() - t0
+    latencies = []
+    wall0 = time.perf_counter()
+    for a in args_list:
+        t = time.perf_counter()
+        fn(a)
+        latencies.append(time.perf_counter() - t)
+    wall = time.perf_counter() - wall0
+    items = sum(items_per_call) if items_per_call else len(args_list)
+    return summarize(latencies, items, wall, load)
+
+
+def load_corpus(path: str) -> Dict[str, Any]:
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    corpus = {"txt": [], "pdf": [], "jobs": []}
+    for r in manifest["resumes"]:
+        with open(os.path.join(path, r["txt"]), "rb") as f:
+            corpus["txt"].append(f.read())
+        if "pdf" in r:
+            with open(os.path.join(path, r["pdf"]), "rb") as f:
+                corpus["pdf"].append(f.read())
+    for j in manifest["jobs"]:
+        with open(os.path.join(path, j["path"]), "r", encoding="utf-8") as f:
+            corpus["jobs"].append(json.load(f))
+    corpus["texts"] = [b.decode("utf-8") for b in corpus["txt"]]
+    return corpus
+
+
+def run_stage(name: str, corpus: Dict[str, Any], llm_n: int) -> Dict[str, Any]:
+    from app import parsers, skills as skills_module
+
+    texts, jobs = corpus["texts"], corpus["jobs"]
+    if name == "extract_txt":
+        return time_calls(lambda b: parsers.extract_text_from_bytes(b, "r.txt"), corpus["txt"])
+    if name == "extract_pdf":
+        if not corpus["pdf"]:
+            raise RuntimeError("corpus has no PDF variants")
+        return time_calls(lambda b: parsers.extract_text_from_bytes(b, "r.pdf"), corpus["pdf"])
+    if name == "spacy_fields":
+        return time_calls(lambda t: parsers.extract_basic_fields(t), texts)
+    if name == "skill_matching":
+        return time_calls(lambda t: parsers.extract_skills_from_taxonomy(t, skills_module.SKILLS), texts)
+    if name == "bert_ner":
+        if parsers.get_token_classifier() is None:
+            raise RuntimeError(f"token classifier '{settings.BERT_NER_MODEL}' is not available locally")
+        return time_calls(parsers.extract_entities_with_bert, texts)
+    if name == "embed_single":
+        from app.embeddings import embed_text
+        return time_calls(embed_text, texts)
+    if name == "embed_batch":
+        from app.embeddings import embed_list
+        size = settings.EMBED_BATCH_SIZE
+        batches = [texts[i:i + size] for i in range(0, len(texts), size)]
+        return time_calls(embed_list, batches, [len(b) for b in batches])
+    if name == "cosine_rank":
+        from app.embeddings import embed_list, embed_text
+        from app.resume_index import ResumeIndex
+
+        matrix = embed_list(texts)
+        index = ResumeIndex(matrix.shape[1])
+        index.add([str(i) for i in range(len(texts))], matrix)
+        # query = embed the job description, then one matmul + top-k over the pool
+        return time_calls(lambda job: index.search(embed_text(job["description"]), 10), jobs)
+    if name == "llm_score":
+        from app.llm import get_score_with_llm
+
+        pairs = [(jobs[i % len(jobs)], texts[i]) for i in range(min(llm_n, len(texts)))]
+
+        def score(pair):
+            res = get_score_with_llm(pair[0]["title"], pair[0]["description"], pair[1])
+            if not res.get("ok"):
+                raise RuntimeError(res.get("error"))
+        return time_calls(score, pairs)
+    raise ValueError(f"unknown stage: {name}")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def run_suite(corpus_dir: Optional[str], n_resumes: int, n_jobs: int, stages: Sequence[str],
+              llm_n: int, seed: int = 0) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        if corpus_dir is None:
+            corpus_dir = tmp
+            generate(corpus_dir, n_resumes, n_jobs, pdf="extract_pdf" in stages, seed=seed)
+        corpus = load_corpus(corpus_dir)
+
+    results: Dict[str, Any] = {}
+    for name in stages:
+        try:
+            results[name] = run_stage(name, corpus, llm_n)
+        except Exception as e:
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+        print(f"[suite] {name}: {results[name]}", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "resumes": len(corpus["texts"]),
+            "jobs": len(corpus["jobs"]),
+            "embedding_model": settings.EMBEDDING_MODEL,
+            "llm_model": settings.LLM_MODEL,
+            "ner_model": settings.BERT_NER_MODEL,
+            "spacy_model": settings.SPACY_MODEL,
+            "pdf_backend": settings.PDF_BACKEND,
+        },
+        "stages": results,
+    }
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Per-stage relative change; `regression` is set when a stage got worse beyond `tolerance`,
+    or when a stage measured in `base` was skipped (it failed) or is missing in `new`.
+    """
+    rows = []
+    for name, b in base["stages"].items():
+        if "skipped" in b:
+            continue
+        n = new["stages"].get(name)
+        if n is None or "skipped" in n:
+            rows.append({"stage": name, "regression": True,
+                         "missing": f"skipped: {n['skipped']}" if n else "not run"})
+            continue
+        row = {"stage": name, "regression": False}
+        for key, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("throughput", False)):
+            if b[key] == 0:
+                continue
+            change = (n[key] - b[key]) / b[key]
+            row[key] = {"base": b[key], "new": n[key], "change": round(change, 3)}
+            worse = change > tolerance if higher_is_worse else change < -tolerance
+            row["regression"] = row["regression"] or worse
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pipeline benchmark suite.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="benchmark the stages and write JSON results")
+    run.add_argument("--corpus", help="existing corpus directory (default: generate one in a temp dir)")
+    run.add_argument("--resumes", type=int, default=200)
+    run.add_argument("--jobs", type=int, default=5)
+    run.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    run.add_argument("--llm-n", type=int, default=10, help="resumes scored by the local LLM")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--out", help="results file (default: stdout)")
+
+    cmp_ = sub.add_parser("compare", help="compare two result files and flag regressions")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "run":
+        report = run_suite(args.corpus, args.resumes, args.jobs, args.stages, args.llm_n, args.seed)
+        text = json.dumps(report, indent=2)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            print(text)
+        return
+
+    with open(args.base, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    rows = compare(base, new, args.tolerance)
+    for r in rows:
+        flag = "REGRESSION" if r.get("regression") else "ok"
+        parts = [f"{k} {v['base']} -> {v['new']} ({v['change']:+.1%})" for k, v in r.items() if isinstance(v, dict)]
+        if "missing" in r:
+            parts.append(r["missing"])
+        print(f"{flag:<10} {r['stage']:<15} " + ", ".join(parts))
+    sys.exit(1 if any(r.get("regression") for r in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# tests/test_benchmark_compare.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+
+import pytest
+
+from benchmarks.suite import compare, main
+
+
+def _stage(p50, p95, throughput):
+    return {"calls": 10, "items": 10, "throughput": throughput, "p50_ms": p50, "p95_ms": p95}
+
+
+BASE = {"stages": {
+    "parse": _stage(10.0, 20.0, 100.0),
+    "embed": _stage(5.0, 8.0, 200.0),
+    "rank": _stage(1.0, 2.0, 1000.0),
+    "llm": {"skipped": "no local model"},
+}}
+
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    new = {"stages": {
+        "parse": _stage(10.5, 21.0, 98.0),    # within 10%
+        "embed": _stage(5.0, 8.0, 150.0),     # throughput dropped 25%
+        "rank": _stage(1.0, 2.5, 1000.0),     # p95 up 25%
+    }}
+    rows = {r["stage"]: r for r in compare(BASE, new, tolerance=0.10)}
+    assert not rows["parse"]["regression"]
+    assert rows["embed"]["regression"] and rows["embed"]["throughput"]["change"] == -0.25
+    assert rows["rank"]["regression"] and rows["rank"]["p95_ms"]["change"] == 0.25
+    assert "llm" not in rows  # skipped in the baseline: nothing to compare against
+
+
+def test_compare_flags_skipped_and_missing_stages():
+    new = {"stages": {
+        "parse": {"skipped": "ImportError: fitz"},
+        "embed": _stage(5.0, 8.0, 200.0),
+        "llm": _stage(100.0, 200.0, 1.0),
+    }}
+    rows = {r["stage"]: r for r in compare(BASE, new, tolerance=0.10)}
+    assert rows["parse"] == {"stage": "parse", "regression": True, "missing": "skipped: ImportError: fitz"}
+    assert rows["rank"] == {"stage": "rank", "regression": True, "missing": "not run"}
+    assert not rows["embed"]["regression"]
+
+
+def test_compare_cli_exits_nonzero_on_missing_stage(tmp_path, capsys):
+    base, new = tmp_path / "base.json", tmp_path / "new.json"
+    base.write_text(json.dumps(BASE))
+    new.write_text(json.dumps({"stages": {k: v for k, v in BASE["stages"].items() if k != "rank"}}))
+    with pytest.raises(SystemExit) as exc:
+        main(["compare", str(base), str(new)])
+    assert exc.value.code == 1
+    assert "not run" in capsys.readouterr().out
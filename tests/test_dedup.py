@@ -0,0 +1,72 @@
+# tests/test_dedup.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from app import dedup
+from app.dedup import DedupStore, _realign_entities, lookup
+
+RESUME = ("Jane Doe senior backend engineer with eight years of Python Django and PostgreSQL experience "
+          "building payment APIs at Acme Corp, leading a team of five, migrating services to Kubernetes "
+          "on AWS and cutting p99 latency by forty percent across the checkout platform")
+EDITED = RESUME + " and mentoring interns"
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = DedupStore(str(tmp_path / "dedup.sqlite"))
+    yield s
+    s._conn.close()
+
+
+def test_find_exact_vs_near(store):
+    store.add(RESUME, {"raw": RESUME}, doc_id="r1")
+    match, kind, sim, _ = store.find(RESUME)
+    assert (match["doc_id"], kind, sim) == ("r1", "exact", 1.0)
+    # same normalized text, different layout: not byte-identical, so the stored offsets don't apply
+    _, kind, sim, _ = store.find(RESUME.upper().replace(" ", "\n", 3))
+    assert (kind, sim) == ("near", 1.0)
+    match, kind, sim, _ = store.find(EDITED)
+    assert match["doc_id"] == "r1" and kind == "near" and store.threshold <= sim < 1.0
+    assert store.find("completely different text about gardening " * 5)[1] == "none"
+
+
+def test_short_texts_never_match(store):
+    store.add("python engineer", {"raw": "python engineer"})
+    assert store.find("python engineer")[1] == "none"
+
+
+def test_lookup_reuses_exact_and_stores_near(store, monkeypatch):
+    emb = np.arange(4, dtype=np.float32)
+    dedup.remember(RESUME, store, {"raw": RESUME, "bert_entities": []}, emb, seconds=1.0, doc_id="r1")
+
+    hit = lookup(RESUME, store)
+    assert hit["dedup"] == {"kind": "exact", "similarity": 1.0, "of": "r1"}
+    assert hit["record"]["raw"] == RESUME
+    np.testing.assert_array_equal(hit["embedding"], emb)
+
+    monkeypatch.setattr(dedup, "reparse_near_duplicate", lambda text, stored: {"raw": text, "patched": True})
+    hit = lookup(EDITED, store, doc_id="r2")
+    assert hit["dedup"]["kind"] == "near" and hit["record"]["patched"]
+    assert len(store) == 2
+    assert store.find(EDITED)[1] == "exact"  # the patched parse was stored under the edited copy
+
+    assert lookup("new resume text " * 10, store)["record"] is None
+    report = store.report()
+    assert (report["seen"], report["exact"], report["near"], report["unique"]) == (3, 1, 1, 1)
+
+
+def test_realign_entities():
+    entities = [
+        {"text": "Acme", "label": "ORG", "start": 10, "end": 14},      # still in place
+        {"text": "Python", "label": "SKILL", "start": 0, "end": 6},    # moved
+        {"text": "Globex", "label": "ORG", "start": 30, "end": 36},    # edited out
+    ]
+    text = "Worked at Acme writing Python"
+    assert _realign_entities(entities, text) == [
+        {"text": "Acme", "label": "ORG", "start": 10, "end": 14},
+        {"text": "Python", "label": "SKILL", "start": 23, "end": 29},
+    ]
+    assert _realign_entities(None, text) == []
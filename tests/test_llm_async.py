@@ -0,0 +1,69 @@
+# tests/test_llm_async.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+import pytest
+
+from app import llm, llm_async
+from app.llm_async import AsyncGeminiClient, generate_blocking, score_resumes
+from benchmarks.gemini_stub import start_stub
+
+
+@pytest.fixture
+def stub():
+    started = []
+
+    def start(latency=0.0, fail_rate=0.0):
+        server, url, counter = start_stub(latency=latency, fail_rate=fail_rate)
+        started.append(server)
+        return url, counter
+
+    yield start
+    for server in started:
+        server.shutdown()
+
+
+def test_score_resumes_coalesces_identical_prompts(stub):
+    url, counter = stub(latency=0.05)
+    resumes = ["python engineer"] * 5 + ["java engineer"]
+    results = score_resumes("Engineer", "python backend role", resumes, base_url=url, timeout=5, max_retries=0)
+    assert [r["ok"] for r in results] == [True] * 6
+    assert all(1 <= r["score"] <= 10 for r in results)
+    assert counter["requests"] == 2
+
+
+def test_retries_then_fails(stub):
+    url, counter = stub(fail_rate=1.0)
+    client = AsyncGeminiClient(base_url=url, timeout=5, max_retries=2, backoff_base=0.01)
+    with pytest.raises(llm_async.RetryableError):
+        generate_blocking("prompt", client)
+    assert counter["requests"] == 3
+    assert client.stats["retries"] == 2 and client.stats["failures"] == 1
+
+
+def test_attempt_timeout(stub):
+    url, _ = stub(latency=1.0)
+    client = AsyncGeminiClient(base_url=url, timeout=0.2, max_retries=1, backoff_base=0.01)
+    with pytest.raises(TimeoutError):
+        generate_blocking("prompt", client)
+    assert client.stats["requests"] == 2
+
+
+def test_call_gemini_goes_through_the_client(stub, monkeypatch):
+    url, counter = stub()
+    monkeypatch.setattr(llm_async, "_blocking_client", AsyncGeminiClient(base_url=url, timeout=5, max_retries=0))
+    output = llm.call_gemini("Return a score")
+    assert llm.parse_score_output(output)["ok"]
+    assert counter["requests"] == 1
+
+
+def test_score_resumes_async_closes_its_own_client(stub, monkeypatch):
+    url, _ = stub()
+    monkeypatch.setattr(llm_async.settings, "GEMINI_BASE_URL", url)
+    closed = []
+    monkeypatch.setattr(AsyncGeminiClient, "close", lambda self: closed.append(self))
+    results = asyncio.run(llm_async.score_resumes_async("Engineer", "python role", ["python engineer"]))
+    assert results[0]["ok"]
+    assert len(closed) == 1
@@ -0,0 +1,33 @@
+# tests/test_onnx_parity.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from app import onnx_backend
+from app.config import settings
+
+
+@pytest.fixture(scope="module")
+def onnx_dir(tmp_path_factory):
+    # fp32 and int8 share one export; int8 is quantized from the fp32 graph
+    path = str(tmp_path_factory.mktemp("onnx"))
+    old, settings.ONNX_DIR = settings.ONNX_DIR, path
+    yield path
+    settings.ONNX_DIR = old
+
+
+@pytest.mark.parametrize("variant", ["fp32", "int8"])
+def test_parity(onnx_dir, variant):
+    try:
+        report = onnx_backend.parity(variant)
+    except OSError as e:  # models neither cached nor downloadable
+        pytest.skip(f"models unavailable: {e}")
+    assert report["embedding"]["ok"], report
+    assert report["ner"]["ok"], report
+    assert report["ok"]
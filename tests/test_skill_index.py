@@ -0,0 +1,76 @@
+# tests/test_skill_index.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from app.skill_index import SkillIndex
+
+TAXONOMY = {
+    "Python": ["python", "py"],
+    "Java": ["java"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Big Data": ["big data"],
+    "Research and Development": ["r&d"],
+}
+
+
+@pytest.fixture
+def index():
+    idx = SkillIndex(taxonomy=TAXONOMY)
+    idx.add(["a", "b", "c", "d"], [
+        ["Python", "Kubernetes"],
+        ["Python", "Java"],
+        ["Java", "Big Data"],
+        ["Research and Development", "py"],
+    ])
+    return idx
+
+
+def test_precedence_not_and_or(index):
+    # NOT > AND > OR: Java OR (Python AND (NOT Kubernetes))
+    assert index.ids("Java OR Python AND NOT Kubernetes") == ["b", "c", "d"]
+    assert index.ids("(Java OR Python) AND NOT Kubernetes") == ["b", "c", "d"]
+    assert index.ids("(Java OR Kubernetes) AND Python") == ["a", "b"]
+    assert index.count("NOT Python") == 1
+
+
+def test_not_skips_deleted_rows(index):
+    assert index.delete(["c", "missing"]) == 1
+    assert index.ids("NOT Python") == []
+    assert index.ids("NOT Kubernetes") == ["b", "d"]
+    index.compact()
+    assert index.ids("NOT Kubernetes") == ["b", "d"]
+
+
+def test_lowercase_operators_belong_to_skill_names(index):
+    assert index.ids("Research and Development") == ["d"]
+    assert index.ids('"research and development" AND PYTHON') == ["d"]
+    assert index.ids("big data OR k8s") == ["a", "c"]
+
+
+def test_unknown_skill_and_bad_syntax(index):
+    with pytest.raises(KeyError):
+        index.query("Cobol")
+    with pytest.raises(ValueError):
+        index.query("(Python AND Java")
+    with pytest.raises(ValueError):
+        index.query("Python AND")
+
+
+def test_readd_replaces_skills(index):
+    index.add(["a"], [["Java"]])
+    assert index.ids("Python") == ["b", "d"]
+    assert index.ids("Java") == ["b", "c", "a"]
+
+
+def test_save_load_roundtrip(index, tmp_path):
+    index.delete(["b"])
+    index.save(str(tmp_path))
+    loaded = SkillIndex.load(str(tmp_path))
+    assert len(loaded) == 3
+    assert loaded.ids("Python") == ["a", "d"]
+    assert loaded.ids("NOT Java") == ["a", "d"]
+    loaded.add(["e"], [["Kubernetes"]])  # first update copies the memory-mapped bitmaps
+    assert loaded.ids("Kubernetes") == ["a", "e"]
+    assert SkillIndex.load(str(tmp_path)).ids("Kubernetes") == ["a"]